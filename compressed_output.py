@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module d'écriture des fichiers d'export compressés (gzip, bz2, xz, zstd)
+Auteur: Geoffroy Streit
+"""
+
+import bz2
+import functools
+import gzip
+import io
+import logging
+import lzma
+import os
+import queue
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from lazy_modules import LazyModule, module_available
+
+# zstandard: disponibilité vérifiée sans import, chargé à la première compression zstd
+ZSTD_AVAILABLE = module_available('zstandard')
+zstandard = LazyModule('zstandard')
+
+# Extension de fichier de chaque compression
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'bz2': '.bz2', 'xz': '.xz', 'zstd': '.zst'}
+
+# Taille des blocs transmis au thread de compression
+CHUNK_SIZE = 1024 * 1024
+# Nombre de blocs en attente de compression (borne la mémoire)
+QUEUE_SIZE = 8
+
+logger = logging.getLogger('mp3tag_analyzer.compressed_output')
+
+
+def detect_compression(file_path):
+    """Compression correspondant à l'extension d'un fichier (None si aucune)"""
+    extension = os.path.splitext(file_path)[1].lower()
+    for compression, compression_extension in COMPRESSION_EXTENSIONS.items():
+        if extension == compression_extension:
+            return compression
+    return None
+
+
+def output_path(file_path, extension, compression=None):
+    """Chemin de sortie avec l'extension du format, suivie de celle de la compression
+
+    Args:
+        file_path (str): Chemin saisi (ex: 'export', 'export.csv', 'export.csv.gz')
+        extension (str): Extension du format (ex: '.csv')
+        compression (str, optional): 'gzip', 'bz2', 'xz', 'zstd' ou None
+
+    Returns:
+        str: Chemin complet (ex: 'export.csv.gz')
+    """
+    detected = detect_compression(file_path)
+    if detected:
+        file_path = file_path[:-len(COMPRESSION_EXTENSIONS[detected])]
+    if not file_path.endswith(extension):
+        file_path += extension
+    if compression:
+        file_path += COMPRESSION_EXTENSIONS[compression]
+    return file_path
+
+
+def _new_compressor(compression, level=None):
+    """Compresseur incrémental (méthodes compress() et flush())"""
+    if compression == 'gzip':
+        # wbits=31: flux au format gzip (en-tête et CRC)
+        return zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+    if compression == 'bz2':
+        return bz2.BZ2Compressor(9 if level is None else level)
+    if compression == 'xz':
+        return lzma.LZMACompressor(format=lzma.FORMAT_XZ, preset=6 if level is None else level)
+    if compression == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise ImportError("Le module zstandard n'est pas installé.")
+        # zstd répartit lui-même la compression sur tous les cœurs
+        return zstandard.ZstdCompressor(level=3 if level is None else level, threads=-1).compressobj()
+    raise ValueError(f"Compression non supportée: {compression}")
+
+
+def _compress_block(compression, level, data):
+    """Compresse un bloc en un flux complet et indépendant
+
+    gzip, bz2 et xz acceptent des flux concaténés: le fichier formé des blocs
+    compressés l'un après l'autre se décompresse comme un flux unique.
+    """
+    if compression == 'gzip':
+        return gzip.compress(data, 6 if level is None else level, mtime=0)
+    if compression == 'bz2':
+        return bz2.compress(data, 9 if level is None else level)
+    return lzma.compress(data, format=lzma.FORMAT_XZ, preset=6 if level is None else level)
+
+
+class ThreadedCompressedWriter(io.RawIOBase):
+    """Fichier binaire compressé hors du thread qui sérialise
+
+    Deux modes:
+    - flux: les blocs écrits passent par une file bornée et sont compressés par un
+      thread dédié (zlib, bz2, lzma et zstd relâchent le GIL pendant la compression);
+    - blocs parallèles (gzip, bz2, xz avec workers > 1): chaque bloc est compressé
+      en flux indépendant par un groupe de threads, puis écrit dans l'ordre.
+    """
+
+    def __init__(self, file_path, compression, level=None, workers=None):
+        """Initialisation
+
+        Args:
+            file_path (str): Chemin du fichier compressé
+            compression (str): 'gzip', 'bz2', 'xz' ou 'zstd'
+            level (int, optional): Niveau de compression (par défaut: celui de l'outil en ligne de commande)
+            workers (int, optional): Threads de compression par blocs (par défaut: nombre de cœurs;
+                1 = un seul flux; zstd gère ses propres threads)
+        """
+        super().__init__()
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(f"Compression non supportée: {compression}")
+        workers = workers or os.cpu_count() or 1
+        self._compressor = None
+        self._pool = None
+        if compression != 'zstd' and workers > 1:
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"compression-{compression}")
+            self._compress_block = functools.partial(_compress_block, compression, level)
+        else:
+            self._compressor = _new_compressor(compression, level)
+        self._file = open(file_path, 'wb')
+        # Blocs (ou compressions en cours) en attente d'écriture, dans l'ordre
+        self._queue = queue.Queue(maxsize=max(QUEUE_SIZE, workers * 2))
+        self._error = None
+        self._thread = threading.Thread(target=self._write_loop, name=f"compression-{compression}", daemon=True)
+        self._thread.start()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._raise_error()
+        # Copie: le tampon fourni par BufferedWriter est réutilisé dès le retour
+        chunk = bytes(data)
+        self._put(self._pool.submit(self._compress_block, chunk) if self._pool else chunk)
+        return len(chunk)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._put(None)
+            self._thread.join()
+            self._raise_error()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+            self._file.close()
+            super().close()
+
+    def _put(self, item):
+        # Attente bornée pour détecter l'arrêt du thread sur erreur
+        while True:
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise IOError(f"Erreur de compression: {self._error}")
+
+    def _write_loop(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    if self._compressor is not None:
+                        self._file.write(self._compressor.flush())
+                    return
+                if self._pool is not None:
+                    self._file.write(item.result())
+                else:
+                    compressed = self._compressor.compress(item)
+                    if compressed:
+                        self._file.write(compressed)
+        except Exception as e:
+            logger.error(f"Erreur de compression: {e}")
+            self._error = e
+            # Vide la file pour débloquer l'écrivain
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+
+def open_output(file_path, encoding='utf-8', newline=None, errors='strict', compression=None,
+                level=None, workers=None):
+    """Ouvre un fichier texte d'export, compressé selon l'extension ou la compression demandée
+
+    Args:
+        file_path (str): Chemin du fichier
+        encoding (str): Encodage du texte
+        newline (str, optional): Comme pour open()
+        errors (str): Gestion des erreurs d'encodage, comme pour open()
+        compression (str, optional): 'gzip', 'bz2', 'xz', 'zstd', 'none',
+            ou None pour la déduire de l'extension (.gz, .bz2, .xz, .zst)
+        level (int, optional): Niveau de compression
+        workers (int, optional): Threads de compression par blocs (voir ThreadedCompressedWriter)
+
+    Returns:
+        io.TextIOWrapper: Fichier texte ouvert en écriture
+    """
+    if compression is None:
+        compression = detect_compression(file_path)
+    if not compression or compression == 'none':
+        return open(file_path, 'w', encoding=encoding, newline=newline, errors=errors, buffering=CHUNK_SIZE)
+
+    raw = ThreadedCompressedWriter(file_path, compression, level, workers)
+    buffered = io.BufferedWriter(raw, buffer_size=CHUNK_SIZE)
+    return io.TextIOWrapper(buffered, encoding=encoding, newline=newline, errors=errors, write_through=False)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module de mutualisation des connexions vers les bases cibles des exports
+Auteur: Geoffroy Streit
+"""
+
+import logging
+import random
+import threading
+import time
+
+
+class RetryPolicy:
+    """Politique de nouvelles tentatives avec attente exponentielle et gigue"""
+
+    def __init__(self, retries=3, base_delay=0.5, max_delay=30.0):
+        """Initialisation
+
+        Args:
+            retries (int): Nombre de nouvelles tentatives après le premier échec (0 = aucune)
+            base_delay (float): Attente avant la première nouvelle tentative, en secondes
+            max_delay (float): Attente maximale entre deux tentatives, en secondes
+        """
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        """Attente avant la tentative suivante (attempt = 1 pour la première nouvelle tentative)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        # Gigue: évite que des exports parallèles ne se reconnectent tous au même instant
+        return delay * random.uniform(0.5, 1.0)
+
+
+class ConnectionPool:
+    """Réserve de connexions vers une base cible
+
+    acquire() ne bloque jamais: une connexion inactive en bon état est réutilisée,
+    sinon une nouvelle est ouverte. release() conserve au plus max_idle connexions.
+    """
+
+    def __init__(self, connect, health_check, max_idle=4, max_idle_time=300.0):
+        """Initialisation
+
+        Args:
+            connect (callable): Ouvre une nouvelle connexion
+            health_check (callable): Retourne True si une connexion est utilisable
+            max_idle (int): Nombre maximal de connexions inactives conservées
+            max_idle_time (float): Durée en secondes au-delà de laquelle une connexion inactive est fermée
+        """
+        self._connect = connect
+        self._health_check = health_check
+        self.max_idle = max_idle
+        self.max_idle_time = max_idle_time
+        self._idle = []  # (connexion, instant de restitution)
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger('mp3tag_analyzer.connection_pool')
+
+        # Statistiques
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def acquire(self):
+        """Fournit une connexion en bon état (réutilisée ou nouvelle)"""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, released_at = self._idle.pop()
+            if time.monotonic() - released_at <= self.max_idle_time and self._is_healthy(conn):
+                self.reused += 1
+                return conn
+            self._close(conn)
+
+        conn = self._connect()
+        self.created += 1
+        return conn
+
+    def release(self, conn):
+        """Restitue une connexion (les modifications non validées sont annulées)"""
+        try:
+            conn.rollback()
+        except Exception:
+            self._close(conn)
+            return
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append((conn, time.monotonic()))
+                return
+        self._close(conn)
+
+    def discard(self, conn):
+        """Ferme une connexion qui ne doit pas être réutilisée (après une erreur)"""
+        self._close(conn)
+
+    def close_all(self):
+        """Ferme toutes les connexions inactives"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
+    def _is_healthy(self, conn):
+        try:
+            return self._health_check(conn)
+        except Exception as e:
+            self.logger.info(f"Connexion inactive inutilisable: {e}")
+            return False
+
+    def _close(self, conn):
+        self.discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+class TargetSession:
+    """Connexion empruntée à une réserve, avec reprise des transactions sur erreur transitoire
+
+    run() exécute une unité de travail puis valide; si une erreur transitoire survient
+    (connexion perdue, interblocage...), la connexion est écartée et l'unité de travail
+    est rejouée sur une nouvelle connexion après une attente exponentielle.
+    """
+
+    def __init__(self, pool, is_transient, policy=None, logger=None):
+        """Initialisation
+
+        Args:
+            pool (ConnectionPool): Réserve de connexions
+            is_transient (callable): Retourne True si une exception justifie une nouvelle tentative
+            policy (RetryPolicy, optional): Politique de nouvelles tentatives
+            logger (logging.Logger, optional): Journal
+        """
+        self.pool = pool
+        self.is_transient = is_transient
+        self.policy = policy or RetryPolicy()
+        self.logger = logger or logging.getLogger('mp3tag_analyzer.connection_pool')
+        self.conn = None
+        self._cursor = None
+
+    @property
+    def cursor(self):
+        """Curseur de la connexion courante (une connexion est empruntée si besoin)"""
+        if self.conn is None:
+            self.conn = self._with_retry(self.pool.acquire, "connexion")
+            self._cursor = self.conn.cursor()
+        return self._cursor
+
+    def run(self, work, description="lot"):
+        """Exécute work(cursor) puis valide la transaction, avec nouvelles tentatives
+
+        Args:
+            work (callable): Unité de travail rejouable, recevant le curseur
+            description (str): Libellé pour le journal
+
+        Returns:
+            Valeur retournée par work
+        """
+        def attempt():
+            result = work(self.cursor)
+            self.conn.commit()
+            return result
+        return self._with_retry(attempt, description)
+
+    def commit(self):
+        """Valide la transaction en cours (sans nouvelle tentative: rien à rejouer)"""
+        if self.conn is not None:
+            self.conn.commit()
+
+    def close(self, discard=False):
+        """Restitue (ou écarte) la connexion empruntée"""
+        if self.conn is None:
+            return
+        if discard:
+            self.pool.discard(self.conn)
+        else:
+            self.pool.release(self.conn)
+        self.conn = None
+        self._cursor = None
+
+    def _with_retry(self, func, description):
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                if attempt >= self.policy.retries or not self.is_transient(e):
+                    raise
+                attempt += 1
+                delay = self.policy.delay(attempt)
+                self.logger.warning(f"Erreur transitoire ({description}): {e}. "
+                                    f"Nouvelle tentative {attempt}/{self.policy.retries} dans {delay:.1f}s")
+                self.close(discard=True)
+                time.sleep(delay)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Après une erreur, l'état de la connexion est incertain: elle n'est pas réutilisée
+        self.close(discard=exc_type is not None)
+        return False
+
+
+# Réserves partagées par tous les exports de la session, par cible
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, connect, health_check, max_idle=4):
+    """Réserve associée à une cible (créée au premier appel)
+
+    Args:
+        key (tuple): Identifiant de la cible (pilote, hôte, port, utilisateur, base...)
+        connect (callable): Ouvre une nouvelle connexion vers la cible
+        health_check (callable): Vérifie qu'une connexion est utilisable
+        max_idle (int): Nombre maximal de connexions inactives conservées
+
+    Returns:
+        ConnectionPool: Réserve de connexions
+    """
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(connect, health_check, max_idle=max_idle)
+        pool.max_idle = max(pool.max_idle, max_idle)
+        return pool
+
+
+def close_all_pools():
+    """Ferme les connexions inactives de toutes les réserves (à la fermeture de l'application)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
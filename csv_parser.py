@@ -11,26 +11,36 @@ import os
 import sys
 import io
 
+from compressed_output import open_output
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
                     handlers=[logging.StreamHandler(),
                               logging.FileHandler('mp3tag_analyzer.log')])
 
-# Augmenter la limite de taille des champs CSV au maximum possible
-try:
-    # Essayer d'augmenter la limite au maximum possible sur le système
-    max_int = sys.maxsize
-    while True:
+# Limite de taille des champs CSV déjà relevée (au premier fichier lu, pas à l'import du module)
+_field_size_limit_raised = False
+
+
+def raise_field_size_limit():
+    """Relève la limite de taille des champs CSV au maximum possible sur le système
+
+    La limite est un entier long C: 64 bits sous Linux et macOS, 32 bits sous Windows.
+
+    Returns:
+        int: Limite appliquée
+    """
+    global _field_size_limit_raised
+    for limit in (sys.maxsize, 2 ** 31 - 1):
         try:
-            csv.field_size_limit(max_int)
+            csv.field_size_limit(limit)
             break
         except OverflowError:
-            max_int = int(max_int / 10)
-    
-    logging.info(f"Limite de taille des champs CSV définie à {max_int}")
-except Exception as e:
-    logging.error(f"Erreur lors de la définition de la limite de taille des champs CSV: {e}")
+            continue
+    _field_size_limit_raised = True
+    logging.getLogger('mp3tag_analyzer.csv').info(f"Limite de taille des champs CSV définie à {limit}")
+    return limit
 
 class CSVParser:
     """Parseur de fichiers CSV générés par MP3tag"""
@@ -107,6 +117,9 @@ class CSVParser:
             self.logger.error(f"Le fichier {file_path} n'existe pas")
             return None, None
         
+        if not _field_size_limit_raised:
+            raise_field_size_limit()
+        
         # Détection de l'encodage
         encoding = self.detect_encoding(file_path)
         self.logger.info(f"Tentative de lecture avec l'encodage: {encoding}")
@@ -297,7 +310,7 @@ class CSVParser:
         
         return fields
     
-    def export_to_csv(self, data, headers, output_path, encoding='utf-16-le'):
+    def export_to_csv(self, data, headers, output_path, encoding='utf-16-le', compression=None):
         """Exportation des données vers un fichier CSV
         
         Args:
@@ -305,12 +318,14 @@ class CSVParser:
             headers (list): Entêtes des colonnes
             output_path (str): Chemin du fichier de sortie
             encoding (str): Encodage à utiliser
+            compression (str, optional): 'gzip', 'bz2', 'xz', 'zstd', 'none', ou None
+                pour la déduire de l'extension du fichier (.gz, .bz2, .xz, .zst)
             
         Returns:
             bool: True si l'exportation est réussie, False sinon
         """
         try:
-            with open(output_path, 'w', encoding=encoding, newline='') as file:
+            with open_output(output_path, encoding=encoding, newline='', compression=compression) as file:
                 writer = csv.writer(file, delimiter=';', quoting=csv.QUOTE_MINIMAL)
                 
                 writer.writerow(headers)
@@ -5,183 +5,840 @@ Module d'exportation vers différentes bases de données
 Auteur: Geoffroy Streit (avec l'aide de Cascade)
 """
 
+import itertools
 import logging
+import os
+import queue
 import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 
-# Imports conditionnels pour éviter les erreurs si les modules ne sont pas installés
-try:
-    import mysql.connector
-    MYSQL_AVAILABLE = True
-except ImportError:
-    MYSQL_AVAILABLE = False
+from connection_pool import RetryPolicy, TargetSession, get_pool
+from db_manager import DatabaseManager
+from lazy_modules import LazyModule, module_available
+from sql_presets import resolve_query
+from target_schema import (MYSQL, POSTGRES, DEFAULT_INDEXES, build_column_types, infer_column_types,
+                           infer_sqlite_column_types, is_numeric_sql_type)
 
-try:
-    import psycopg2
-    POSTGRES_AVAILABLE = True
-except ImportError:
-    POSTGRES_AVAILABLE = False
+# Pilotes optionnels: disponibilité vérifiée sans import, chargés au premier export
+# (leur import ralentit le démarrage de l'application)
+MYSQL_AVAILABLE = module_available('mysql.connector')
+POSTGRES_AVAILABLE = module_available('psycopg2')
+
+mysql_connector = LazyModule('mysql.connector')
+psycopg2 = LazyModule('psycopg2')
+psycopg2_extras = LazyModule('psycopg2.extras')
+
+
+def export_target_key(export_type, config):
+    """Identifiant d'une table cible d'export (ex: 'mysql://localhost:3306/mp3tag_analyzer/mp3_tags')
+
+    Args:
+        export_type (str): Type d'export ('mysql' ou 'postgres')
+        config (dict): Configuration de la cible (host, port, database, table)
+    """
+    return (f"{export_type.lower()}://{config.get('host')}:{config.get('port')}"
+            f"/{config.get('database')}/{config.get('table')}")
+
+
+class _CSVCopyStream:
+    """Objet fichier en lecture produisant du CSV à la demande pour COPY FROM STDIN
+    
+    Les valeurs non nulles sont toujours entre guillemets, NULL est un champ vide
+    non guillemeté (convention du format CSV de COPY).
+    """
+    
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._pending = ''
+    
+    @staticmethod
+    def _encode(value):
+        if value is None:
+            return ''
+        if isinstance(value, bytes):
+            value = value.decode('utf-8', errors='replace')
+        return '"' + str(value).replace('"', '""') + '"'
+    
+    def read(self, size=-1):
+        chunks = [self._pending]
+        length = len(self._pending)
+        while size < 0 or length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = ','.join(self._encode(v) for v in row) + '\n'
+            chunks.append(line)
+            length += len(line)
+        data = ''.join(chunks)
+        if size < 0:
+            self._pending = ''
+            return data
+        self._pending = data[size:]
+        return data[:size]
+    
+    def readline(self, size=-1):
+        return self.read(size)
 
 
 class DBExporter:
     """Classe pour exporter des données vers différentes bases de données"""
     
+    # Nombre de lignes lues par fetchmany lors d'un export depuis SQLite
+    READ_BATCH_SIZE = 5000
+    # Nombre de lots en attente entre le thread lecteur et l'écriture vers la cible
+    QUEUE_SIZE = 4
+    # Table de la cible contenant les points de reprise des exports (par base source et table)
+    EXPORT_CHECKPOINT_TABLE = 'mp3tag_export_checkpoints'
+    
     def __init__(self):
         """Initialisation du module d'exportation"""
         self.logger = logging.getLogger('mp3tag_analyzer.db_exporter')
+        # Dernière séquence du journal des modifications atteinte par un export incrémental
+        self.last_change_seq = None
+        # Débit (lignes/s) du dernier export
+        self.last_throughput = None
+        # Détail par partition (plage de rowid, nombre, tentatives, erreur) du dernier export parallèle
+        self.last_partition_report = None
     
-    def export_to_mysql(self, data, config):
+    def export_to_mysql(self, data, config, sync_keys=None, before_commit=None, column_types=None):
         """Exporte les données vers une base de données MySQL
         
         Args:
-            data (list): Liste de dictionnaires contenant les données à exporter
-            config (dict): Configuration de connexion MySQL (host, user, password, database, table)
+            data (iterable): Liste (ou itérable) de dictionnaires contenant les données à exporter
+            config (dict): Configuration de connexion MySQL (host, port, user, password, database, table)
+                et options d'insertion:
+                - bulk_mode: 'executemany' (lots multi-lignes, par défaut), 'load_data'
+                  (LOAD DATA LOCAL INFILE via un fichier TSV temporaire) ou 'row' (ligne par ligne)
+                - batch_size: nombre de lignes par lot (défaut: 1000)
+                - commit_every: nombre de lots entre deux validations (défaut: 10)
+                - upsert: si True, ajoute une clé unique (relative_path, filename) et remplace
+                  les lignes existantes (ON DUPLICATE KEY UPDATE, REPLACE pour LOAD DATA)
+                - create_natural_key: False si la clé unique a déjà été créée (défaut: True)
+                - schema: 'typed' (types déduits des données, par défaut) ou 'text' (tout en TEXT),
+                  utilisé à la création de la table
+                - type_overrides: colonne -> type SQL imposé (ex: {'comment': 'TEXT'})
+                - indexes: colonnes indexées après le chargement (défaut: DEFAULT_INDEXES)
+                - batch_retries: nouvelles tentatives d'une transaction après une erreur
+                  transitoire, sur une nouvelle connexion (défaut: 3, 0 = aucune)
+                - retry_delay: attente initiale avant une nouvelle tentative, doublée à chaque fois (défaut: 0.5 s)
+            sync_keys (list, optional): Clés (relative_path, filename) à supprimer de la cible
+                avant l'insertion (export incrémental)
+            before_commit (callable, optional): Appelé avec le curseur juste avant chaque
+                validation, pour écrire des données dans la même transaction (point de reprise)
+            column_types (dict, optional): Types logiques des colonnes (voir target_schema);
+                déduits des données si elles sont fournies sous forme de liste
             
         Returns:
             int: Nombre d'enregistrements exportés
         """
         if not MYSQL_AVAILABLE:
             raise ImportError("Le module mysql-connector-python n'est pas installé.")
-            
+        
+        bulk_mode = config.get('bulk_mode', 'executemany')
+        # LOAD DATA est d'autant plus efficace que les fichiers sont gros
+        batch_size = config.get('batch_size', 50000 if bulk_mode == 'load_data' else 1000)
+        commit_every = config.get('commit_every', 10)
+        upsert = config.get('upsert', False)
+        
         try:
-            # Connexion à la base de données MySQL
-            conn = mysql.connector.connect(
-                host=config['host'],
-                user=config['user'],
-                password=config['password'],
-                database=config['database']
-            )
-            cursor = conn.cursor()
+            start = time.perf_counter()
+            table = config['table']
+            first_row, rows = self._peek(data)
+            if first_row is None and not sync_keys:
+                self.logger.info("Aucun enregistrement à exporter")
+                return 0
+            sql_types = self._target_sql_types(data, first_row, config, MYSQL, column_types)
+            target = {}
             
-            # Création de la table si elle n'existe pas
-            self._create_mysql_table(cursor, config['table'], data[0] if data else {})
+            def prepare(cursor):
+                if first_row is None and not self._mysql_table_exists(cursor, table):
+                    # Export incrémental sans ligne à insérer vers une table absente: rien à supprimer
+                    return
+                
+                # Création de la table si elle n'existe pas (à partir de la première ligne)
+                self._create_mysql_table(cursor, table, first_row or {}, sql_types)
+                
+                # Les colonnes de la table cible ne sont lues qu'une seule fois
+                target['columns'] = set(self._get_mysql_table_columns(cursor, table))
+                target['numeric'] = self._get_numeric_columns(cursor, table, MYSQL)
+                if upsert and config.get('create_natural_key', True):
+                    self._ensure_mysql_natural_key(cursor, table)
             
-            # Insertion des données
-            records_inserted = 0
-            for row in data:
-                # Filtrer les colonnes qui existent dans la table
-                valid_columns = self._get_valid_columns(row, self._get_mysql_table_columns(cursor, config['table']))
-                if not valid_columns:
-                    continue
-                    
-                placeholders = ', '.join(['%s'] * len(valid_columns))
-                columns = ', '.join(f"`{col}`" for col in valid_columns)
-                values = [row.get(col) for col in valid_columns]
+            def delete_previous(cursor):
+                # Export incrémental: retirer les versions précédentes et les enregistrements supprimés,
+                # dans la transaction des premières insertions (rien n'est supprimé si elles échouent)
+                cursor.executemany(
+                    f"DELETE FROM `{table}` WHERE `relative_path` = %s AND `filename` = %s",
+                    list(sync_keys)
+                )
+            
+            def write_batch(cursor, batch):
+                columns = self._get_batch_columns(batch, target['columns'])
+                if not columns:
+                    return 0
+                values = self._batch_values(batch, columns, target['numeric'])
                 
-                query = f"INSERT INTO `{config['table']}` ({columns}) VALUES ({placeholders})"
-                cursor.execute(query, values)
-                records_inserted += 1
+                if bulk_mode == 'load_data':
+                    self._load_data_mysql(cursor, table, columns, values, replace=upsert)
+                elif bulk_mode == 'row':
+                    query = self._mysql_insert_query(table, columns, upsert=upsert)
+                    for row_values in values:
+                        cursor.execute(query, row_values)
+                else:
+                    # mysql-connector réécrit executemany en INSERT multi-lignes
+                    cursor.executemany(self._mysql_insert_query(table, columns, upsert=upsert), values)
+                return len(values)
             
-            # Validation des changements
-            conn.commit()
-            conn.close()
+            # Connexion empruntée à la réserve de la cible, restituée en fin d'export
+            with self._target_session(MYSQL, config, allow_local_infile=(bulk_mode == 'load_data')) as session:
+                session.run(prepare, "préparation de la table")
+                if not target:
+                    return 0
+                
+                # Insertion des données par lots, avec validations périodiques
+                records_inserted = self._write_batches(
+                    session, self._iter_batches(rows, batch_size), commit_every, write_batch, before_commit,
+                    prologue=delete_previous if sync_keys else None
+                )
+                
+                # Les index sont construits une fois les données chargées, en une passe
+                session.run(lambda cursor: self._create_mysql_indexes(
+                    cursor, table, config.get('indexes', DEFAULT_INDEXES), target['columns']
+                ), "création des index")
             
-            self.logger.info(f"{records_inserted} enregistrements exportés vers MySQL")
+            self._log_throughput("MySQL", records_inserted, time.perf_counter() - start)
             return records_inserted
             
-        except mysql.connector.Error as err:
+        except mysql_connector.Error as err:
             self.logger.error(f"Erreur MySQL: {err}")
             raise Exception(f"Erreur lors de l'exportation vers MySQL: {str(err)}")
     
-    def export_to_postgres(self, data, config):
+    def export_to_postgres(self, data, config, sync_keys=None, before_commit=None, column_types=None):
         """Exporte les données vers une base de données PostgreSQL
         
         Args:
-            data (list): Liste de dictionnaires contenant les données à exporter
-            config (dict): Configuration de connexion PostgreSQL (host, user, password, database, table)
+            data (iterable): Liste (ou itérable) de dictionnaires contenant les données à exporter
+            config (dict): Configuration de connexion PostgreSQL (host, port, user, password, database, table)
+                et options d'insertion:
+                - bulk_mode: 'copy' (COPY ... FROM STDIN en flux CSV, par défaut),
+                  'executemany' (INSERT multi-lignes) ou 'row' (ligne par ligne)
+                - batch_size: nombre de lignes par lot / par COPY (défaut: 50000 en mode 'copy', 1000 sinon)
+                - commit_every: nombre de lots entre deux validations (défaut: 1 en mode 'copy', 10 sinon)
+                - upsert: si True, passe par une table de transit et fusionne avec
+                  INSERT ... ON CONFLICT (relative_path, filename) pour des exports rejouables
+                - create_natural_key: False si l'index unique a déjà été créé (défaut: True)
+                - schema: 'typed' (types déduits des données, par défaut) ou 'text' (tout en TEXT),
+                  utilisé à la création de la table
+                - type_overrides: colonne -> type SQL imposé (ex: {'comment': 'TEXT'})
+                - indexes: colonnes indexées après le chargement (défaut: DEFAULT_INDEXES)
+                - batch_retries: nouvelles tentatives d'une transaction après une erreur
+                  transitoire, sur une nouvelle connexion (défaut: 3, 0 = aucune)
+                - retry_delay: attente initiale avant une nouvelle tentative, doublée à chaque fois (défaut: 0.5 s)
+            sync_keys (list, optional): Clés (relative_path, filename) à supprimer de la cible
+                avant l'insertion (export incrémental)
+            before_commit (callable, optional): Appelé avec le curseur juste avant chaque
+                validation, pour écrire des données dans la même transaction (point de reprise)
+            column_types (dict, optional): Types logiques des colonnes (voir target_schema);
+                déduits des données si elles sont fournies sous forme de liste
             
         Returns:
             int: Nombre d'enregistrements exportés
         """
         if not POSTGRES_AVAILABLE:
             raise ImportError("Le module psycopg2 n'est pas installé.")
-            
+        
+        bulk_mode = config.get('bulk_mode', 'copy')
+        batch_size = config.get('batch_size', 50000 if bulk_mode == 'copy' else 1000)
+        commit_every = config.get('commit_every', 1 if bulk_mode == 'copy' else 10)
+        upsert = config.get('upsert', False)
+        
         try:
-            # Connexion à la base de données PostgreSQL
-            conn = psycopg2.connect(
-                host=config['host'],
-                user=config['user'],
-                password=config['password'],
-                dbname=config['database']
-            )
-            cursor = conn.cursor()
+            start = time.perf_counter()
+            table = config['table']
+            first_row, rows = self._peek(data)
+            if first_row is None and not sync_keys:
+                self.logger.info("Aucun enregistrement à exporter")
+                return 0
+            sql_types = self._target_sql_types(data, first_row, config, POSTGRES, column_types)
+            target = {}
             
-            # Création de la table si elle n'existe pas
-            self._create_postgres_table(cursor, config['table'], data[0] if data else {})
+            def prepare(cursor):
+                if first_row is None and not self._postgres_table_exists(cursor, table):
+                    # Export incrémental sans ligne à insérer vers une table absente: rien à supprimer
+                    return
+                
+                # Création de la table si elle n'existe pas (à partir de la première ligne)
+                self._create_postgres_table(cursor, table, first_row or {}, sql_types)
+                
+                # Les colonnes de la table cible ne sont lues qu'une seule fois
+                target['columns'] = set(self._get_postgres_table_columns(cursor, table))
+                target['numeric'] = self._get_numeric_columns(cursor, table, POSTGRES)
+                if upsert and config.get('create_natural_key', True):
+                    self._ensure_postgres_natural_key(cursor, table)
             
-            # Insertion des données
-            records_inserted = 0
-            for row in data:
-                # Filtrer les colonnes qui existent dans la table
-                valid_columns = self._get_valid_columns(row, self._get_postgres_table_columns(cursor, config['table']))
-                if not valid_columns:
-                    continue
-                    
-                placeholders = ', '.join(['%s'] * len(valid_columns))
-                columns = ', '.join(f'"{col}"' for col in valid_columns)
-                values = [row.get(col) for col in valid_columns]
+            def delete_previous(cursor):
+                # Export incrémental: retirer les versions précédentes et les enregistrements supprimés,
+                # dans la transaction des premières insertions (rien n'est supprimé si elles échouent)
+                cursor.executemany(
+                    f'DELETE FROM "{table}" WHERE "relative_path" = %s AND "filename" = %s',
+                    list(sync_keys)
+                )
+            
+            def write_batch(cursor, batch):
+                columns = self._get_batch_columns(batch, target['columns'])
+                if not columns:
+                    return 0
+                values = self._batch_values(batch, columns, target['numeric'])
                 
-                query = f'INSERT INTO "{config["table"]}" ({columns}) VALUES ({placeholders})'
-                cursor.execute(query, values)
-                records_inserted += 1
+                if upsert:
+                    self._upsert_postgres(cursor, table, columns, values)
+                elif bulk_mode == 'copy':
+                    self._copy_to_postgres(cursor, table, columns, values)
+                elif bulk_mode == 'row':
+                    query = self._postgres_insert_query(table, columns)
+                    for row_values in values:
+                        cursor.execute(query, row_values)
+                else:
+                    psycopg2_extras.execute_values(
+                        cursor,
+                        f'INSERT INTO "{table}" ({self._quote_postgres_columns(columns)}) VALUES %s',
+                        values,
+                        page_size=batch_size
+                    )
+                return len(values)
             
-            # Validation des changements
-            conn.commit()
-            conn.close()
+            # Connexion empruntée à la réserve de la cible, restituée en fin d'export
+            with self._target_session(POSTGRES, config) as session:
+                session.run(prepare, "préparation de la table")
+                if not target:
+                    return 0
+                
+                # Insertion des données par lots, avec validations périodiques
+                records_inserted = self._write_batches(
+                    session, self._iter_batches(rows, batch_size), commit_every, write_batch, before_commit,
+                    prologue=delete_previous if sync_keys else None
+                )
+                
+                # Les index sont construits une fois les données chargées, en une passe
+                session.run(lambda cursor: self._create_postgres_indexes(
+                    cursor, table, config.get('indexes', DEFAULT_INDEXES), target['columns']
+                ), "création des index")
             
-            self.logger.info(f"{records_inserted} enregistrements exportés vers PostgreSQL")
+            self._log_throughput("PostgreSQL", records_inserted, time.perf_counter() - start)
             return records_inserted
             
         except psycopg2.Error as err:
             self.logger.error(f"Erreur PostgreSQL: {err}")
             raise Exception(f"Erreur lors de l'exportation vers PostgreSQL: {str(err)}")
     
-    def export_from_sqlite(self, sqlite_path, export_type, config):
+    def export_from_sqlite(self, sqlite_path, export_type, config, since_seq=None):
         """Exporte les données depuis SQLite vers un autre type de base de données
         
+        L'export complet est un pipeline en flux: un thread lecteur extrait les lignes
+        de mp3_files par lots (fetchmany) et les dépose dans une file bornée, que le
+        thread appelant vide en écrivant vers la cible. La lecture SQLite et les envois
+        réseau se recouvrent et la mémoire reste bornée par la taille de la file.
+        
         Args:
             sqlite_path (str): Chemin vers la base de données SQLite
             export_type (str): Type d'export ('mysql' ou 'postgres')
-            config (dict): Configuration de connexion
+            config (dict): Configuration de connexion, plus les options de lecture:
+                - read_batch_size: nombre de lignes par lecture SQLite (défaut: 5000)
+                - queue_size: nombre de lots en attente dans la file (défaut: 4)
+                - parallelism: nombre de connexions simultanées vers la cible (défaut: 1);
+                  au-delà de 1, voir _export_partitioned()
+                - partitions: nombre de plages de rowid (défaut: 2 par connexion)
+                - partition_retries: nouvelles tentatives par partition en échec (défaut: 2)
+                - resume: reprise sur point de contrôle, voir _export_resumable()
+            since_seq (int, optional): Si renseigné, n'exporte que les modifications
+                postérieures à cette séquence du journal
+            
+        Après un export réussi, self.last_change_seq contient la séquence du journal
+        couverte par l'export (à passer en since_seq au prochain export incrémental);
+        elle est aussi enregistrée dans la base source pour cette cible (export_target_key).
             
         Returns:
             int: Nombre d'enregistrements exportés
         """
-        try:
-            # Connexion à la base de données SQLite source
-            conn = sqlite3.connect(sqlite_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # Récupération des données
-            cursor.execute("SELECT * FROM mp3_tags")
-            rows = cursor.fetchall()
-            
-            # Conversion des données en liste de dictionnaires
-            data = [dict(row) for row in rows]
-            conn.close()
-            
-            # Export vers la base de données cible
-            if export_type.lower() == 'mysql':
-                return self.export_to_mysql(data, config)
-            elif export_type.lower() == 'postgres':
-                return self.export_to_postgres(data, config)
+        if since_seq is not None:
+            count = self._export_changes_from_sqlite(sqlite_path, export_type, config, since_seq)
+        else:
+            # Séquence du journal couverte par l'export complet, lue avant les lignes: les
+            # modifications faites pendant l'export seront reprises par l'export incrémental suivant
+            self.last_change_seq = self._read_change_seq(sqlite_path)
+            if config.get('resume'):
+                if config.get('parallelism', 1) > 1:
+                    # Le point de reprise suit une progression unique par rowid croissant
+                    self.logger.warning(f"Reprise sur point de contrôle: export sur une seule connexion "
+                                        f"({config['parallelism']} connexions demandées)")
+                count = self._export_resumable(sqlite_path, export_type, config)
+            elif config.get('parallelism', 1) > 1:
+                count = self._export_partitioned(sqlite_path, export_type, config)
             else:
-                raise ValueError(f"Type d'export non supporté: {export_type}")
+                count = self._export_streamed(sqlite_path, export_type, config)
+        self._save_change_seq(sqlite_path, export_type, config)
+        return count
+    
+    def _export_streamed(self, sqlite_path, export_type, config):
+        """Export complet en flux (un lecteur SQLite, une connexion vers la cible)"""
+        try:
+            column_types = self._source_column_types(sqlite_path, config)
+            rows = self._stream_sqlite_rows(
+                sqlite_path,
+                "SELECT * FROM mp3_files",
+                batch_size=config.get('read_batch_size', self.READ_BATCH_SIZE),
+                queue_size=config.get('queue_size', self.QUEUE_SIZE)
+            )
+            # Fermeture explicite: arrête le thread lecteur si l'écriture échoue en cours de route
+            with closing(rows):
+                return self._export_rows(export_type, rows, config, column_types=column_types)
                 
         except sqlite3.Error as err:
             self.logger.error(f"Erreur SQLite: {err}")
             raise Exception(f"Erreur lors de la lecture de la base SQLite: {str(err)}")
     
-    def _create_mysql_table(self, cursor, table_name, sample_row):
-        """Crée une table MySQL si elle n'existe pas"""
+    def export_query(self, sqlite_path, export_type, config, query=None, preset=None, params=()):
+        """Exporte le résultat d'une requête SQL ou d'un preset vers une base cible
+        
+        Les lignes passent en flux du curseur SQLite à la cible (même pipeline que
+        export_from_sqlite), sans être chargées en mémoire ni affichées. La table
+        cible (config['table']) est créée d'après les colonnes du résultat.
+        
+        Args:
+            sqlite_path (str): Chemin vers la base de données SQLite
+            export_type (str): Type d'export ('mysql' ou 'postgres')
+            config (dict): Configuration de la cible (voir export_from_sqlite)
+            query (str, optional): Requête SQL de lecture
+            preset (str, optional): Nom d'un preset (voir sql_presets), si query n'est pas fourni
+            params (tuple, optional): Paramètres de la requête
+            
+        Returns:
+            int: Nombre d'enregistrements exportés
+        """
+        query = resolve_query(query, preset)
+        try:
+            column_types = self._source_column_types(sqlite_path, config, query, params)
+            rows = self._stream_sqlite_rows(
+                sqlite_path,
+                query,
+                params,
+                batch_size=config.get('read_batch_size', self.READ_BATCH_SIZE),
+                queue_size=config.get('queue_size', self.QUEUE_SIZE)
+            )
+            with closing(rows):
+                return self._export_rows(export_type, rows, config, column_types=column_types)
+        except sqlite3.Error as err:
+            self.logger.error(f"Erreur SQLite: {err}")
+            raise Exception(f"Erreur lors de la lecture de la base SQLite: {str(err)}")
+    
+    def _export_resumable(self, sqlite_path, export_type, config):
+        """Export par lots validés avec point de reprise, rejouable sans doublons
+        
+        Les lignes sont lues par rowid croissant. À chaque validation, le dernier rowid
+        exporté est enregistré dans la table EXPORT_CHECKPOINT_TABLE de la cible, dans
+        la même transaction que les données: après un échec, un nouvel export ne renvoie
+        que les lignes restantes. La cible reçoit une clé unique (relative_path, filename)
+        et les lignes sont fusionnées (upsert), si bien qu'un lot rejoué ne crée pas de doublons.
+        Les modifications de lignes déjà exportées relèvent de l'export incrémental (since_seq).
+        
+        Returns:
+            int: Nombre d'enregistrements exportés lors de cette exécution
+        """
+        source = os.path.abspath(sqlite_path)
+        table = config['table']
+        
+        try:
+            sample_row = self._first_sqlite_row(sqlite_path)
+            column_types = self._source_column_types(sqlite_path, config)
+        except sqlite3.Error as err:
+            self.logger.error(f"Erreur SQLite: {err}")
+            raise Exception(f"Erreur lors de la lecture de la base SQLite: {str(err)}")
+        self._prepare_target(export_type, dict(config, upsert=True), sample_row, column_types)
+        last_rowid, rows_exported = self._read_checkpoint(export_type, config, source)
+        if last_rowid:
+            self.logger.info(f"Reprise de l'export vers {table} après le rowid {last_rowid} "
+                             f"({rows_exported} enregistrements déjà exportés)")
+            # Les lignes déjà exportées l'ont été avant des modifications éventuelles:
+            # la séquence couverte par l'ensemble de l'export n'est pas connue
+            self.last_change_seq = None
+        
+        # Le générateur n'est jamais en avance sur les lots validés: au moment d'une
+        # validation, la dernière ligne produite est la dernière ligne du lot validé
+        progress = {'rowid': last_rowid, 'rows': rows_exported}
+        
+        def rows():
+            with closing(self._stream_sqlite_rows(
+                sqlite_path,
+                "SELECT * FROM mp3_files WHERE rowid > ? ORDER BY rowid",
+                (last_rowid,),
+                batch_size=config.get('read_batch_size', self.READ_BATCH_SIZE),
+                queue_size=config.get('queue_size', self.QUEUE_SIZE),
+                keep_id=True
+            )) as stream:
+                for row in stream:
+                    progress['rowid'] = row.pop('id')
+                    progress['rows'] += 1
+                    yield row
+        
+        def save_checkpoint(cursor):
+            self._write_checkpoint(export_type, cursor, source, table, progress['rowid'], progress['rows'])
+        
+        try:
+            resume_config = dict(config, upsert=True, create_natural_key=False,
+                                 commit_every=config.get('commit_every', 1))
+            with closing(rows()) as resumed_rows:
+                return self._export_rows(export_type, resumed_rows, resume_config,
+                                         before_commit=save_checkpoint, column_types=column_types)
+        except sqlite3.Error as err:
+            self.logger.error(f"Erreur SQLite: {err}")
+            raise Exception(f"Erreur lors de la lecture de la base SQLite: {str(err)}")
+    
+    def _checkpoint_target(self, export_type):
+        """Dialecte, requêtes et erreur du pilote pour la table des points de reprise"""
+        name = self.EXPORT_CHECKPOINT_TABLE
+        if export_type.lower() == 'mysql':
+            create = (f"CREATE TABLE IF NOT EXISTS `{name}` ("
+                      "`source` VARCHAR(512) NOT NULL, `target_table` VARCHAR(64) NOT NULL, "
+                      "`last_rowid` BIGINT NOT NULL, `rows_exported` BIGINT NOT NULL, "
+                      "`updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP, "
+                      "PRIMARY KEY (`source`, `target_table`))")
+            select = f"SELECT `last_rowid`, `rows_exported` FROM `{name}` WHERE `source` = %s AND `target_table` = %s"
+            upsert = (f"INSERT INTO `{name}` (`source`, `target_table`, `last_rowid`, `rows_exported`) "
+                      "VALUES (%s, %s, %s, %s) ON DUPLICATE KEY UPDATE "
+                      "`last_rowid` = VALUES(`last_rowid`), `rows_exported` = VALUES(`rows_exported`)")
+            return MYSQL, create, select, upsert, mysql_connector.Error
+        else:
+            create = (f'CREATE TABLE IF NOT EXISTS "{name}" ('
+                      '"source" TEXT NOT NULL, "target_table" TEXT NOT NULL, '
+                      '"last_rowid" BIGINT NOT NULL, "rows_exported" BIGINT NOT NULL, '
+                      '"updated_at" TIMESTAMP DEFAULT CURRENT_TIMESTAMP, '
+                      'PRIMARY KEY ("source", "target_table"))')
+            select = f'SELECT "last_rowid", "rows_exported" FROM "{name}" WHERE "source" = %s AND "target_table" = %s'
+            upsert = (f'INSERT INTO "{name}" ("source", "target_table", "last_rowid", "rows_exported") '
+                      'VALUES (%s, %s, %s, %s) ON CONFLICT ("source", "target_table") DO UPDATE SET '
+                      '"last_rowid" = EXCLUDED."last_rowid", "rows_exported" = EXCLUDED."rows_exported", '
+                      '"updated_at" = CURRENT_TIMESTAMP')
+            return POSTGRES, create, select, upsert, psycopg2.Error
+    
+    def _read_checkpoint(self, export_type, config, source):
+        """Lit (et crée si besoin) le point de reprise de la cible pour cette base source
+        
+        Returns:
+            tuple: (dernier rowid exporté, nombre d'enregistrements exportés), (0, 0) si aucun
+        """
+        dialect, create, select, _, error = self._checkpoint_target(export_type)
+        
+        def read(cursor):
+            cursor.execute(create)
+            cursor.execute(select, (source, config['table']))
+            return cursor.fetchone()
+        
+        try:
+            with self._target_session(dialect, config) as session:
+                row = session.run(read, "lecture du point de reprise")
+        except error as err:
+            self.logger.error(f"Erreur lors de la lecture du point de reprise: {err}")
+            raise Exception(f"Erreur lors de la lecture du point de reprise: {str(err)}")
+        return (row[0], row[1]) if row else (0, 0)
+    
+    def _write_checkpoint(self, export_type, cursor, source, table, last_rowid, rows_exported):
+        """Enregistre le point de reprise dans la transaction en cours de la cible"""
+        upsert = self._checkpoint_target(export_type)[3]
+        cursor.execute(upsert, (source, table, last_rowid, rows_exported))
+    
+    def _export_partitioned(self, sqlite_path, export_type, config):
+        """Exporte mp3_files par plages de rowid, chacune sur sa propre connexion
+        
+        Les partitions sont réparties sur un pool de threads (les envois réseau
+        libèrent le GIL). Chaque partition est exportée en une seule transaction:
+        une partition en échec est annulée puis retentée seule, sans doublons.
+        Le détail par partition est conservé dans self.last_partition_report.
+        
+        Returns:
+            int: Nombre total d'enregistrements exportés
+        """
+        start = time.perf_counter()
+        parallelism = config['parallelism']
+        retries = config.get('partition_retries', 2)
+        
+        try:
+            ranges = self._rowid_ranges(sqlite_path, config.get('partitions', parallelism * 2))
+            sample_row = self._first_sqlite_row(sqlite_path)
+            column_types = self._source_column_types(sqlite_path, config)
+        except sqlite3.Error as err:
+            self.logger.error(f"Erreur SQLite: {err}")
+            raise Exception(f"Erreur lors de la lecture de la base SQLite: {str(err)}")
+        if not ranges:
+            self.last_partition_report = []
+            return 0
+        
+        # La table et sa clé unique (upsert) sont créées une seule fois, avant les connexions concurrentes
+        self._prepare_target(export_type, config, sample_row, column_types)
+        
+        # Une seule validation par partition pour pouvoir la rejouer en cas d'échec (la
+        # partition entière est retentée, pas ses lots); les index sont créés une fois
+        # toutes les partitions chargées
+        partition_config = dict(config, commit_every=sys.maxsize, indexes=(), batch_retries=0,
+                                create_natural_key=False)
+        read_batch_size = config.get('read_batch_size', self.READ_BATCH_SIZE)
+        queue_size = config.get('queue_size', self.QUEUE_SIZE)
+        
+        def export_partition(bounds):
+            rows = self._stream_sqlite_rows(
+                sqlite_path,
+                "SELECT * FROM mp3_files WHERE rowid BETWEEN ? AND ?",
+                bounds,
+                batch_size=read_batch_size,
+                queue_size=queue_size
+            )
+            with closing(rows):
+                return self._export_rows(export_type, rows, partition_config)
+        
+        report = [{'range': bounds, 'count': 0, 'attempts': 0, 'error': None} for bounds in ranges]
+        pending = list(range(len(ranges)))
+        with ThreadPoolExecutor(max_workers=parallelism) as pool:
+            for attempt in range(1, retries + 2):
+                futures = {index: pool.submit(export_partition, ranges[index]) for index in pending}
+                pending = []
+                for index, future in futures.items():
+                    report[index]['attempts'] = attempt
+                    try:
+                        report[index]['count'] = future.result()
+                        report[index]['error'] = None
+                    except Exception as e:
+                        report[index]['error'] = str(e)
+                        pending.append(index)
+                if not pending or attempt > retries:
+                    break
+                self.logger.warning(f"{len(pending)} partition(s) en échec, tentative {attempt + 1}")
+        
+        self.last_partition_report = report
+        count = sum(part['count'] for part in report)
+        if not pending:
+            self._create_target_indexes(export_type, config)
+        self._log_throughput(f"{export_type} ({parallelism} connexions)", count, time.perf_counter() - start)
+        
+        if pending:
+            failed = ', '.join(f"{report[i]['range'][0]}-{report[i]['range'][1]}" for i in pending)
+            raise Exception(f"Erreur lors de l'exportation parallèle: {len(pending)} partition(s) en échec "
+                            f"(rowid {failed}), {count} enregistrements exportés. "
+                            f"Dernière erreur: {report[pending[-1]]['error']}")
+        return count
+    
+    @staticmethod
+    def _rowid_ranges(sqlite_path, partitions):
+        """Découpe l'intervalle des rowid de mp3_files en plages contiguës"""
+        conn = sqlite3.connect(sqlite_path)
+        try:
+            low, high = conn.execute("SELECT MIN(rowid), MAX(rowid) FROM mp3_files").fetchone()
+        finally:
+            conn.close()
+        if low is None:
+            return []
+        partitions = max(1, min(partitions, high - low + 1))
+        step = (high - low + partitions) // partitions
+        return [(first, min(first + step - 1, high)) for first in range(low, high + 1, step)]
+    
+    def _prepare_target(self, export_type, config, sample_row, column_types=None):
+        """Crée la table cible (à partir d'une ligne d'exemple) avant un export concurrent
+        
+        Avec l'option upsert, la clé unique (relative_path, filename) est créée en même temps:
+        les connexions concurrentes n'ont plus qu'à écrire les lignes.
+        """
+        if not sample_row:
+            return
+        if export_type.lower() == 'mysql':
+            if not MYSQL_AVAILABLE:
+                raise ImportError("Le module mysql-connector-python n'est pas installé.")
+            create, ensure_key = self._create_mysql_table, self._ensure_mysql_natural_key
+            error, dialect = mysql_connector.Error, MYSQL
+        elif export_type.lower() == 'postgres':
+            if not POSTGRES_AVAILABLE:
+                raise ImportError("Le module psycopg2 n'est pas installé.")
+            create, ensure_key = self._create_postgres_table, self._ensure_postgres_natural_key
+            error, dialect = psycopg2.Error, POSTGRES
+        else:
+            raise ValueError(f"Type d'export non supporté: {export_type}")
+        
+        sql_types = self._target_sql_types(None, sample_row, config, dialect, column_types)
+        table = config['table']
+        
+        def prepare(cursor):
+            create(cursor, table, sample_row, sql_types)
+            if config.get('upsert'):
+                ensure_key(cursor, table)
+        
+        try:
+            with self._target_session(dialect, config) as session:
+                session.run(prepare, "création de la table")
+        except error as err:
+            self.logger.error(f"Erreur lors de la création de la table cible: {err}")
+            raise Exception(f"Erreur lors de la création de la table {config['table']}: {str(err)}")
+    
+    def _export_rows(self, export_type, rows, config, sync_keys=None, before_commit=None, column_types=None):
+        """Envoie des lignes vers la cible correspondant au type d'export"""
+        if export_type.lower() == 'mysql':
+            return self.export_to_mysql(rows, config, sync_keys=sync_keys, before_commit=before_commit,
+                                        column_types=column_types)
+        elif export_type.lower() == 'postgres':
+            return self.export_to_postgres(rows, config, sync_keys=sync_keys, before_commit=before_commit,
+                                           column_types=column_types)
+        else:
+            raise ValueError(f"Type d'export non supporté: {export_type}")
+    
+    def _first_sqlite_row(self, sqlite_path):
+        """Première ligne de mp3_files (ligne d'exemple pour créer la table cible), ou None"""
+        with closing(self._stream_sqlite_rows(sqlite_path, "SELECT * FROM mp3_files LIMIT 1")) as rows:
+            return next(rows, None)
+    
+    def _stream_sqlite_rows(self, sqlite_path, query, params=(), batch_size=None, queue_size=None, keep_id=False):
+        """Lit une requête SQLite dans un thread séparé et restitue les lignes au fil de l'eau
+        
+        Le générateur doit être fermé par l'appelant (contextlib.closing) s'il n'est pas lu
+        jusqu'au bout: sa fermeture arrête le thread lecteur.
+        
+        Args:
+            sqlite_path (str): Chemin vers la base de données SQLite
+            query (str): Requête de lecture
+            params (tuple, optional): Paramètres de la requête
+            batch_size (int, optional): Nombre de lignes par fetchmany
+            queue_size (int, optional): Nombre maximal de lots en attente
+            keep_id (bool, optional): Conserver la colonne 'id' (suivi de la progression)
+            
+        Yields:
+            dict: Lignes sous forme de dictionnaires, sans la colonne 'id' sauf si keep_id
+        """
+        batch_size = batch_size or self.READ_BATCH_SIZE
+        batches = queue.Queue(maxsize=queue_size or self.QUEUE_SIZE)
+        stop = threading.Event()
+        
+        def put(item):
+            # Attente interruptible: le consommateur peut abandonner en cours de route
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def reader():
+            # La connexion SQLite est créée et utilisée dans le thread lecteur uniquement
+            try:
+                conn = sqlite3.connect(sqlite_path)
+                try:
+                    # Lecture seule: une requête d'écriture est refusée par SQLite
+                    conn.execute("PRAGMA query_only = ON")
+                    cursor = conn.execute(query, params)
+                    columns = [column[0] for column in cursor.description]
+                    while not stop.is_set():
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        # L'identifiant SQLite n'est pas exporté: la cible a sa propre clé primaire
+                        batch = [{col: value for col, value in zip(columns, row) if keep_id or col != 'id'}
+                                 for row in rows]
+                        if not put(batch):
+                            break
+                finally:
+                    conn.close()
+            except Exception as e:
+                put(e)
+            finally:
+                put(None)
+        
+        thread = threading.Thread(target=reader, name="sqlite-export-reader", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = batches.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield from item
+        finally:
+            stop.set()
+            thread.join()
+    
+    def _read_change_seq(self, sqlite_path):
+        """Dernière séquence du journal des modifications de la base source (0 sans journal)
+
+        Lecture seule: la base source n'est pas modifiée pendant l'export.
+        """
+        db = DatabaseManager(sqlite_path)
+        if not db.connect():
+            raise Exception(f"Erreur lors de la lecture de la base SQLite: {sqlite_path}")
+        try:
+            db.conn.execute("PRAGMA query_only = ON")
+            return db.get_last_change_seq()
+        finally:
+            db.close()
+    
+    def _save_change_seq(self, sqlite_path, export_type, config):
+        """Enregistre dans la base source la séquence couverte par l'export réussi vers la cible
+
+        Seule écriture de l'export dans la base source: la tâche qui exporte doit détenir
+        sa ressource d'écriture (task_scheduler.database_resource).
+        """
+        if self.last_change_seq is None:
+            return
+        db = DatabaseManager(sqlite_path)
+        if not db.connect():
+            self.logger.error(f"Séquence d'export non enregistrée: connexion impossible à {sqlite_path}")
+            return
+        try:
+            db.set_export_seq(export_target_key(export_type, config), self.last_change_seq)
+        finally:
+            db.close()
+    
+    def _export_changes_from_sqlite(self, sqlite_path, export_type, config, since_seq):
+        """Exporte uniquement les modifications journalisées depuis une séquence
+        
+        Chaque enregistrement modifié remplace sa version précédente dans la cible
+        (suppression par clé naturelle puis insertion) et les suppressions sont propagées.
+        """
+        db = DatabaseManager(sqlite_path)
+        if not db.connect():
+            raise Exception(f"Erreur lors de la lecture de la base SQLite: {sqlite_path}")
+        try:
+            db.conn.execute("PRAGMA query_only = ON")
+            changes = db.get_changed_records(since_seq)
+        finally:
+            db.close()
+        # Types déduits de toute la table: la cible peut être créée par un export incrémental
+        column_types = self._source_column_types(sqlite_path, config)
+        
+        # L'identifiant SQLite n'est pas exporté: la cible a sa propre clé primaire
+        records = [{k: v for k, v in row.items() if k != 'id'} for row in changes['records']]
+        sync_keys = list(changes['deleted'])
+        sync_keys.extend((row['relative_path'], row['filename']) for row in records)
+        
+        count = self._export_rows(export_type, records, config, sync_keys=sync_keys, column_types=column_types)
+        
+        self.last_change_seq = changes['last_seq']
+        self.logger.info(f"Export incrémental: séquences {since_seq} à {self.last_change_seq}, "
+                         f"{count} enregistrements, {len(changes['deleted'])} suppressions")
+        return count
+    
+    def _create_mysql_table(self, cursor, table_name, sample_row, sql_types=None):
+        """Crée une table MySQL si elle n'existe pas
+        
+        Args:
+            sql_types (dict, optional): Colonne -> type SQL (TEXT pour les colonnes absentes)
+        """
         if not sample_row:
             return
             
         # Construction des colonnes en se basant sur les données d'exemple
         columns = []
         for col_name in sample_row.keys():
-            # Utiliser des types appropriés en fonction des types de données dans MP3tag
-            columns.append(f"`{col_name}` TEXT")
+            columns.append(f"`{col_name}` {(sql_types or {}).get(col_name, 'TEXT')}")
         
         # Ajout d'une colonne ID auto-incrémentée comme clé primaire
         columns_str = ', '.join(columns)
@@ -192,16 +849,19 @@ class DBExporter:
         
         cursor.execute(query)
     
-    def _create_postgres_table(self, cursor, table_name, sample_row):
-        """Crée une table PostgreSQL si elle n'existe pas"""
+    def _create_postgres_table(self, cursor, table_name, sample_row, sql_types=None):
+        """Crée une table PostgreSQL si elle n'existe pas
+        
+        Args:
+            sql_types (dict, optional): Colonne -> type SQL (TEXT pour les colonnes absentes)
+        """
         if not sample_row:
             return
             
         # Construction des colonnes en se basant sur les données d'exemple
         columns = []
         for col_name in sample_row.keys():
-            # Utiliser des types appropriés en fonction des types de données dans MP3tag
-            columns.append(f'"{col_name}" TEXT')
+            columns.append(f'"{col_name}" {(sql_types or {}).get(col_name, "TEXT")}')
         
         # Ajout d'une colonne ID auto-incrémentée comme clé primaire
         columns_str = ', '.join(columns)
@@ -212,6 +872,115 @@ class DBExporter:
         
         cursor.execute(query)
     
+    def _target_sql_types(self, data, first_row, config, dialect, column_types=None):
+        """Types SQL de la table à créer, selon l'option 'schema' de la cible
+        
+        Returns:
+            dict: Colonne -> type SQL, ou None pour un schéma entièrement TEXT
+        """
+        if not first_row:
+            return None
+        overrides = config.get('type_overrides')
+        if config.get('schema', 'typed') != 'typed':
+            return build_column_types(first_row.keys(), None, dialect, overrides)
+        if column_types is None and isinstance(data, list):
+            column_types = infer_column_types(data)
+        return build_column_types(first_row.keys(), column_types, dialect, overrides)
+    
+    def _source_column_types(self, sqlite_path, config, query=None, params=()):
+        """Types logiques des colonnes de mp3_files (ou du résultat d'une requête) si le schéma typé est demandé"""
+        if config.get('schema', 'typed') != 'typed':
+            return None
+        return infer_sqlite_column_types(sqlite_path, query=query, params=params)
+    
+    def _get_numeric_columns(self, cursor, table_name, dialect):
+        """Colonnes numériques de la table cible (les chaînes vides y sont exportées en NULL)"""
+        if dialect == MYSQL:
+            cursor.execute(
+                "SELECT COLUMN_NAME, DATA_TYPE FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table_name,)
+            )
+        else:
+            cursor.execute(
+                "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = %s",
+                (table_name,)
+            )
+        return {name for name, data_type in cursor.fetchall() if is_numeric_sql_type(data_type)}
+    
+    @staticmethod
+    def _batch_values(batch, columns, numeric_columns):
+        """Valeurs d'un lot dans l'ordre des colonnes, chaînes vides des colonnes numériques en NULL"""
+        values = [[row.get(col) for col in columns] for row in batch]
+        numeric_indexes = [i for i, col in enumerate(columns) if col in numeric_columns]
+        if numeric_indexes:
+            for row_values in values:
+                for i in numeric_indexes:
+                    if row_values[i] == '':
+                        row_values[i] = None
+        return values
+    
+    def _create_mysql_indexes(self, cursor, table_name, columns, table_columns):
+        """Crée les index secondaires MySQL absents (préfixe de 255 caractères pour TEXT)"""
+        columns = [col for col in columns if col in table_columns]
+        if not columns:
+            return
+        cursor.execute(f"SHOW INDEX FROM `{table_name}`")
+        # La 3e colonne de SHOW INDEX est le nom de l'index
+        existing = {row[2] for row in cursor.fetchall()}
+        cursor.execute(
+            "SELECT COLUMN_NAME, DATA_TYPE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table_name,)
+        )
+        types = {name: data_type.lower() for name, data_type in cursor.fetchall()}
+        for col in columns:
+            index_name = f"idx_{col}"
+            if index_name in existing:
+                continue
+            key = f"`{col}`(255)" if types.get(col, 'text').endswith('text') else f"`{col}`"
+            cursor.execute(f"CREATE INDEX `{index_name}` ON `{table_name}` ({key})")
+            self.logger.info(f"Index {index_name} créé sur {table_name}")
+    
+    def _create_postgres_indexes(self, cursor, table_name, columns, table_columns):
+        """Crée les index secondaires PostgreSQL absents"""
+        for col in columns:
+            if col in table_columns:
+                cursor.execute(f'CREATE INDEX IF NOT EXISTS "{table_name}_{col}_idx" ON "{table_name}" ("{col}")')
+    
+    def _create_target_indexes(self, export_type, config):
+        """Crée les index de la cible sur une connexion dédiée (après un export partitionné)"""
+        if not config.get('indexes', DEFAULT_INDEXES):
+            return
+        if export_type.lower() == 'mysql':
+            dialect, get_columns, create, error = (MYSQL, self._get_mysql_table_columns,
+                                                   self._create_mysql_indexes, mysql_connector.Error)
+        else:
+            dialect, get_columns, create, error = (POSTGRES, self._get_postgres_table_columns,
+                                                   self._create_postgres_indexes, psycopg2.Error)
+        
+        def create_indexes(cursor):
+            table_columns = set(get_columns(cursor, config['table']))
+            create(cursor, config['table'], config.get('indexes', DEFAULT_INDEXES), table_columns)
+        
+        try:
+            with self._target_session(dialect, config) as session:
+                session.run(create_indexes, "création des index")
+        except error as err:
+            self.logger.error(f"Erreur lors de la création des index: {err}")
+            raise Exception(f"Erreur lors de la création des index de {config['table']}: {str(err)}")
+    
+    def _mysql_table_exists(self, cursor, table_name):
+        """Indique si une table existe dans la base MySQL courante"""
+        cursor.execute(
+            "SELECT 1 FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+            (table_name,)
+        )
+        return cursor.fetchone() is not None
+    
+    def _postgres_table_exists(self, cursor, table_name):
+        """Indique si une table existe (schémas du search_path) dans la base PostgreSQL"""
+        cursor.execute("SELECT to_regclass(%s)", (f'"{table_name}"',))
+        return cursor.fetchone()[0] is not None
+    
     def _get_mysql_table_columns(self, cursor, table_name):
         """Récupère la liste des colonnes d'une table MySQL"""
         cursor.execute(f"SHOW COLUMNS FROM `{table_name}`")
@@ -225,6 +994,281 @@ class DBExporter:
         """)
         return [row[0] for row in cursor.fetchall()]
     
+    def _target_session(self, dialect, config, allow_local_infile=False):
+        """Session sur une connexion empruntée à la réserve partagée de la cible
+        
+        Les réserves sont communes à tous les exports de l'application: plusieurs
+        exports successifs vers la même cible réutilisent les mêmes connexions.
+        
+        Returns:
+            TargetSession: Session à utiliser comme gestionnaire de contexte
+        """
+        key = (dialect, config['host'], config.get('port'), config['user'], config['password'],
+               config['database'], allow_local_infile)
+        if dialect == MYSQL:
+            connect = lambda: self._connect_mysql(config, allow_local_infile=allow_local_infile)
+            health_check, is_transient = self._mysql_is_healthy, self._is_transient_mysql_error
+        else:
+            connect = lambda: self._connect_postgres(config)
+            health_check, is_transient = self._postgres_is_healthy, self._is_transient_postgres_error
+        pool = get_pool(key, connect, health_check,
+                        max_idle=max(config.get('pool_size', 4), config.get('parallelism', 1)))
+        policy = RetryPolicy(retries=config.get('batch_retries', 3), base_delay=config.get('retry_delay', 0.5))
+        return TargetSession(pool, is_transient, policy, self.logger)
+    
+    def _write_batches(self, session, batches, commit_every, write_batch, before_commit=None, prologue=None):
+        """Écrit des lots en transactions de commit_every lots
+        
+        Avec des nouvelles tentatives (batch_retries > 0), les lots d'une transaction
+        sont conservés jusqu'à sa validation afin d'être rejoués sur une nouvelle
+        connexion après une erreur transitoire: seule la transaction en cours est perdue.
+        
+        Args:
+            session (TargetSession): Session sur la cible
+            batches (iterable): Lots de lignes
+            commit_every (int): Nombre de lots par transaction
+            write_batch (callable): Écrit un lot (curseur, lot) et retourne le nombre de lignes écrites
+            before_commit (callable, optional): Appelé avec le curseur avant chaque validation
+            prologue (callable, optional): Appelé avec le curseur au début de la première
+                transaction (rejoué avec elle), même s'il n'y a aucun lot
+            
+        Returns:
+            int: Nombre de lignes écrites
+        """
+        def write_group(cursor, group, first):
+            if first and prologue:
+                prologue(cursor)
+            count = sum(write_batch(cursor, batch) for batch in group)
+            if before_commit:
+                before_commit(cursor)
+            return count
+        
+        count = 0
+        if not session.policy.retries:
+            # Sans nouvelle tentative, rien n'est conservé: les lots sont écrits au fil de l'eau
+            cursor = session.cursor
+            if prologue:
+                prologue(cursor)
+            for batch_index, batch in enumerate(batches, start=1):
+                count += write_batch(cursor, batch)
+                if batch_index % commit_every == 0:
+                    if before_commit:
+                        before_commit(cursor)
+                    session.commit()
+            if before_commit:
+                before_commit(cursor)
+            session.commit()
+            return count
+        
+        written_groups = 0
+        for group_index, group in enumerate(self._iter_batches(batches, commit_every), start=1):
+            count += session.run(lambda cursor: write_group(cursor, group, group_index == 1),
+                                 f"transaction {group_index}")
+            written_groups += 1
+        if not written_groups:
+            session.run(lambda cursor: write_group(cursor, [], True), "validation")
+        return count
+    
+    @staticmethod
+    def _mysql_is_healthy(conn):
+        """Vérifie qu'une connexion MySQL inactive répond encore (ping)"""
+        return conn.is_connected()
+    
+    @staticmethod
+    def _postgres_is_healthy(conn):
+        """Vérifie qu'une connexion PostgreSQL inactive répond encore"""
+        if conn.closed:
+            return False
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.rollback()
+        return True
+    
+    # Erreurs MySQL transitoires: connexion refusée/perdue, délai de verrou, interblocage
+    _TRANSIENT_MYSQL_ERRNOS = {1205, 1213, 2003, 2006, 2013, 2055}
+    
+    def _is_transient_mysql_error(self, error):
+        """True si une erreur MySQL justifie une nouvelle tentative"""
+        if getattr(error, 'errno', None) in self._TRANSIENT_MYSQL_ERRNOS:
+            return True
+        operational_error = getattr(mysql_connector, 'OperationalError', None)
+        return operational_error is not None and isinstance(error, operational_error)
+    
+    def _is_transient_postgres_error(self, error):
+        """True si une erreur PostgreSQL justifie une nouvelle tentative"""
+        # 40001: échec de sérialisation, 40P01: interblocage, 08xxx: connexion, 57P0x: arrêt du serveur
+        pgcode = getattr(error, 'pgcode', None) or ''
+        if pgcode in ('40001', '40P01') or pgcode.startswith(('08', '57P0')):
+            return True
+        transient_types = tuple(t for t in (getattr(psycopg2, 'OperationalError', None),
+                                            getattr(psycopg2, 'InterfaceError', None)) if t)
+        return bool(transient_types) and isinstance(error, transient_types)
+    
+    def _connect_mysql(self, config, allow_local_infile=False):
+        """Ouvre une connexion MySQL à partir de la configuration"""
+        return mysql_connector.connect(
+            host=config['host'],
+            port=config.get('port', 3306),
+            user=config['user'],
+            password=config['password'],
+            database=config['database'],
+            allow_local_infile=allow_local_infile
+        )
+    
+    def _mysql_insert_query(self, table_name, columns, upsert=False):
+        """Construit la requête INSERT paramétrée pour MySQL (avec mise à jour des doublons si upsert)"""
+        placeholders = ', '.join(['%s'] * len(columns))
+        column_list = ', '.join(f"`{col}`" for col in columns)
+        query = f"INSERT INTO `{table_name}` ({column_list}) VALUES ({placeholders})"
+        if upsert:
+            # Colonne affectée à elle-même si seule la clé naturelle est exportée
+            updates = ', '.join(f"`{col}` = VALUES(`{col}`)" for col in columns
+                                if col not in ('relative_path', 'filename')) or "`filename` = `filename`"
+            query += f" ON DUPLICATE KEY UPDATE {updates}"
+        return query
+    
+    def _ensure_mysql_natural_key(self, cursor, table_name):
+        """Crée la clé unique (relative_path, filename) nécessaire aux mises à jour des doublons"""
+        cursor.execute(f"SHOW INDEX FROM `{table_name}` WHERE Key_name = 'natural_key'")
+        if cursor.fetchall():
+            return
+        # Les colonnes TEXT ne peuvent être indexées que sur un préfixe
+        cursor.execute(
+            "SELECT COLUMN_NAME, DATA_TYPE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table_name,)
+        )
+        types = {name: data_type.lower() for name, data_type in cursor.fetchall()}
+        key_parts = [f"`{col}`(255)" if types.get(col, 'text').endswith('text') else f"`{col}`"
+                     for col in ('relative_path', 'filename')]
+        cursor.execute(f"ALTER TABLE `{table_name}` ADD UNIQUE KEY `natural_key` ({', '.join(key_parts)})")
+    
+    def _load_data_mysql(self, cursor, table_name, columns, values, replace=False):
+        """Charge un lot via LOAD DATA LOCAL INFILE depuis un fichier TSV temporaire"""
+        fd, tsv_path = tempfile.mkstemp(suffix='.tsv', prefix='mp3tag_export_')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                for row_values in values:
+                    f.write('\t'.join(self._escape_tsv_value(v) for v in row_values))
+                    f.write('\n')
+            
+            column_list = ', '.join(f"`{col}`" for col in columns)
+            # Chemin au format POSIX: MySQL interprète les antislashs comme échappements
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE '{tsv_path.replace(os.sep, '/')}' "
+                f"{'REPLACE ' if replace else ''}INTO TABLE `{table_name}` "
+                f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+                f"LINES TERMINATED BY '\\n' ({column_list})"
+            )
+        finally:
+            os.remove(tsv_path)
+    
+    @staticmethod
+    def _escape_tsv_value(value):
+        """Encode une valeur au format TSV attendu par LOAD DATA (NULL = \\N)"""
+        if value is None:
+            return '\\N'
+        if isinstance(value, bytes):
+            value = value.decode('utf-8', errors='replace')
+        return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r').replace('\0', '\\0'))
+    
+    @staticmethod
+    def _iter_batches(rows, batch_size):
+        """Découpe un itérable de lignes en lots de taille batch_size"""
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    @staticmethod
+    def _get_batch_columns(batch, table_columns):
+        """Colonnes d'un lot présentes dans la table cible, dans l'ordre d'apparition"""
+        columns = {}
+        for row in batch:
+            for col in row:
+                if col in table_columns:
+                    columns[col] = None
+        return list(columns)
+    
+    def _log_throughput(self, target, count, elapsed):
+        """Journalise le nombre d'enregistrements exportés et le débit obtenu"""
+        rate = count / elapsed if elapsed > 0 else 0
+        self.last_throughput = rate
+        self.logger.info(f"{count} enregistrements exportés vers {target} en {elapsed:.1f}s ({rate:.0f} lignes/s)")
+    
+    def _connect_postgres(self, config):
+        """Ouvre une connexion PostgreSQL à partir de la configuration"""
+        return psycopg2.connect(
+            host=config['host'],
+            port=config.get('port', 5432),
+            user=config['user'],
+            password=config['password'],
+            dbname=config['database']
+        )
+    
+    @staticmethod
+    def _quote_postgres_columns(columns):
+        """Liste de colonnes entre guillemets doubles pour PostgreSQL"""
+        return ', '.join(f'"{col}"' for col in columns)
+    
+    def _postgres_insert_query(self, table_name, columns):
+        """Construit la requête INSERT paramétrée pour PostgreSQL"""
+        placeholders = ', '.join(['%s'] * len(columns))
+        return f'INSERT INTO "{table_name}" ({self._quote_postgres_columns(columns)}) VALUES ({placeholders})'
+    
+    def _copy_to_postgres(self, cursor, table_name, columns, values):
+        """Envoie des lignes avec COPY ... FROM STDIN, encodées en CSV à la volée"""
+        cursor.copy_expert(
+            f'COPY "{table_name}" ({self._quote_postgres_columns(columns)}) FROM STDIN WITH (FORMAT csv)',
+            _CSVCopyStream(values)
+        )
+    
+    def _ensure_postgres_natural_key(self, cursor, table_name):
+        """Crée l'index unique (relative_path, filename) nécessaire à ON CONFLICT"""
+        cursor.execute(
+            f'CREATE UNIQUE INDEX IF NOT EXISTS "{table_name}_natural_key" '
+            f'ON "{table_name}" ("relative_path", "filename")'
+        )
+    
+    def _upsert_postgres(self, cursor, table_name, columns, values):
+        """Charge un lot dans une table de transit par COPY puis le fusionne dans la cible"""
+        staging = f"{table_name}_staging"
+        # staging_seq numérote les lignes dans l'ordre du COPY (ordre du lot)
+        cursor.execute(f'CREATE TEMP TABLE IF NOT EXISTS "{staging}" '
+                       f'(LIKE "{table_name}" INCLUDING DEFAULTS, "staging_seq" bigserial)')
+        cursor.execute(f'TRUNCATE "{staging}"')
+        self._copy_to_postgres(cursor, staging, columns, values)
+        
+        column_list = self._quote_postgres_columns(columns)
+        updates = ', '.join(f'"{col}" = EXCLUDED."{col}"' for col in columns
+                            if col not in ('relative_path', 'filename'))
+        conflict_action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        # DISTINCT ON: une même clé présente deux fois dans le lot ne doit être fusionnée
+        # qu'une fois, avec sa dernière occurrence (comme l'aurait fait une suite d'upserts)
+        cursor.execute(
+            f'INSERT INTO "{table_name}" ({column_list}) '
+            f'SELECT DISTINCT ON ("relative_path", "filename") {column_list} FROM "{staging}" '
+            f'ORDER BY "relative_path", "filename", "staging_seq" DESC '
+            f'ON CONFLICT ("relative_path", "filename") {conflict_action}'
+        )
+    
+    @staticmethod
+    def _peek(data):
+        """Retourne le premier élément d'un itérable et un itérateur sur l'ensemble des éléments"""
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None:
+            return None, iter(())
+        return first, itertools.chain([first], rows)
+    
     def _get_valid_columns(self, row, table_columns):
         """Filtre les colonnes qui existent dans la table"""
         return [col for col in row.keys() if col in table_columns]
@@ -148,6 +148,59 @@ class DatabaseManager:
                 )
             ''')
             
+            # Table des groupes de doublons (remplie par DuplicateFinder)
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS duplicate_clusters (
+                    cluster_id INTEGER NOT NULL,
+                    track_id INTEGER NOT NULL,
+                    match_type TEXT NOT NULL,  -- 'exact' (crc/taille/durée) ou 'fuzzy' (titre+artiste)
+                    score REAL,
+                    PRIMARY KEY (cluster_id, track_id)
+                )
+            ''')
+            
+            # Journal des modifications de mp3_files (exports incrémentaux)
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS mp3_files_changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,  -- Numéro de séquence strictement croissant
+                    row_id INTEGER NOT NULL,
+                    operation TEXT NOT NULL,  -- 'insert', 'update' ou 'delete'
+                    relative_path TEXT,  -- Clé naturelle, conservée pour propager les suppressions
+                    filename TEXT,
+                    changed_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+                )
+            ''')
+            
+            # Séquence du journal atteinte par le dernier export réussi vers chaque cible
+            self._create_export_sync_table()
+            
+            # Le journal est alimenté par des triggers, quel que soit le chemin d'écriture
+            self.cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_mp3_files_insert AFTER INSERT ON mp3_files
+                BEGIN
+                    INSERT INTO mp3_files_changes (row_id, operation, relative_path, filename)
+                    VALUES (NEW.id, 'insert', NEW.relative_path, NEW.filename);
+                END
+            ''')
+            self.cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_mp3_files_update AFTER UPDATE ON mp3_files
+                BEGIN
+                    -- Changement de clé: l'ancienne clé doit disparaître en aval
+                    INSERT INTO mp3_files_changes (row_id, operation, relative_path, filename)
+                    SELECT OLD.id, 'delete', OLD.relative_path, OLD.filename
+                    WHERE OLD.relative_path IS NOT NEW.relative_path OR OLD.filename IS NOT NEW.filename;
+                    INSERT INTO mp3_files_changes (row_id, operation, relative_path, filename)
+                    VALUES (NEW.id, 'update', NEW.relative_path, NEW.filename);
+                END
+            ''')
+            self.cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_mp3_files_delete AFTER DELETE ON mp3_files
+                BEGIN
+                    INSERT INTO mp3_files_changes (row_id, operation, relative_path, filename)
+                    VALUES (OLD.id, 'delete', OLD.relative_path, OLD.filename);
+                END
+            ''')
+            
             self.logger.info("Tables créées avec succès")
             return True
         except sqlite3.Error as e:
@@ -352,6 +405,152 @@ class DatabaseManager:
             self.logger.error(f"Erreur lors de la recherche: {e}")
             return []
     
+    def get_last_change_seq(self):
+        """Récupération du dernier numéro de séquence du journal des modifications
+        
+        Returns:
+            int: Dernier numéro de séquence (0 si le journal est vide)
+        """
+        try:
+            # Base antérieure au journal: lecture seule, la table n'est pas créée ici
+            self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'mp3_files_changes'")
+            if self.cursor.fetchone() is None:
+                return 0
+            self.cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM mp3_files_changes")
+            return self.cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            self.logger.error(f"Erreur lors de la lecture du journal des modifications: {e}")
+            return 0
+    
+    def get_export_seq(self, target):
+        """Séquence du journal atteinte par le dernier export réussi vers une cible
+        
+        Args:
+            target (str): Identifiant de la cible (voir db_exporter.export_target_key)
+            
+        Returns:
+            int: Dernière séquence exportée, ou None si aucun export n'est enregistré
+        """
+        try:
+            self.cursor.execute("SELECT last_change_seq FROM export_sync WHERE target = ?", (target,))
+            row = self.cursor.fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            # Base antérieure à la table export_sync
+            self.logger.debug(f"Séquence d'export non disponible pour {target}: {e}")
+            return None
+    
+    def set_export_seq(self, target, seq):
+        """Enregistre la séquence du journal atteinte par un export réussi vers une cible
+        
+        Args:
+            target (str): Identifiant de la cible
+            seq (int): Séquence couverte par l'export
+            
+        Returns:
+            bool: True si l'enregistrement est réussi, False sinon
+        """
+        try:
+            self._create_export_sync_table()
+            self.cursor.execute(
+                "INSERT OR REPLACE INTO export_sync (target, last_change_seq) VALUES (?, ?)", (target, seq)
+            )
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Erreur lors de l'enregistrement de la séquence d'export: {e}")
+            self.conn.rollback()
+            return False
+    
+    def _create_export_sync_table(self):
+        """Crée la table export_sync (séquence exportée par cible) si elle n'existe pas"""
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS export_sync (
+                target TEXT PRIMARY KEY,  -- Cible d'export (ex: mysql://hôte:port/base/table)
+                last_change_seq INTEGER NOT NULL,
+                exported_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+            )
+        ''')
+    
+    def get_changes_since(self, since_seq):
+        """Récupération des entrées du journal postérieures à une séquence
+        
+        Args:
+            since_seq (int): Numéro de séquence de référence (exclu)
+            
+        Returns:
+            list: Liste de dictionnaires (seq, row_id, operation, relative_path, filename, changed_at)
+        """
+        try:
+            self.cursor.execute("SELECT * FROM mp3_files_changes WHERE seq > ? ORDER BY seq", (since_seq,))
+            columns = [column[0] for column in self.cursor.description]
+            return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            self.logger.error(f"Erreur lors de la lecture du journal des modifications: {e}")
+            return []
+    
+    def get_changed_records(self, since_seq):
+        """Récupération de l'état courant des enregistrements modifiés depuis une séquence
+        
+        Plusieurs modifications d'un même enregistrement sont compactées: seul son
+        état actuel est retourné, et une clé n'est signalée supprimée que si elle
+        n'existe plus dans mp3_files.
+        
+        Args:
+            since_seq (int): Numéro de séquence de référence (exclu)
+            
+        Returns:
+            dict: 'records' (enregistrements insérés ou modifiés), 'deleted' (clés
+                  (relative_path, filename) supprimées) et 'last_seq' (séquence atteinte)
+        """
+        try:
+            last_seq = self.get_last_change_seq()
+            if last_seq <= since_seq:
+                # Aucune modification (ou pas de journal)
+                return {'records': [], 'deleted': [], 'last_seq': last_seq}
+            
+            self.cursor.execute('''
+                SELECT * FROM mp3_files WHERE id IN (
+                    SELECT row_id FROM mp3_files_changes WHERE seq > ? AND seq <= ?
+                )
+            ''', (since_seq, last_seq))
+            columns = [column[0] for column in self.cursor.description]
+            records = [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+            
+            self.cursor.execute('''
+                SELECT DISTINCT c.relative_path, c.filename FROM mp3_files_changes c
+                WHERE c.seq > ? AND c.seq <= ? AND c.operation = 'delete'
+                AND NOT EXISTS (
+                    SELECT 1 FROM mp3_files f
+                    WHERE f.relative_path = c.relative_path AND f.filename = c.filename
+                )
+            ''', (since_seq, last_seq))
+            deleted = self.cursor.fetchall()
+            
+            self.logger.info(f"Modifications depuis la séquence {since_seq}: {len(records)} enregistrements, {len(deleted)} suppressions")
+            return {'records': records, 'deleted': deleted, 'last_seq': last_seq}
+        except sqlite3.Error as e:
+            self.logger.error(f"Erreur lors de la lecture des modifications: {e}")
+            return {'records': [], 'deleted': [], 'last_seq': since_seq}
+    
+    def purge_changes(self, up_to_seq):
+        """Suppression des entrées du journal déjà propagées
+        
+        Args:
+            up_to_seq (int): Numéro de séquence jusqu'auquel purger (inclus)
+            
+        Returns:
+            bool: True si la purge est réussie, False sinon
+        """
+        try:
+            self.cursor.execute("DELETE FROM mp3_files_changes WHERE seq <= ?", (up_to_seq,))
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Erreur lors de la purge du journal des modifications: {e}")
+            self.conn.rollback()
+            return False
+    
     def delete_record(self, record_id):
         """Suppression d'un enregistrement
         
@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module de détection des doublons dans la collection MP3
+Auteur: Geoffroy Streit
+"""
+
+import logging
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+
+from db_manager import DatabaseManager
+
+# Mentions ignorées lors de la normalisation des titres et artistes
+_BRACKETS_PATTERN = re.compile(r'[\(\[\{][^\)\]\}]*[\)\]\}]')
+_FEATURING_PATTERN = re.compile(r'\b(feat|ft|featuring)\b\.?.*$')
+_NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9]+')
+_NUMBER_PATTERN = re.compile(r'\d+')
+
+
+def normalize_text(value):
+    """Normalise un titre ou un artiste pour la comparaison approximative
+
+    Passage en minuscules, suppression des accents, des mentions entre
+    parenthèses/crochets, des "feat." et de la ponctuation.
+
+    Args:
+        value (str): Texte à normaliser
+
+    Returns:
+        str: Texte normalisé (chaîne vide si la valeur est absente)
+    """
+    if not value:
+        return ''
+    text = unicodedata.normalize('NFKD', str(value))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = _BRACKETS_PATTERN.sub(' ', text)
+    text = _FEATURING_PATTERN.sub(' ', text)
+    return _NON_ALNUM_PATTERN.sub(' ', text).strip()
+
+
+def _parse_duration(value):
+    """Convertit une durée (secondes ou h:m:s) en secondes, None si invalide"""
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        seconds = 0.0
+        for part in str(value).split(':'):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        return None
+
+
+def _match_blocks(blocks, duration_tolerance, similarity_threshold):
+    """Compare les pistes de chaque bloc (exécuté dans un processus du pool)
+
+    Dans un bloc, les pistes sont triées par durée: seules les pistes dont
+    l'écart de durée reste dans la tolérance sont comparées (fenêtre glissante),
+    ce qui évite la comparaison de toutes les paires. Les nombres des titres
+    (No. 1/No. 2, Part 1/Part 2, opus, numéros de piste) doivent être identiques:
+    ils distinguent des œuvres différentes malgré des titres presque égaux.
+
+    Args:
+        blocks (list): Liste de blocs, chaque bloc étant une liste de (id, titre normalisé, durée)
+        duration_tolerance (float): Écart de durée maximal en secondes
+        similarity_threshold (float): Similarité minimale (0 à 1) entre les clés
+
+    Returns:
+        list: Paires (id_a, id_b, score) considérées comme doublons
+    """
+    pairs = []
+    for block in blocks:
+        block.sort(key=lambda track: track[2])
+        numbers = [_NUMBER_PATTERN.findall(key) for _, key, _ in block]
+        for i, (id_a, key_a, duration_a) in enumerate(block):
+            # La seconde séquence est mise en cache par SequenceMatcher: on y place key_a
+            matcher = SequenceMatcher(None, b=key_a)
+            for j in range(i + 1, len(block)):
+                id_b, key_b, duration_b = block[j]
+                if duration_b - duration_a > duration_tolerance:
+                    break
+                if key_a == key_b:
+                    pairs.append((id_a, id_b, 1.0))
+                    continue
+                if numbers[i] != numbers[j]:
+                    continue
+                matcher.set_seq1(key_b)
+                # Bornes supérieures rapides avant le calcul complet
+                if matcher.real_quick_ratio() < similarity_threshold or matcher.quick_ratio() < similarity_threshold:
+                    continue
+                score = matcher.ratio()
+                if score >= similarity_threshold:
+                    pairs.append((id_a, id_b, score))
+    return pairs
+
+
+class DuplicateFinder:
+    """Détecteur de doublons sur la table mp3_files
+
+    Deux étapes complémentaires:
+    - correspondance exacte sur (crc, file_size, audio_length), servie par un index;
+    - correspondance approximative sur le titre normalisé avec tolérance sur la
+      durée, limitée aux pistes partageant la même clé de blocage (même artiste
+      normalisé) et exécutée dans un pool de processus.
+    Les groupes obtenus sont enregistrés dans la table duplicate_clusters.
+    """
+
+    # Longueur du préfixe de titre qui, avec l'artiste normalisé, forme la clé de blocage
+    BLOCK_PREFIX_LENGTH = 3
+    # Nombre approximatif de pistes envoyées à chaque tâche du pool
+    TASK_SIZE = 5000
+    # En dessous de ce nombre de pistes candidates, pas de pool de processus
+    MIN_PARALLEL_TRACKS = 20000
+
+    def __init__(self, db_path, duration_tolerance=2.0, similarity_threshold=0.9, workers=None):
+        """Initialisation du détecteur
+
+        Args:
+            db_path (str): Chemin vers la base de données SQLite
+            duration_tolerance (float): Écart de durée toléré en secondes pour l'étape approximative
+            similarity_threshold (float): Similarité minimale (0 à 1) des titres normalisés
+            workers (int, optional): Nombre de processus (par défaut: nombre de cœurs)
+        """
+        self.db_path = db_path
+        self.duration_tolerance = duration_tolerance
+        self.similarity_threshold = similarity_threshold
+        self.workers = workers or os.cpu_count() or 1
+        self.logger = logging.getLogger('mp3tag_analyzer.duplicates')
+
+    def find_duplicates(self):
+        """Détecte les doublons et enregistre les groupes dans duplicate_clusters
+
+        Returns:
+            dict: Statistiques (clusters exacts, approximatifs, pistes concernées, durée)
+        """
+        start = time.perf_counter()
+        db = DatabaseManager(self.db_path)
+        if not db.connect():
+            raise Exception(f"Impossible d'ouvrir la base de données {self.db_path}")
+
+        try:
+            db.create_tables()
+            db.cursor.execute("CREATE INDEX IF NOT EXISTS idx_mp3_files_exact_dup ON mp3_files(crc, file_size, audio_length)")
+            db.conn.commit()
+
+            exact_pairs = self._find_exact_pairs(db.cursor)
+            self.logger.info(f"Étape exacte: {len(exact_pairs)} paires")
+
+            fuzzy_pairs = self._find_fuzzy_pairs(db.cursor)
+            self.logger.info(f"Étape approximative: {len(fuzzy_pairs)} paires")
+
+            clusters = self._build_clusters(exact_pairs, fuzzy_pairs)
+            self._store_clusters(db, clusters)
+        finally:
+            db.close()
+
+        stats = {
+            'exact_clusters': sum(1 for c in clusters if c['match_type'] == 'exact'),
+            'fuzzy_clusters': sum(1 for c in clusters if c['match_type'] == 'fuzzy'),
+            'tracks': sum(len(c['track_ids']) for c in clusters),
+            'elapsed': time.perf_counter() - start,
+        }
+        self.logger.info(f"Détection des doublons terminée en {stats['elapsed']:.1f}s: "
+                         f"{stats['exact_clusters']} groupes exacts, {stats['fuzzy_clusters']} approximatifs")
+        return stats
+
+    def _find_exact_pairs(self, cursor):
+        """Étape exacte: regroupement par (crc, file_size, audio_length) via l'index"""
+        cursor.execute("""
+            SELECT group_concat(id) FROM mp3_files
+            WHERE crc IS NOT NULL AND crc != ''
+            GROUP BY crc, file_size, audio_length
+            HAVING COUNT(*) > 1
+        """)
+        pairs = []
+        for (ids,) in cursor:
+            ids = [int(i) for i in ids.split(',')]
+            # Chaîner les pistes du groupe suffit pour l'union des ensembles
+            pairs.extend((ids[0], other, 1.0) for other in ids[1:])
+        return pairs
+
+    def _find_fuzzy_pairs(self, cursor):
+        """Étape approximative: blocage par artiste et préfixe de titre normalisés, comparaison en parallèle"""
+        blocks = {}
+        cursor.execute("SELECT id, artist, title, audio_length FROM mp3_files")
+        while True:
+            rows = cursor.fetchmany(10000)
+            if not rows:
+                break
+            for track_id, artist, title, audio_length in rows:
+                duration = _parse_duration(audio_length)
+                artist_key = normalize_text(artist)
+                title_key = normalize_text(title)
+                if duration is None or not title_key:
+                    continue
+                block_key = (artist_key, title_key[:self.BLOCK_PREFIX_LENGTH])
+                # L'artiste est identique dans tout le bloc: seul le titre est comparé
+                blocks.setdefault(block_key, []).append((track_id, title_key, duration))
+
+        # Seuls les blocs d'au moins deux pistes peuvent contenir des doublons
+        candidate_blocks = [block for block in blocks.values() if len(block) > 1]
+        candidate_tracks = sum(len(block) for block in candidate_blocks)
+        self.logger.info(f"{len(candidate_blocks)} blocs candidats ({candidate_tracks} pistes)")
+
+        # Regroupement des blocs en tâches de taille comparable
+        tasks = []
+        current, current_size = [], 0
+        for block in candidate_blocks:
+            current.append(block)
+            current_size += len(block)
+            if current_size >= self.TASK_SIZE:
+                tasks.append(current)
+                current, current_size = [], 0
+        if current:
+            tasks.append(current)
+
+        pairs = []
+        if self.workers > 1 and candidate_tracks >= self.MIN_PARALLEL_TRACKS:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(_match_blocks, task, self.duration_tolerance, self.similarity_threshold)
+                           for task in tasks]
+                for future in futures:
+                    pairs.extend(future.result())
+        else:
+            for task in tasks:
+                pairs.extend(_match_blocks(task, self.duration_tolerance, self.similarity_threshold))
+        return pairs
+
+    def _build_clusters(self, exact_pairs, fuzzy_pairs):
+        """Regroupe les paires en clusters
+
+        Les paires exactes sont réunies transitivement (union-find): elles désignent le
+        même fichier. Les paires approximatives ne le sont pas, car une chaîne de titres
+        voisins (Part 1, Part 1 Live, Part 2...) réunirait des œuvres différentes: chaque
+        cluster approximatif part d'une graine (le plus petit id disponible) et ne reçoit
+        que les groupes qui lui correspondent directement.
+
+        Returns:
+            list: Clusters sous forme de dictionnaires (track_ids, match_type, score)
+        """
+        parent = {}
+
+        def find(track_id):
+            parent.setdefault(track_id, track_id)
+            while parent[track_id] != track_id:
+                parent[track_id] = parent[parent[track_id]]
+                track_id = parent[track_id]
+            return track_id
+
+        for id_a, id_b, _ in exact_pairs:
+            root_a, root_b = find(id_a), find(id_b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        # Correspondances approximatives entre groupes exacts (ou pistes isolées)
+        matches = {}
+        for id_a, id_b, score in fuzzy_pairs:
+            root_a, root_b = find(id_a), find(id_b)
+            if root_a == root_b:
+                continue
+            for root, other in ((root_a, root_b), (root_b, root_a)):
+                links = matches.setdefault(root, {})
+                links[other] = max(links.get(other, 0.0), score)
+
+        members = {}
+        for track_id in parent:
+            members.setdefault(find(track_id), []).append(track_id)
+
+        clusters = []
+        assigned = set()
+        for root in sorted(members, key=lambda root: min(members[root])):
+            if root in assigned:
+                continue
+            assigned.add(root)
+            track_ids = list(members[root])
+            scores = [score for other, score in matches.get(root, {}).items() if other not in assigned]
+            for other in matches.get(root, {}):
+                if other not in assigned:
+                    assigned.add(other)
+                    track_ids.extend(members[other])
+            if len(track_ids) < 2:
+                # Correspondances déjà prises par d'autres clusters
+                continue
+            clusters.append({
+                'track_ids': sorted(track_ids),
+                'match_type': 'fuzzy' if scores else 'exact',
+                'score': round(min(scores, default=1.0), 3),
+            })
+        return clusters
+
+    def _store_clusters(self, db, clusters):
+        """Remplace le contenu de la table duplicate_clusters"""
+        clusters.sort(key=lambda c: c['track_ids'][0])
+        db.cursor.execute("DELETE FROM duplicate_clusters")
+        db.cursor.executemany(
+            "INSERT INTO duplicate_clusters (cluster_id, track_id, match_type, score) VALUES (?, ?, ?, ?)",
+            ((cluster_id, track_id, c['match_type'], c['score'])
+             for cluster_id, c in enumerate(clusters, start=1)
+             for track_id in c['track_ids'])
+        )
+        db.conn.commit()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module de mise en tampon des modifications de cellules et de leur journal d'annulation
+Auteur: Geoffroy Streit
+"""
+
+import logging
+from collections import OrderedDict, defaultdict
+
+
+class EditBuffer:
+    """Modifications de cellules en attente d'écriture dans une table SQLite
+
+    Les modifications sont regroupées par cellule (rowid, colonne) puis écrites en
+    une seule transaction: un UPDATE par lots (executemany) par colonne modifiée.
+    Chaque modification écrite est consignée dans une table journal qui sert
+    à l'annulation et au rétablissement, y compris après redémarrage.
+    """
+
+    def __init__(self, table='mp3_files'):
+        """Initialisation
+
+        Args:
+            table (str): Table modifiée
+        """
+        self.table = table
+        self.journal_table = f"{table}_edit_journal"
+        self.logger = logging.getLogger('mp3tag_analyzer.edit_buffer')
+        # (rowid, colonne) -> (valeur d'origine, nouvelle valeur)
+        self._pending = OrderedDict()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, rowid, column, old_value, new_value):
+        """Ajoute une modification de cellule
+
+        Args:
+            rowid (int): rowid de la ligne modifiée
+            column (str): Colonne modifiée
+            old_value: Valeur enregistrée dans la base
+            new_value: Nouvelle valeur
+        """
+        key = (rowid, column)
+        if key in self._pending:
+            # Plusieurs modifications de la même cellule: seule la dernière est écrite
+            old_value = self._pending[key][0]
+            del self._pending[key]
+        if new_value != old_value:
+            self._pending[key] = (old_value, new_value)
+
+    def get(self, rowid, column, default=None):
+        """Valeur en attente d'une cellule (default si elle n'est pas modifiée)"""
+        edit = self._pending.get((rowid, column))
+        return edit[1] if edit is not None else default
+
+    def flush(self, conn):
+        """Écrit les modifications en attente en une transaction
+
+        Args:
+            conn (sqlite3.Connection): Connexion à la base
+
+        Returns:
+            int: Nombre de cellules écrites
+        """
+        if not self._pending:
+            return 0
+        edits = list(self._pending.items())
+        by_column = defaultdict(list)
+        for (rowid, column), (old_value, new_value) in edits:
+            by_column[column].append((new_value, rowid))
+
+        self._ensure_journal(conn)
+        with conn:
+            # De nouvelles modifications rendent caduques les modifications annulées
+            conn.execute(f'DELETE FROM "{self.journal_table}" WHERE undone = 1')
+            for column, values in by_column.items():
+                conn.executemany(f'UPDATE "{self.table}" SET "{column}" = ? WHERE rowid = ?', values)
+            conn.executemany(
+                f'INSERT INTO "{self.journal_table}" (row_id, column_name, old_value, new_value) VALUES (?, ?, ?, ?)',
+                [(rowid, column, old_value, new_value) for (rowid, column), (old_value, new_value) in edits]
+            )
+        self._pending.clear()
+        self.logger.info(f"{len(edits)} modification(s) de cellules enregistrée(s) ({len(by_column)} colonne(s))")
+        return len(edits)
+
+    def undo(self, conn):
+        """Annule la dernière modification enregistrée (les modifications en attente sont d'abord écrites)
+
+        Returns:
+            tuple: (rowid, colonne, valeur rétablie), ou None s'il n'y a rien à annuler
+        """
+        self.flush(conn)
+        self._ensure_journal(conn)
+        entry = conn.execute(
+            f'SELECT seq, row_id, column_name, old_value FROM "{self.journal_table}" '
+            f'WHERE undone = 0 ORDER BY seq DESC LIMIT 1'
+        ).fetchone()
+        return self._apply(conn, entry, undone=1)
+
+    def redo(self, conn):
+        """Rétablit la dernière modification annulée
+
+        Returns:
+            tuple: (rowid, colonne, valeur rétablie), ou None s'il n'y a rien à rétablir
+        """
+        self.flush(conn)
+        self._ensure_journal(conn)
+        entry = conn.execute(
+            f'SELECT seq, row_id, column_name, new_value FROM "{self.journal_table}" '
+            f'WHERE undone = 1 ORDER BY seq ASC LIMIT 1'
+        ).fetchone()
+        return self._apply(conn, entry, undone=0)
+
+    def _apply(self, conn, entry, undone):
+        if entry is None:
+            return None
+        seq, rowid, column, value = entry
+        with conn:
+            conn.execute(f'UPDATE "{self.table}" SET "{column}" = ? WHERE rowid = ?', (value, rowid))
+            conn.execute(f'UPDATE "{self.journal_table}" SET undone = ? WHERE seq = ?', (undone, seq))
+        return rowid, column, value
+
+    def _ensure_journal(self, conn):
+        """Crée la table journal si nécessaire"""
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS "{self.journal_table}" (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                row_id INTEGER NOT NULL,
+                column_name TEXT NOT NULL,
+                old_value,  -- Sans type déclaré: la valeur est conservée telle quelle
+                new_value,
+                undone INTEGER NOT NULL DEFAULT 0,  -- 1 = annulée (peut être rétablie)
+                edited_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+            )
+        ''')
@@ -0,0 +1,346 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module de requêtes fédérées sur plusieurs bases de bibliothèques SQLite
+Auteur: Geoffroy Streit
+"""
+
+import logging
+import os
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from query_executor import QueryExecutor, QueryTimeoutError
+
+# Nombre de bases attachables par connexion (SQLITE_MAX_ATTACHED par défaut)
+DEFAULT_MAX_ATTACHED = 10
+
+# Constructions dont les résultats par base ne peuvent pas être simplement concaténés
+_NON_CONCATENABLE = re.compile(
+    r'\b(GROUP\s+BY|HAVING|DISTINCT|LIMIT|OFFSET|COUNT|SUM|TOTAL|AVG|MIN|MAX|GROUP_CONCAT)\b', re.IGNORECASE
+)
+# Littéraux et identifiants entre guillemets (ignorés par la détection)
+_QUOTED = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`|\[[^\]]*\]")
+# Tables de chaque base dont les lignes désignent des pistes par leur id (répété d'une base à l'autre)
+_TRACK_TABLES = ('duplicate_clusters',)
+
+
+def fanout_unsupported_reason(query):
+    """Construction qui empêche de concaténer les résultats d'une requête exécutée base par base
+
+    Agrégats, regroupements, DISTINCT et LIMIT donnent un résultat par base:
+    ils ne sont corrects en mode 'fanout' qu'avec des règles de fusion (voir merge_aggregates).
+
+    Args:
+        query (str): Requête SQL
+
+    Returns:
+        str: Mot-clé en cause (ex: 'GROUP BY'), ou None si la concaténation est correcte
+    """
+    match = _NON_CONCATENABLE.search(_QUOTED.sub("''", query))
+    return ' '.join(match.group(1).upper().split()) if match else None
+
+
+def attach_unsupported_reason(query):
+    """Jointure par id de piste qui mélangerait les bases en mode 'attach'
+
+    Les id de mp3_files se répètent d'une base à l'autre: une requête sur duplicate_clusters
+    (vue réunissant les tables des bases, avec source_db) doit joindre sur (source_db, id).
+
+    Args:
+        query (str): Requête SQL
+
+    Returns:
+        str: Table en cause, ou None si la requête ne la lit pas ou utilise source_db
+    """
+    if 'source_db' in _QUOTED.sub("''", query).lower():
+        return None
+    return next(iter(referenced_track_tables(query)), None)
+
+
+def referenced_track_tables(query):
+    """Tables liées aux pistes (voir _TRACK_TABLES) lues par une requête"""
+    text = _QUOTED.sub("''", query).lower()
+    return [table for table in _TRACK_TABLES if re.search(rf'\b{table}\b', text)]
+
+
+def sqlite_order_key(value):
+    """Clé de tri suivant l'ordre de SQLite: NULL, puis nombres, puis textes, puis BLOB"""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    return (3, bytes(value))
+
+
+def merge_aggregates(columns, results, group_by, aggregates):
+    """Fusionne des résultats agrégés provenant de plusieurs bases
+
+    Args:
+        columns (list): Colonnes des résultats
+        results (list): Lignes (dictionnaires) de toutes les bases
+        group_by (list): Colonnes de regroupement
+        aggregates (dict): Colonne -> fonction de fusion: 'sum', 'count', 'min', 'max',
+            ou ('avg', colonne_de_poids) pour une moyenne pondérée (ex: ('avg', 'nb_tracks'))
+
+    Returns:
+        tuple: (colonnes, résultats fusionnés)
+    """
+    merged = {}
+    weights = {}
+    for row in results:
+        key = tuple(row.get(col) for col in group_by)
+        target = merged.get(key)
+        if target is None:
+            merged[key] = dict(row)
+            for col, func in aggregates.items():
+                if isinstance(func, tuple):
+                    weights[(key, col)] = row.get(func[1]) or 0
+            continue
+
+        for col, func in aggregates.items():
+            value = row.get(col)
+            current = target.get(col)
+            if value is None:
+                continue
+            if current is None:
+                target[col] = value
+            elif func in ('sum', 'count'):
+                target[col] = current + value
+            elif func == 'min':
+                target[col] = min(current, value)
+            elif func == 'max':
+                target[col] = max(current, value)
+            elif isinstance(func, tuple) and func[0] == 'avg':
+                # Moyenne pondérée par la colonne de poids (avant sa propre fusion)
+                weight = row.get(func[1]) or 0
+                total_weight = weights[(key, col)] + weight
+                if total_weight:
+                    target[col] = (current * weights[(key, col)] + value * weight) / total_weight
+                weights[(key, col)] = total_weight
+            else:
+                raise ValueError(f"Fonction d'agrégation non supportée: {func}")
+
+    # La colonne source n'a plus de sens après fusion
+    merged_columns = [col for col in columns if col != 'source_db']
+    return merged_columns, [{col: row.get(col) for col in merged_columns} for row in merged.values()]
+
+
+class FederatedQuery:
+    """Exécute des requêtes sur plusieurs bases de bibliothèques sans les fusionner
+
+    Deux modes:
+    - 'attach': les bases sont attachées à une connexion en mémoire et une vue
+      temporaire mp3_files (UNION ALL, avec une colonne source_db) les expose
+      comme une seule table: les presets fonctionnent tels quels, agrégats compris;
+    - 'fanout': la requête est exécutée sur chaque base dans un thread séparé (une vue
+      temporaire mp3_files y ajoute aussi source_db) et les résultats sont concaténés,
+      ou fusionnés avec merge_aggregates() puis triés et limités globalement.
+    """
+
+    def __init__(self, db_paths, workers=None):
+        """Initialisation
+
+        Args:
+            db_paths (list): Chemins des bases SQLite
+            workers (int, optional): Nombre de threads du mode 'fanout'
+        """
+        if not db_paths:
+            raise ValueError("Aucune base de données à fédérer")
+        self.db_paths = list(db_paths)
+        self.workers = workers or min(len(self.db_paths), (os.cpu_count() or 1) * 2)
+        self.sources = self._source_names(self.db_paths)
+        self.logger = logging.getLogger('mp3tag_analyzer.federated')
+
+    @staticmethod
+    def _source_names(db_paths):
+        """Nom court de chaque base (nom de fichier sans extension, rendu unique)"""
+        names = []
+        for path in db_paths:
+            name = os.path.splitext(os.path.basename(path))[0]
+            candidate, i = name, 2
+            while candidate in names:
+                candidate = f"{name}_{i}"
+                i += 1
+            names.append(candidate)
+        return names
+
+    def max_attached(self):
+        """Nombre maximal de bases attachables à une connexion"""
+        conn = sqlite3.connect(':memory:')
+        try:
+            # Connection.getlimit existe depuis Python 3.11
+            if hasattr(conn, 'getlimit'):
+                return conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+            return DEFAULT_MAX_ATTACHED
+        finally:
+            conn.close()
+
+    def default_mode(self):
+        """'attach' si toutes les bases peuvent être attachées, 'fanout' sinon"""
+        return 'attach' if len(self.db_paths) <= self.max_attached() else 'fanout'
+
+    def connect_attached(self):
+        """Crée une connexion en mémoire avec toutes les bases attachées
+
+        Returns:
+            sqlite3.Connection: Connexion exposant les vues temporaires mp3_files et
+                duplicate_clusters (bases qui en ont une), avec la colonne source_db
+        """
+        conn = sqlite3.connect(':memory:')
+        try:
+            common_columns = None
+            for i, path in enumerate(self.db_paths):
+                conn.execute(f"ATTACH DATABASE ? AS lib{i}", (path,))
+                columns = [row[1] for row in conn.execute(f"PRAGMA lib{i}.table_info(mp3_files)")]
+                if not columns:
+                    raise sqlite3.OperationalError(f"Table mp3_files absente de {path}")
+                # Colonnes présentes dans toutes les bases, dans l'ordre de la première
+                if common_columns is None:
+                    common_columns = columns
+                else:
+                    common_columns = [col for col in common_columns if col in columns]
+
+            column_list = ', '.join(f'"{col}"' for col in common_columns)
+            selects = [
+                f"SELECT '{source.replace(chr(39), chr(39) * 2)}' AS source_db, {column_list} FROM lib{i}.mp3_files"
+                for i, source in enumerate(self.sources)
+            ]
+            conn.execute(f"CREATE TEMP VIEW mp3_files AS {' UNION ALL '.join(selects)}")
+            self._create_track_views(conn)
+            self.logger.info(f"{len(self.db_paths)} bases attachées en mode fédéré")
+            return conn
+        except sqlite3.Error:
+            conn.close()
+            raise
+
+    def _create_track_views(self, conn):
+        """Vues temporaires réunissant les tables liées aux pistes (ex: duplicate_clusters)
+
+        Sans elles, le nom non qualifié désignerait la table de la première base seulement.
+        Les bases qui n'ont pas la table sont ignorées.
+        """
+        for table in _TRACK_TABLES:
+            selects = []
+            for i, source in enumerate(self.sources):
+                if conn.execute(f"SELECT 1 FROM lib{i}.sqlite_master WHERE type = 'table' AND name = ?",
+                                (table,)).fetchone():
+                    selects.append(f"SELECT '{source.replace(chr(39), chr(39) * 2)}' AS source_db, * FROM lib{i}.{table}")
+            if selects:
+                conn.execute(f"CREATE TEMP VIEW {table} AS {' UNION ALL '.join(selects)}")
+
+    def execute(self, query, mode=None, executor=None, group_by=None, aggregates=None, order_by=None, limit=None):
+        """Exécute une requête sur l'ensemble des bases
+
+        Args:
+            query (str): Requête SQL (sur la table mp3_files)
+            mode (str, optional): 'attach' ou 'fanout' (par défaut: selon le nombre de bases)
+            executor (QueryExecutor, optional): Exécuteur (délai, limite, annulation)
+            group_by, aggregates, order_by, limit: Fusion en mode 'fanout' (voir execute_fanout)
+
+        Returns:
+            tuple: (colonnes, résultats sous forme de dictionnaires)
+        """
+        if executor is None:
+            executor = QueryExecutor()
+        mode = mode or self.default_mode()
+
+        if mode == 'attach':
+            conn = self.connect_attached()
+            try:
+                return executor.execute(conn, query)
+            finally:
+                conn.close()
+        elif mode == 'fanout':
+            return self.execute_fanout(query, executor, group_by, aggregates, order_by, limit)
+        else:
+            raise ValueError(f"Mode fédéré non supporté: {mode}")
+
+    def execute_fanout(self, query, executor=None, group_by=None, aggregates=None, order_by=None, limit=None):
+        """Exécute la requête sur chaque base en parallèle et regroupe les résultats
+
+        Sur chaque base, des vues temporaires masquent mp3_files et duplicate_clusters et
+        ajoutent la colonne source_db, comme en mode 'attach'. Une base qui n'a pas une
+        table lue par la requête (ex: duplicate_clusters) ne donne aucune ligne.
+
+        Args:
+            query (str): Requête SQL exécutée sur chaque base
+            executor (QueryExecutor, optional): Exécuteur parent (ses limites et son
+                annulation s'appliquent à chaque base)
+            group_by (list, optional): Colonnes de regroupement pour la fusion
+            aggregates (dict, optional): Fonctions de fusion (voir merge_aggregates)
+            order_by (list, optional): Tri global, liste de (colonne, 'ASC' ou 'DESC')
+            limit (int, optional): Nombre de lignes du résultat global (après tri)
+
+        Returns:
+            tuple: (colonnes, résultats sous forme de dictionnaires)
+        """
+        if executor is None:
+            executor = QueryExecutor()
+
+        def run_on(index):
+            child = executor.spawn()
+            conn = sqlite3.connect(self.db_paths[index])
+            try:
+                missing = self._create_source_view(conn, self.sources[index])
+                if set(missing) & set(referenced_track_tables(query)):
+                    return [], [], child
+                columns, rows = child.execute(conn, query)
+                return columns, rows, child
+            finally:
+                conn.close()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                outcomes = list(pool.map(run_on, range(len(self.db_paths))))
+            except QueryTimeoutError:
+                executor.timed_out = True
+                raise
+
+        columns = []
+        results = []
+        for source, (source_columns, rows, child) in zip(self.sources, outcomes):
+            if source_columns and not columns:
+                # source_db en tête, sauf si la requête la sélectionne déjà (vue temporaire)
+                columns = source_columns if 'source_db' in source_columns else ['source_db'] + source_columns
+            results.extend({'source_db': source, **row} for row in rows)
+            executor.truncated = executor.truncated or child.truncated
+
+        if group_by is not None or aggregates:
+            columns, results = merge_aggregates(columns, results, group_by or [], aggregates or {})
+
+        # Tri global: tris stables successifs, de la dernière colonne de tri à la première
+        for column, direction in reversed(order_by or []):
+            results.sort(key=lambda row: sqlite_order_key(row.get(column)), reverse=direction.upper() == 'DESC')
+        if limit is not None:
+            del results[limit:]
+
+        # La limite de lignes s'applique au résultat global, pas seulement à chaque base
+        if executor.max_rows and len(results) > executor.max_rows:
+            del results[executor.max_rows:]
+            executor.truncated = True
+
+        self.logger.info(f"Requête exécutée sur {len(self.db_paths)} bases: {len(results)} lignes")
+        return columns, results
+
+    @staticmethod
+    def _create_source_view(conn, source):
+        """Masque mp3_files et les tables liées aux pistes par des vues temporaires qui ajoutent la colonne source_db
+
+        Les objets temporaires sont prioritaires sur ceux de la base principale.
+
+        Returns:
+            list: Tables liées aux pistes absentes de la base
+        """
+        escaped = source.replace("'", "''")
+        conn.execute(f"CREATE TEMP VIEW mp3_files AS SELECT '{escaped}' AS source_db, * FROM main.mp3_files")
+        missing = []
+        for table in _TRACK_TABLES:
+            if conn.execute("SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone():
+                conn.execute(f"CREATE TEMP VIEW {table} AS SELECT '{escaped}' AS source_db, * FROM main.{table}")
+            else:
+                missing.append(table)
+        return missing
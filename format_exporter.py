@@ -1,205 +1,852 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """
-Module d'export vers différents formats (CSV, JSON, XML) pour MP3Tag Analyzer
+Module d'export vers différents formats (CSV, JSON, JSON Lines, XML, Parquet, Arrow) pour MP3Tag Analyzer
 Auteur: Geoffroy Streit
 """
 
 import csv
+import hashlib
+import itertools
 import json
-import xml.dom.minidom as minidom
-import xml.etree.ElementTree as ET
+import sqlite3
 import logging
 import os
-from typing import List, Dict, Any, Optional, Union, Tuple
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from xml.sax.saxutils import escape
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union, Tuple
+
+from compressed_output import open_output, output_path
+from lazy_modules import LazyModule, module_available
+from sql_presets import resolve_query
+from target_schema import infer_column_types, infer_sqlite_column_types
+
+# pyarrow: disponibilité vérifiée sans import, chargé au premier export en colonnes
+# (son import ralentit le démarrage de l'application)
+PYARROW_AVAILABLE = module_available('pyarrow')
+pa = LazyModule('pyarrow')
+pq = LazyModule('pyarrow.parquet')
+
+# Imports conditionnels pour éviter les erreurs si les modules ne sont pas installés
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Caractères interdits dans un nom de balise XML, et premier caractère autorisé
+_XML_INVALID_TAG_CHARS = re.compile(r'[^\w.-]')
+_XML_TAG_START = re.compile(r'[^\W\d]')
+# Caractères de contrôle interdits dans un document XML 1.0
+_XML_INVALID_TEXT_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Colonnes à fort taux de répétition, stockées avec un encodage par dictionnaire
+DICTIONARY_COLUMNS = ('artist', 'album', 'genre', 'codec')
+
+
+class _DictionaryEncoder:
+    """Encodage par dictionnaire d'une colonne, cumulé sur tous les lots
+
+    Le dictionnaire ne fait que s'allonger d'un lot à l'autre: le format de fichier
+    Arrow IPC n'accepte que des ajouts (deltas), pas de remplacement.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._values = []
+
+    def encode(self, values):
+        indexes = []
+        for value in values:
+            if value is None:
+                indexes.append(None)
+                continue
+            index = self._indexes.get(value)
+            if index is None:
+                text = value
+                if isinstance(value, bytes):
+                    text = value.decode('utf-8', errors='replace')
+                elif not isinstance(value, str):
+                    text = str(value)
+                index = self._indexes.get(text)
+                if index is None:
+                    index = self._indexes[text] = len(self._values)
+                    self._values.append(text)
+                # La valeur d'origine (entier, octets...) pointe vers la même entrée
+                self._indexes[value] = index
+            indexes.append(index)
+        return pa.DictionaryArray.from_arrays(pa.array(indexes, type=pa.int32()),
+                                              pa.array(self._values, type=pa.string()))
+
 
 class FormatExporter:
     """
-    Classe pour exporter les données vers différents formats (CSV, JSON, XML)
+    Classe pour exporter les données vers différents formats (CSV, JSON, XML, Parquet, Arrow)
     """
     
+    # Formats exportables en flux depuis un curseur SQLite
+    STREAMING_FORMATS = ('csv', 'json', 'jsonl', 'xml', 'parquet', 'feather')
+    # Taille des lots lus sur un curseur
+    CURSOR_BATCH_SIZE = 5000
+    # Extension de fichier de chaque format
+    FILE_EXTENSIONS = {'csv': '.csv', 'json': '.json', 'jsonl': '.jsonl', 'xml': '.xml',
+                       'parquet': '.parquet', 'feather': '.arrow'}
+    # Clés de découpage calculées (export fractionné), en plus des colonnes de mp3_files
+    SPLIT_KEYS = {'artist_initial': "upper(substr(artist, 1, 1))"}
+    
     def __init__(self):
         """
         Initialisation du module d'export
         """
         self.logger = logging.getLogger('mp3tag_analyzer.format_exporter')
     
-    def export_to_csv(self, data: List[Dict[str, Any]], file_path: str, 
+    def export_to_csv(self, data: Iterable, file_path: str, 
                       delimiter: str = ';', encoding: str = 'utf-8-sig',
-                      include_headers: bool = True) -> int:
+                      include_headers: bool = True, columns: Optional[List[str]] = None,
+                      compression: Optional[str] = None) -> int:
         """
         Exporte les données vers un fichier CSV
         
+        Les enregistrements sont écrits au fil de la lecture, sans copie des données:
+        un curseur ou un itérable est exporté en mémoire constante.
+        
         Args:
-            data: Liste de dictionnaires contenant les données à exporter
+            data: Liste ou itérable de dictionnaires, ou curseur DB-API
             file_path: Chemin du fichier CSV de destination
             delimiter: Séparateur de champs (par défaut: point-virgule)
             encoding: Encodage du fichier (par défaut: UTF-8 avec BOM)
             include_headers: Inclure les en-têtes dans le fichier
+            columns: Colonnes à exporter, dans l'ordre (par défaut: description du
+                     curseur, sinon clés des enregistrements triées)
+            compression: 'gzip', 'bz2', 'xz', 'zstd', 'none', ou None pour la déduire
+                         de l'extension du fichier (.gz, .bz2, .xz, .zst)
             
         Returns:
             int: Nombre d'enregistrements exportés
         """
         try:
-            if not data:
+            columns, rows = self._columns_and_rows(data, columns)
+            if columns is None:
                 self.logger.warning("Aucune donnée à exporter vers CSV")
                 return 0
             
-            # Créer une copie profonde des données pour éviter de les altérer
-            data_copy = []
-            for item in data:
-                # Convertir les valeurs en types Python standards
-                item_copy = {}
-                for key, value in item.items():
-                    # Conversion des types spéciaux si nécessaire
-                    if isinstance(value, bytes):
-                        value = value.decode('utf-8', errors='replace')
-                    item_copy[key] = value
-                data_copy.append(item_copy)
-            
-            # Récupérer les en-têtes (toutes les clés uniques de tous les dictionnaires)
-            headers = set()
-            for item in data_copy:
-                headers.update(item.keys())
-            headers = sorted(list(headers))
-            
-            # Écrire dans le fichier CSV
-            with open(file_path, 'w', newline='', encoding=encoding) as f:
-                writer = csv.DictWriter(f, fieldnames=headers, delimiter=delimiter, extrasaction='ignore')
+            count = 0
+            with open_output(file_path, encoding=encoding, newline='', compression=compression) as f:
+                writer = csv.writer(f, delimiter=delimiter)
                 
                 if include_headers:
-                    writer.writeheader()
+                    writer.writerow(columns)
                 
-                writer.writerows(data_copy)
+                for chunk in self._chunks(rows, self.CURSOR_BATCH_SIZE):
+                    writer.writerows(chunk)
+                    count += len(chunk)
             
-            self.logger.info(f"{len(data_copy)} enregistrements exportés vers {file_path}")
-            return len(data_copy)
+            self.logger.info(f"{count} enregistrements exportés vers {file_path}")
+            return count
         except Exception as e:
             self.logger.error(f"Erreur lors de l'export CSV: {str(e)}")
             raise
     
-    def export_to_json(self, data: List[Dict[str, Any]], file_path: str, 
+    def export_to_json(self, data: Iterable, file_path: str, 
                        encoding: str = 'utf-8', indent: int = 2,
-                       as_array: bool = True) -> int:
+                       as_array: bool = True, compression: Optional[str] = None) -> int:
         """
         Exporte les données vers un fichier JSON
         
+        Le document est écrit enregistrement par enregistrement (orjson est utilisé
+        s'il est installé): un curseur ou un itérable est exporté en mémoire constante.
+        
         Args:
-            data: Liste de dictionnaires contenant les données à exporter
+            data: Liste ou itérable de dictionnaires, ou curseur DB-API
             file_path: Chemin du fichier JSON de destination
             encoding: Encodage du fichier (par défaut: UTF-8)
-            indent: Indentation du JSON (par défaut: 2 espaces)
+            indent: Indentation du JSON (par défaut: 2 espaces; 0 = un enregistrement par ligne)
             as_array: Si True, exporte les données comme un tableau JSON;
                      sinon, comme un objet JSON avec des IDs comme clés
+            compression: Compression du fichier (voir export_to_csv)
             
         Returns:
             int: Nombre d'enregistrements exportés
         """
         try:
-            if not data:
+            records = self._iter_records(data)
+            first = next(records, None)
+            if first is None:
                 self.logger.warning("Aucune donnée à exporter vers JSON")
                 return 0
             
-            # Créer une copie profonde des données pour éviter de les altérer
-            data_copy = []
-            for item in data:
-                # Convertir les valeurs en types Python standards
-                item_copy = {}
-                for key, value in item.items():
-                    # Conversion des types spéciaux si nécessaire
-                    if isinstance(value, bytes):
-                        value = value.decode('utf-8', errors='replace')
-                    item_copy[key] = value
-                data_copy.append(item_copy)
-            
-            # Préparer les données selon le format demandé
-            if as_array:
-                json_data = data_copy
-            else:
-                # Créer un objet avec des IDs comme clés
-                json_data = {}
-                for i, item in enumerate(data_copy):
-                    json_data[f"item_{i}"] = item
+            encode = self._json_encoder(indent)
+            # Chaque enregistrement est indenté d'un niveau dans le tableau ou l'objet
+            pad = ' ' * indent if indent else ''
+            separator = f",\n{pad}"
+            open_char, close_char = ('[', ']') if as_array else ('{', '}')
             
-            # Écrire dans le fichier JSON
-            with open(file_path, 'w', encoding=encoding) as f:
-                json.dump(json_data, f, indent=indent, ensure_ascii=False)
+            count = 0
+            with open_output(file_path, encoding=encoding, compression=compression) as f:
+                f.write(f"{open_char}\n{pad}")
+                for record in itertools.chain((first,), records):
+                    if count:
+                        f.write(separator)
+                    text = encode(record)
+                    if pad:
+                        text = text.replace('\n', '\n' + pad)
+                    if not as_array:
+                        # Objet avec des IDs comme clés
+                        f.write(f'"item_{count}": ')
+                    f.write(text)
+                    count += 1
+                f.write(f"\n{close_char}\n")
             
-            self.logger.info(f"{len(data_copy)} enregistrements exportés vers {file_path}")
-            return len(data_copy)
+            self.logger.info(f"{count} enregistrements exportés vers {file_path}")
+            return count
         except Exception as e:
             self.logger.error(f"Erreur lors de l'export JSON: {str(e)}")
             raise
     
-    def export_to_xml(self, data: List[Dict[str, Any]], file_path: str, 
+    def export_to_jsonl(self, data: Iterable, file_path: str, encoding: str = 'utf-8',
+                        compression: Optional[str] = None) -> int:
+        """
+        Exporte les données au format JSON Lines (un objet JSON par ligne)
+        
+        Args:
+            data: Liste ou itérable de dictionnaires, ou curseur DB-API
+            file_path: Chemin du fichier de destination (.jsonl)
+            encoding: Encodage du fichier (par défaut: UTF-8)
+            compression: Compression du fichier (voir export_to_csv)
+            
+        Returns:
+            int: Nombre d'enregistrements exportés
+        """
+        try:
+            encode = self._json_encoder(0)
+            count = 0
+            with open_output(file_path, encoding=encoding, compression=compression) as f:
+                for chunk in self._chunks(self._iter_records(data), self.CURSOR_BATCH_SIZE):
+                    f.write('\n'.join(map(encode, chunk)))
+                    f.write('\n')
+                    count += len(chunk)
+            
+            if not count:
+                self.logger.warning("Aucune donnée à exporter vers JSON Lines")
+            else:
+                self.logger.info(f"{count} enregistrements exportés vers {file_path}")
+            return count
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'export JSON Lines: {str(e)}")
+            raise
+    
+    def export_to_xml(self, data: Iterable, file_path: str, 
                       root_element: str = 'mp3collection', item_element: str = 'track',
-                      encoding: str = 'utf-8', pretty_print: bool = True) -> int:
+                      encoding: str = 'utf-8', pretty_print: bool = True,
+                      compression: Optional[str] = None) -> int:
         """
         Exporte les données vers un fichier XML
         
+        Le document est écrit élément par élément, sans arbre en mémoire: un curseur
+        ou un itérable est exporté en mémoire constante.
+        
         Args:
-            data: Liste de dictionnaires contenant les données à exporter
+            data: Liste ou itérable de dictionnaires, ou curseur DB-API
             file_path: Chemin du fichier XML de destination
             root_element: Nom de l'élément racine (par défaut: 'mp3collection')
             item_element: Nom de l'élément pour chaque piste (par défaut: 'track')
             encoding: Encodage du fichier (par défaut: UTF-8)
             pretty_print: Formater le XML pour la lisibilité (par défaut: True)
+            compression: Compression du fichier (voir export_to_csv)
             
         Returns:
             int: Nombre d'enregistrements exportés
         """
         try:
-            if not data:
+            records = self._iter_records(data)
+            first = next(records, None)
+            if first is None:
                 self.logger.warning("Aucune donnée à exporter vers XML")
                 return 0
             
-            # Créer une copie profonde des données pour éviter de les altérer
-            data_copy = []
-            for item in data:
-                # Convertir les valeurs en types Python standards
-                item_copy = {}
-                for key, value in item.items():
-                    # Conversion des types spéciaux si nécessaire
-                    if isinstance(value, bytes):
-                        value = value.decode('utf-8', errors='replace')
-                    # Convertir les valeurs en chaînes pour XML
-                    if value is None:
-                        value = ""
-                    elif not isinstance(value, str):
-                        value = str(value)
-                    item_copy[key] = value
-                data_copy.append(item_copy)
-            
-            # Créer l'élément racine
-            root = ET.Element(root_element)
-            
-            # Ajouter chaque élément
-            for item in data_copy:
-                track_element = ET.SubElement(root, item_element)
-                
-                for key, value in item.items():
-                    # Normaliser le nom de la balise XML (remplacer les espaces par des underscores)
-                    tag_name = key.replace(' ', '_')
-                    # Créer un élément pour chaque champ
-                    field_element = ET.SubElement(track_element, tag_name)
-                    field_element.text = value
-            
-            # Créer l'arbre XML
-            tree = ET.ElementTree(root)
-            
-            # Formater le XML si demandé
-            if pretty_print:
-                xml_string = ET.tostring(root, encoding=encoding)
-                dom = minidom.parseString(xml_string)
-                pretty_xml = dom.toprettyxml(indent="  ", encoding=encoding)
-                
-                with open(file_path, 'wb') as f:
-                    f.write(pretty_xml)
-            else:
-                tree.write(file_path, encoding=encoding, xml_declaration=True)
+            root_tag = self._xml_tag(root_element)
+            item_tag = self._xml_tag(item_element)
+            newline, item_pad, field_pad = ('\n', '  ', '    ') if pretty_print else ('', '', '')
+            open_item = f"{item_pad}<{item_tag}>{newline}"
+            close_item = f"{item_pad}</{item_tag}>{newline}"
+            # Noms de balises normalisés une seule fois par colonne
+            tags = {}
             
-            self.logger.info(f"{len(data_copy)} enregistrements exportés vers {file_path}")
-            return len(data_copy)
+            count = 0
+            # Les caractères absents de l'encodage sont écrits en références numériques
+            with open_output(file_path, encoding=encoding, errors='xmlcharrefreplace',
+                             compression=compression) as f:
+                f.write(f'<?xml version="1.0" encoding="{encoding}"?>{newline}<{root_tag}>{newline}')
+                for record in itertools.chain((first,), records):
+                    parts = [open_item]
+                    for key, value in record.items():
+                        tag = tags.get(key)
+                        if tag is None:
+                            tag = tags[key] = self._xml_tag(key)
+                        if value is None or value == '':
+                            parts.append(f"{field_pad}<{tag}/>{newline}")
+                            continue
+                        if isinstance(value, bytes):
+                            value = value.decode('utf-8', errors='replace')
+                        elif not isinstance(value, str):
+                            value = str(value)
+                        parts.append(f"{field_pad}<{tag}>{self._xml_text(value)}</{tag}>{newline}")
+                    parts.append(close_item)
+                    f.write(''.join(parts))
+                    count += 1
+                f.write(f"</{root_tag}>{newline}")
+            
+            self.logger.info(f"{count} enregistrements exportés vers {file_path}")
+            return count
         except Exception as e:
             self.logger.error(f"Erreur lors de l'export XML: {str(e)}")
             raise
+    
+    @staticmethod
+    def _xml_tag(name: str) -> str:
+        """Nom de balise XML valide (espaces et caractères interdits remplacés par '_')"""
+        tag = _XML_INVALID_TAG_CHARS.sub('_', str(name).strip()) or '_'
+        if not _XML_TAG_START.match(tag) or tag.lower().startswith('xml'):
+            tag = '_' + tag
+        return tag
+    
+    @staticmethod
+    def _xml_text(value: str) -> str:
+        """Texte échappé pour XML (caractères de contrôle interdits par XML 1.0 supprimés)"""
+        if '&' in value or '<' in value or '>' in value:
+            value = escape(value)
+        return _XML_INVALID_TEXT_CHARS.sub('', value)
+    
+    def export_to_parquet(self, data: Iterable, file_path: str,
+                          compression: str = 'zstd', row_group_size: int = 100000,
+                          dictionary_columns: Tuple[str, ...] = DICTIONARY_COLUMNS,
+                          column_types: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
+        """
+        Exporte les données vers un fichier Parquet (format en colonnes)
+        
+        Les données sont converties et écrites lot par lot: chaque lot de
+        row_group_size lignes forme un groupe de lignes du fichier.
+        
+        Args:
+            data: Liste ou itérable de dictionnaires, ou curseur SQLite
+            file_path: Chemin du fichier Parquet de destination
+            compression: Codec ('zstd', 'snappy', 'gzip', 'lz4', 'brotli' ou 'none')
+            row_group_size: Nombre de lignes par groupe de lignes
+            dictionary_columns: Colonnes encodées par dictionnaire
+            column_types: Types des colonnes (voir target_schema); déduits des données si absents
+            
+        Returns:
+            int: Nombre d'enregistrements exportés
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Le module pyarrow n'est pas installé.")
+        try:
+            writer = None
+            count = 0
+            try:
+                for batch in self._record_batches(data, row_group_size, dictionary_columns, column_types):
+                    if writer is None:
+                        writer = pq.ParquetWriter(file_path, batch.schema, compression=compression)
+                    writer.write_batch(batch)
+                    count += batch.num_rows
+            finally:
+                if writer is not None:
+                    writer.close()
+            
+            if writer is None:
+                self.logger.warning("Aucune donnée à exporter vers Parquet")
+                return 0
+            self.logger.info(f"{count} enregistrements exportés vers {file_path}")
+            return count
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'export Parquet: {str(e)}")
+            raise
+    
+    def export_to_feather(self, data: Iterable, file_path: str,
+                          compression: str = 'zstd', batch_size: int = 65536,
+                          dictionary_columns: Tuple[str, ...] = DICTIONARY_COLUMNS,
+                          column_types: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
+        """
+        Exporte les données vers un fichier Arrow IPC / Feather v2
+        
+        Args:
+            data: Liste ou itérable de dictionnaires, ou curseur SQLite
+            file_path: Chemin du fichier de destination (.arrow ou .feather)
+            compression: Codec ('zstd', 'lz4' ou 'none')
+            batch_size: Nombre de lignes par lot d'enregistrements
+            dictionary_columns: Colonnes encodées par dictionnaire
+            column_types: Types des colonnes (voir target_schema); déduits des données si absents
+            
+        Returns:
+            int: Nombre d'enregistrements exportés
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Le module pyarrow n'est pas installé.")
+        try:
+            options = pa.ipc.IpcWriteOptions(
+                compression=None if compression == 'none' else compression,
+                # Les dictionnaires cumulés sont transmis sous forme d'ajouts d'un lot à l'autre
+                emit_dictionary_deltas=True
+            )
+            writer = None
+            count = 0
+            try:
+                for batch in self._record_batches(data, batch_size, dictionary_columns, column_types):
+                    if writer is None:
+                        writer = pa.ipc.new_file(file_path, batch.schema, options=options)
+                    writer.write_batch(batch)
+                    count += batch.num_rows
+            finally:
+                if writer is not None:
+                    writer.close()
+            
+            if writer is None:
+                self.logger.warning("Aucune donnée à exporter vers Arrow/Feather")
+                return 0
+            self.logger.info(f"{count} enregistrements exportés vers {file_path}")
+            return count
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'export Arrow/Feather: {str(e)}")
+            raise
+    
+    def export_from_sqlite(self, sqlite_path: str, export_format: str, file_path: str,
+                           query: str = "SELECT * FROM mp3_files", params: Tuple = (), **options) -> int:
+        """
+        Exporte le résultat d'une requête SQLite en flux, sans charger la table en mémoire
+        
+        Args:
+            sqlite_path: Chemin vers la base de données SQLite
+            export_format: Format de destination (voir STREAMING_FORMATS)
+            file_path: Chemin du fichier de destination
+            query: Requête de lecture (par défaut: toute la table mp3_files)
+            params: Paramètres de la requête
+            **options: Options transmises à la méthode export_to_<format>
+            
+        Returns:
+            int: Nombre d'enregistrements exportés
+        """
+        export = getattr(self, f"export_to_{export_format}", None)
+        if export_format not in self.STREAMING_FORMATS or export is None:
+            raise ValueError(f"Format d'export non supporté: {export_format}")
+        
+        conn = sqlite3.connect(sqlite_path)
+        try:
+            # Export en lecture seule: une requête d'écriture est refusée par SQLite
+            conn.execute("PRAGMA query_only = ON")
+            # Types déduits de tout le résultat en une passe SQL, plutôt que du premier lot
+            if export_format in ('parquet', 'feather') and 'column_types' not in options:
+                if query == "SELECT * FROM mp3_files":
+                    options['column_types'] = infer_sqlite_column_types(sqlite_path)
+                else:
+                    options['column_types'] = infer_sqlite_column_types(sqlite_path, query=query, params=params)
+            cursor = conn.execute(query, params)
+            return export(cursor, file_path, **options)
+        finally:
+            conn.close()
+    
+    def export_query(self, sqlite_path: str, export_format: str, file_path: str,
+                     query: Optional[str] = None, preset: Optional[str] = None,
+                     params: Tuple = (), **options) -> int:
+        """
+        Exporte le résultat d'une requête SQL ou d'un preset, en flux depuis le curseur
+        
+        Le résultat n'est ni affiché ni chargé en mémoire: les lignes passent
+        directement du curseur SQLite au fichier.
+        
+        Args:
+            sqlite_path: Chemin vers la base de données SQLite
+            export_format: Format de destination (voir STREAMING_FORMATS)
+            file_path: Chemin du fichier de destination
+            query: Requête SQL de lecture
+            preset: Nom d'un preset (voir sql_presets), si query n'est pas fourni
+            params: Paramètres de la requête
+            **options: Options transmises à la méthode export_to_<format>
+            
+        Returns:
+            int: Nombre d'enregistrements exportés
+        """
+        query = resolve_query(query, preset)
+        self.logger.info(f"Export {export_format} de la requête: {query}")
+        return self.export_from_sqlite(sqlite_path, export_format, file_path, query, params, **options)
+    
+    def export_split(self, sqlite_path: str, export_format: str, output_dir: str,
+                     base_name: str = 'mp3tag', rows_per_part: int = 100000,
+                     partition_by: Optional[str] = None, workers: Optional[int] = None,
+                     **options) -> int:
+        """
+        Exporte la table mp3_files en plusieurs fichiers, écrits en parallèle, avec un manifeste
+        
+        Chaque partie est exportée par un processus du groupe (un cœur par partie),
+        qui lit sa plage dans la base SQLite. Le manifeste JSON
+        (<base_name>-manifest.json) liste les fichiers, leur nombre de lignes,
+        leur taille et leur empreinte SHA-256.
+        
+        Args:
+            sqlite_path: Chemin vers la base de données SQLite
+            export_format: Format des parties (voir STREAMING_FORMATS)
+            output_dir: Répertoire de destination (créé si besoin)
+            base_name: Préfixe des noms de fichiers
+            rows_per_part: Nombre de lignes par partie (découpage par nombre de lignes)
+            partition_by: Découpage par clé: une colonne de mp3_files (ex: 'genre') ou
+                          une clé de SPLIT_KEYS (ex: 'artist_initial'); None = par nombre de lignes
+            workers: Nombre de processus (par défaut: nombre de cœurs)
+            **options: Options transmises à la méthode export_to_<format> (dont compression)
+            
+        Returns:
+            int: Nombre total d'enregistrements exportés
+        """
+        if export_format not in self.STREAMING_FORMATS:
+            raise ValueError(f"Format d'export non supporté: {export_format}")
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            if export_format in ('parquet', 'feather'):
+                # Schéma commun à toutes les parties
+                options.setdefault('column_types', infer_sqlite_column_types(sqlite_path))
+            
+            partitions = self._split_partitions(sqlite_path, rows_per_part, partition_by)
+            extension = self.FILE_EXTENSIONS[export_format]
+            # Parquet et Arrow compressent en interne: pas de compression du fichier
+            compression = options.get('compression') if export_format not in ('parquet', 'feather') else None
+            tasks = []
+            for index, (key, where, params) in enumerate(partitions, start=1):
+                label = f"-{self._file_label(key)}" if partition_by else ''
+                file_name = output_path(f"{base_name}-{index:05d}{label}", extension,
+                                        None if compression == 'none' else compression)
+                query = f"SELECT * FROM mp3_files WHERE {where} ORDER BY rowid"
+                tasks.append((sqlite_path, export_format, os.path.join(output_dir, file_name),
+                              query, params, options))
+            
+            parts = []
+            workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for (key, _, _), task, result in zip(partitions, tasks, pool.map(_export_part, tasks)):
+                    count, size, checksum = result
+                    if not count:
+                        continue
+                    part = {'file': os.path.basename(task[2]), 'rows': count, 'bytes': size, 'sha256': checksum}
+                    part['key' if partition_by else 'rowid_range'] = key
+                    parts.append(part)
+            
+            total = sum(part['rows'] for part in parts)
+            manifest = {
+                'format': export_format,
+                'compression': compression if compression != 'none' else None,
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'source': os.path.basename(sqlite_path),
+                'partition_by': partition_by or 'rows',
+                'total_rows': total,
+                'parts': parts,
+            }
+            manifest_path = os.path.join(output_dir, f"{base_name}-manifest.json")
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+            
+            self.logger.info(f"{total} enregistrements exportés en {len(parts)} fichiers dans {output_dir} "
+                             f"({workers} processus)")
+            return total
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'export fractionné: {str(e)}")
+            raise
+    
+    def _split_partitions(self, sqlite_path: str, rows_per_part: int, partition_by: Optional[str]):
+        """
+        Parties d'un export fractionné
+        
+        Les bornes et les valeurs de clé sont lues sans charger les rowid en mémoire:
+        chaque processus sélectionne ensuite ses lignes par plage de rowid ou par valeur de clé.
+        
+        Returns:
+            list: Tuples (clé ou plage de rowid, condition SQL, paramètres)
+        """
+        conn = sqlite3.connect(sqlite_path)
+        try:
+            if not partition_by:
+                return self._rowid_ranges(conn, max(1, rows_per_part))
+            
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(mp3_files)")]
+            expression = self.SPLIT_KEYS.get(partition_by)
+            if expression is None:
+                if partition_by not in columns:
+                    raise ValueError(f"Clé de découpage inconnue: {partition_by}")
+                expression = f'"{partition_by}"'
+            key = f"COALESCE({expression}, '')"
+            # Index sur l'expression exacte de la clé: la liste des valeurs et la
+            # sélection de chaque partie le parcourent au lieu de toute la table
+            try:
+                with conn:
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_mp3_files_split_{partition_by}" '
+                                 f'ON mp3_files ({key})')
+            except sqlite3.Error as e:
+                self.logger.warning(f"Index de découpage non créé ({partition_by}): {str(e)}")
+            keys = [row[0] for row in conn.execute(f"SELECT DISTINCT {key} FROM mp3_files")]
+            return [(value, f"{key} = ?", (value,))
+                    for value in sorted(keys, key=lambda k: (isinstance(k, str), k))]
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _rowid_ranges(conn: sqlite3.Connection, rows_per_part: int) -> List[tuple]:
+        """
+        Plages de rowid de rows_per_part lignes, lues de borne en borne sur la clé primaire
+        
+        Returns:
+            list: Tuples ([premier, dernier rowid], condition SQL, paramètres)
+        """
+        ranges = []
+        first = conn.execute("SELECT MIN(rowid) FROM mp3_files").fetchone()[0]
+        while first is not None:
+            row = conn.execute("SELECT rowid FROM mp3_files WHERE rowid > ? ORDER BY rowid LIMIT 1 OFFSET ?",
+                               (first, rows_per_part - 1)).fetchone()
+            if row is None:
+                last = conn.execute("SELECT MAX(rowid) FROM mp3_files").fetchone()[0]
+                ranges.append(([first, last], "rowid BETWEEN ? AND ?", (first, last)))
+                break
+            # row est le premier rowid de la partie suivante
+            last = conn.execute("SELECT MAX(rowid) FROM mp3_files WHERE rowid < ?", (row[0],)).fetchone()[0]
+            ranges.append(([first, last], "rowid BETWEEN ? AND ?", (first, last)))
+            first = row[0]
+        return ranges
+    
+    @staticmethod
+    def _file_label(key: Any) -> str:
+        """Fragment de nom de fichier lisible pour une valeur de clé"""
+        label = re.sub(r'[^\w-]+', '_', str(key)).strip('_')[:40]
+        return label or 'sans_valeur'
+    
+    def _iter_records(self, data: Iterable) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt les enregistrements d'une liste, d'un itérable ou d'un curseur DB-API
+        
+        Les lignes d'un curseur sont converties en dictionnaires au fil de la lecture,
+        avec les noms de colonnes de cursor.description.
+        """
+        description = getattr(data, 'description', None)
+        if description is not None and hasattr(data, 'fetchmany'):
+            columns = [column[0] for column in description]
+            while True:
+                rows = data.fetchmany(self.CURSOR_BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(columns, row))
+        else:
+            yield from data
+    
+    @staticmethod
+    def _json_default(value):
+        """Conversion des valeurs non sérialisables en JSON (octets, dates...)"""
+        if isinstance(value, bytes):
+            return value.decode('utf-8', errors='replace')
+        return str(value)
+    
+    def _json_encoder(self, indent: int):
+        """
+        Fonction de sérialisation d'un enregistrement en texte JSON
+        
+        orjson n'indente que par 2 espaces: les autres indentations utilisent le module json.
+        """
+        if ORJSON_AVAILABLE and indent in (0, 2):
+            option = orjson.OPT_INDENT_2 if indent else 0
+            default = self._json_default
+            return lambda record: orjson.dumps(record, default=default, option=option).decode('utf-8')
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=indent or None, default=self._json_default,
+                                   separators=None if indent else (',', ':'))
+        return encoder.encode
+    
+    def _columns_and_rows(self, data: Iterable, columns: Optional[List[str]] = None):
+        """
+        Colonnes et lignes (listes de valeurs) d'une liste, d'un itérable ou d'un curseur DB-API
+        
+        Les colonnes viennent, par ordre de priorité, du paramètre columns, de
+        cursor.description, de l'union des clés (liste) ou des clés du premier
+        enregistrement (itérable), triées. Les octets sont décodés ligne par ligne.
+        Un itérable lu sans colonnes explicites ne peut pas être relu: un enregistrement
+        portant une clé absente du premier lève ValueError au lieu d'être tronqué.
+        
+        Returns:
+            tuple: (colonnes ou None si aucune donnée, itérateur de lignes)
+        """
+        description = getattr(data, 'description', None)
+        if description is not None and hasattr(data, 'fetchmany'):
+            first_rows = data.fetchmany(self.CURSOR_BATCH_SIZE)
+            if not first_rows:
+                return None, iter(())
+            cursor_columns = [column[0] for column in description]
+            if columns is None or list(columns) == cursor_columns:
+                return cursor_columns, self._cursor_rows(data, first_rows, None)
+            positions = [cursor_columns.index(col) for col in columns]
+            return list(columns), self._cursor_rows(data, first_rows, positions)
+        
+        records = iter(data)
+        first = next(records, None)
+        if first is None:
+            return None, iter(())
+        strict = False
+        if columns is None:
+            keys = dict.fromkeys(first)
+            if isinstance(data, list):
+                # Une liste peut mêler des enregistrements de structures différentes
+                for record in data:
+                    keys.update(dict.fromkeys(record))
+            else:
+                # Colonnes déduites du seul premier enregistrement: les suivants sont vérifiés
+                strict = True
+            columns = sorted(keys)
+        return list(columns), self._record_rows(itertools.chain((first,), records), columns, strict)
+    
+    def _cursor_rows(self, cursor, first_rows, positions):
+        rows = first_rows
+        while rows:
+            for row in rows:
+                if positions is not None:
+                    row = [row[i] for i in positions]
+                yield self._decode_row(row) if bytes in map(type, row) else row
+            rows = cursor.fetchmany(self.CURSOR_BATCH_SIZE)
+    
+    def _record_rows(self, records, columns, strict=False):
+        known = set(columns)
+        for number, record in enumerate(records, start=1):
+            if strict and not known.issuperset(record):
+                unknown = ', '.join(sorted(map(str, set(record) - known)))
+                raise ValueError(f"Enregistrement {number}: colonnes absentes du premier enregistrement "
+                                 f"({unknown}); indiquez les colonnes à exporter (paramètre columns)")
+            get = record.get
+            row = [get(col) for col in columns]
+            yield self._decode_row(row) if bytes in map(type, row) else row
+    
+    @staticmethod
+    def _decode_row(row):
+        return [value.decode('utf-8', errors='replace') if isinstance(value, bytes) else value
+                for value in row]
+    
+    @staticmethod
+    def _chunks(iterable, size):
+        iterator = iter(iterable)
+        while True:
+            chunk = list(itertools.islice(iterator, size))
+            if not chunk:
+                return
+            yield chunk
+    
+    def _record_batches(self, data: Iterable, batch_size: int, dictionary_columns: Tuple[str, ...],
+                        column_types: Optional[Dict[str, Dict[str, Any]]]):
+        """
+        Convertit des enregistrements en lots Arrow d'au plus batch_size lignes
+        
+        Les colonnes et leurs types sont fixés au premier lot: types fournis, sinon
+        déduits de toutes les données (liste) ou du premier lot (itérable, curseur).
+        """
+        if column_types is None and isinstance(data, list):
+            column_types = infer_column_types(data)
+        
+        schema = None
+        converters = []
+        encoders = {}
+        batch = []
+        for record in self._iter_records(data):
+            batch.append(record)
+            if len(batch) < batch_size:
+                continue
+            if schema is None:
+                schema, converters, encoders = self._arrow_schema(batch, dictionary_columns, column_types)
+            yield self._to_record_batch(batch, schema, converters, encoders)
+            batch = []
+        if batch:
+            if schema is None:
+                schema, converters, encoders = self._arrow_schema(batch, dictionary_columns, column_types)
+            yield self._to_record_batch(batch, schema, converters, encoders)
+    
+    def _arrow_schema(self, first_batch: List[Dict[str, Any]], dictionary_columns: Tuple[str, ...],
+                      column_types: Optional[Dict[str, Dict[str, Any]]]):
+        """Schéma Arrow, convertisseurs de valeurs et encodeurs par dictionnaire"""
+        columns = {}
+        for record in first_batch:
+            for key in record:
+                columns[key] = None
+        column_types = column_types or infer_column_types(first_batch)
+        
+        fields, converters, encoders = [], [], {}
+        for col in columns:
+            logical_type = column_types.get(col, {}).get('type', 'text')
+            if col in dictionary_columns:
+                arrow_type = pa.dictionary(pa.int32(), pa.string())
+                encoders[col] = _DictionaryEncoder()
+                converter = self._to_text
+            elif logical_type == 'integer':
+                arrow_type, converter = pa.int64(), self._to_integer
+            elif logical_type == 'real':
+                arrow_type, converter = pa.float64(), self._to_real
+            else:
+                arrow_type, converter = pa.string(), self._to_text
+            fields.append(pa.field(col, arrow_type))
+            converters.append((col, converter))
+        return pa.schema(fields), converters, encoders
+    
+    @staticmethod
+    def _to_record_batch(batch, schema, converters, encoders):
+        arrays = []
+        for (col, converter), field in zip(converters, schema):
+            values = [record.get(col) for record in batch]
+            encoder = encoders.get(col)
+            if encoder:
+                arrays.append(encoder.encode(values))
+                continue
+            try:
+                # Cas courant: les valeurs ont déjà le bon type, pyarrow les convertit en C
+                arrays.append(pa.array(values, type=field.type))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+                arrays.append(pa.array([converter(value, col) for value in values], type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+    
+    @staticmethod
+    def _to_text(value, col):
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            return value.decode('utf-8', errors='replace')
+        return value if isinstance(value, str) else str(value)
+    
+    @staticmethod
+    def _to_integer(value, col):
+        if value is None or value == '':
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Valeur non entière '{value}' dans la colonne {col}: "
+                             f"précisez son type avec column_types")
+    
+    @staticmethod
+    def _to_real(value, col):
+        if value is None or value == '':
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Valeur non numérique '{value}' dans la colonne {col}: "
+                             f"précisez son type avec column_types")
+
+
+def _file_checksum(file_path: str) -> str:
+    """Empreinte SHA-256 d'un fichier"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _export_part(task):
+    """
+    Exporte une partie d'un export fractionné (exécuté dans un processus du groupe)
+    
+    Returns:
+        tuple: (nombre d'enregistrements, taille du fichier, empreinte SHA-256)
+    """
+    sqlite_path, export_format, file_path, query, params, options = task
+    count = FormatExporter().export_from_sqlite(sqlite_path, export_format, file_path, query, params, **options)
+    if not count or not os.path.exists(file_path):
+        return 0, 0, None
+    return count, os.path.getsize(file_path), _file_checksum(file_path)
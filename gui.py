@@ -9,54 +9,57 @@ import sys
 import os
 import logging
 import sqlite3
+import copy
 import csv
+import time
 from datetime import datetime
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                            QTabWidget, QLabel, QPushButton, QLineEdit, QComboBox,
-                           QTableWidget, QTableWidgetItem, QFileDialog, QMessageBox,
+                           QTableView, QFileDialog, QMessageBox,
                            QProgressBar, QStatusBar, QAction, QTextEdit, QListWidget,
                            QGroupBox, QFormLayout, QDialog, QDialogButtonBox, QCheckBox,
                            QSplitter, QFrame, QListWidgetItem, QInputDialog, QHeaderView, QSpinBox, QActionGroup)
-from PyQt5.QtCore import QThread, pyqtSignal, Qt, QMetaObject, Q_ARG, QVariant
-from PyQt5.QtGui import QIcon, QFont
+from PyQt5.QtCore import QTimer, pyqtSignal, Qt, QMetaObject, Q_ARG, QVariant
+from PyQt5.QtGui import QIcon, QFont, QKeySequence
 
 from csv_parser import CSVParser
 from db_manager import DatabaseManager
-from db_exporter import DBExporter, MYSQL_AVAILABLE, POSTGRES_AVAILABLE
-from format_exporter import FormatExporter
+from compressed_output import ZSTD_AVAILABLE, output_path
+from table_model import RecordTableModel, SQLiteTableModel, create_sort_index
+from record_search import SQLiteSearch, RecordListSearch
+from task_scheduler import (Task, TaskScheduler, PRIORITY_INTERACTIVE, PRIORITY_IMPORT, PRIORITY_EXPORT,
+                            CANCELLED, database_resource)
+from connection_pool import close_all_pools
+from query_inspector import QueryInspector
+from sql_presets import SQL_PRESETS_BY_CATEGORY, get_attach_query, get_fanout_merge_spec
+from query_executor import QueryExecutor, QueryCancelledError
+from federated_query import FederatedQuery, attach_unsupported_reason, fanout_unsupported_reason
+from lazy_modules import LazyModule
+import startup_profile
+
+# Exporteurs et détection des doublons: importés à la première utilisation (démarrage plus rapide)
+db_exporter = LazyModule('db_exporter')
+format_exporter = LazyModule('format_exporter')
+duplicate_finder = LazyModule('duplicate_finder')
 
 # Configuration du logging
 logging.basicConfig(filename='mp3tag_analyzer.log', level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-class Worker(QThread):
-    """Classe de travailleur pour exécuter des opérations en arrière-plan"""
-    finished = pyqtSignal(object)
-    progress = pyqtSignal(int)
-    log = pyqtSignal(str)
-    error = pyqtSignal(str)
-    
-    def __init__(self, func, *args, **kwargs):
-        super().__init__()
-        self.func = func
-        self.args = args
-        self.kwargs = kwargs
-        self.running = True
-    
-    def run(self):
-        try:
-            if self.running:
-                result = self.func(*self.args, **self.kwargs)
-                self.finished.emit(result)
-        except Exception as e:
-            if self.running:
-                self.error.emit(str(e))
-                traceback.print_exc()
+# Ressource partagée par les exports vers fichiers (limite du nombre d'exports simultanés)
+FILE_EXPORT_RESOURCE = 'exports-fichiers'
+
+
+class SearchTask(Task):
+    """Tâche de recherche: publie la première page de résultats avant la fin de la recherche"""
+    first_page = pyqtSignal(object)
     
-    def stop(self):
-        """Arrêter le thread proprement"""
-        self.running = False
+    def __init__(self, search, interactive=False):
+        super().__init__(search.run, name="Recherche", priority=PRIORITY_INTERACTIVE, on_cancel=search.cancel)
+        self.search = search
+        self.interactive = interactive
+        self.args = (self.first_page.emit,)
 
 
 class MainWindow(QMainWindow):
@@ -72,10 +75,24 @@ class MainWindow(QMainWindow):
         self.current_data = []
         self.current_filtered_data = []
         self.headers = []
-        self.active_workers = []  # Liste pour suivre les workers actifs
+        self.table_model = None  # Modèle affiché (RecordTableModel ou SQLiteTableModel)
+        # Modèles remplacés dont les modifications attendent que leur base soit libre
+        self.replaced_models = []
+        self.search_task = None  # Recherche en cours (les résultats des recherches remplacées sont ignorés)
+        self.search_source = None  # Modèle ou liste d'enregistrements sur lequel porte la recherche en cours
+        
+        # Écriture différée des modifications de cellules (regroupées en une transaction)
+        self.edit_flush_timer = QTimer(self)
+        self.edit_flush_timer.setSingleShot(True)
+        self.edit_flush_timer.setInterval(2000)
+        self.edit_flush_timer.timeout.connect(self._flush_edits)
+        # Planificateur commun des tâches d'arrière-plan (priorités, une écriture à la fois par base)
+        self.scheduler = TaskScheduler(resource_limits={FILE_EXPORT_RESOURCE: 2})
         self.logger = logging.getLogger('mp3tag_analyzer.gui')
         self.current_csv_path = None
         self.current_db_path = None  # Attribut pour stocker le chemin de la base de données actuelle
+        self.sql_executor = None  # Exécuteur de la requête SQL en cours (pour l'annulation)
+        self.federated_db_paths = []  # Bases interrogées ensemble en mode fédéré
         
         # Mode d'affichage des colonnes (automatique, minimal, moyen, large)
         self.column_width_mode = "automatique"  # Par défaut: automatique
@@ -91,10 +108,12 @@ class MainWindow(QMainWindow):
         
         # Initialisation de l'interface
         self._init_ui()
+        startup_profile.mark("Construction des widgets")
         
         # Connexion initiale à une base de données temporaire
         self.db_manager.connect()
         self.db_manager.create_tables()
+        startup_profile.mark("Base de données temporaire")
         
         self.logger.info("Interface initialisée")
 
@@ -141,6 +160,14 @@ class MainWindow(QMainWindow):
         self.search_input.setPlaceholderText("Rechercher...")
         self.search_input.returnPressed.connect(self._search_data)
         
+        # Recherche pendant la saisie, lancée après une courte pause (les frappes rapprochées sont regroupées)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(lambda: self._start_search(interactive=False))
+        self.search_input.textEdited.connect(lambda text: self.search_timer.start())
+        self.search_column.activated.connect(lambda index: self.search_timer.start())
+        
         search_button = QPushButton("Rechercher")
         search_button.clicked.connect(self._search_data)
         
@@ -171,19 +198,54 @@ class MainWindow(QMainWindow):
         data_layout = QVBoxLayout(self.data_widget)
         
         # Ajout du tableau et des contrôles de tri
-        self.table_widget = QTableWidget()
-        self.table_widget.setAlternatingRowColors(True)
-        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
-        self.table_widget.horizontalHeader().setStretchLastSection(True)
-        self.table_widget.setSortingEnabled(True)  # Activer le tri
-        self.table_widget.horizontalHeader().sectionClicked.connect(self._sort_table)
+        # Vue virtualisée: seules les lignes visibles sont lues et formatées par le modèle
+        self.table_view = QTableView()
+        self.table_view.setAlternatingRowColors(True)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_view.setSortingEnabled(True)  # Activer le tri
+        self.table_view.horizontalHeader().sectionClicked.connect(self._sort_table)
         
         # Ajouter le widget de données à l'onglet
-        data_layout.addWidget(self.table_widget)
+        data_layout.addWidget(self.table_view)
         self.tab_widget.addTab(self.data_widget, "Données")
         
-        # Onglet SQL
+        # Onglet SQL: construit à sa première ouverture (presets, inspecteur de requête)
         self.sql_widget = QWidget()
+        self.sql_tab_built = False
+        self.tab_widget.addTab(self.sql_widget, "Requêtes SQL")
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
+        
+        # Barre de statut
+        self.status_bar = QStatusBar()
+        self.setStatusBar(self.status_bar)
+        self.status_bar.showMessage("Prêt")
+        
+        # Activité des tâches d'arrière-plan
+        self.task_status_label = QLabel()
+        self.status_bar.addPermanentWidget(self.task_status_label)
+        self.scheduler.tasks_changed.connect(self._update_task_status)
+        
+        # Ajout des widgets au layout principal
+        main_layout.addWidget(file_group)
+        main_layout.addWidget(search_group)
+        main_layout.addWidget(self.progress_bar)
+        main_layout.addWidget(self.tab_widget, 1)  # 1 = stretch factor
+    
+    def _on_tab_changed(self, index):
+        """Construit l'onglet SQL à sa première ouverture"""
+        if self.tab_widget.widget(index) is self.sql_widget:
+            self._ensure_sql_tab()
+
+    def _ensure_sql_tab(self):
+        """Construit le contenu de l'onglet SQL s'il ne l'est pas encore
+
+        À appeler avant tout accès aux widgets de l'onglet hors de ses propres actions.
+        """
+        if self.sql_tab_built:
+            return
+        self.sql_tab_built = True
         sql_layout = QVBoxLayout(self.sql_widget)
         
         # Champ de saisie SQL
@@ -200,44 +262,8 @@ class MainWindow(QMainWindow):
         # Liste pour afficher les presets de la catégorie sélectionnée
         self.preset_list = QListWidget()
         
-        # Définir les catégories et les requêtes SQL prédéfinies
-        self.sql_presets_by_category = {
-            "Requêtes générales": {
-                "Tous les morceaux": "SELECT * FROM mp3_files ORDER BY artist, album, title",
-                "Nombre total de morceaux": "SELECT COUNT(*) as total_tracks FROM mp3_files",
-                "Durée totale de la collection": "SELECT SUM(audio_length)/60 as total_minutes FROM mp3_files"
-            },
-            "Analyse par artiste": {
-                "Artistes par nombre de morceaux": "SELECT artist, COUNT(*) as nb_tracks FROM mp3_files GROUP BY artist ORDER BY nb_tracks DESC",
-                "Artistes avec un seul morceau": "SELECT artist, title FROM mp3_files WHERE artist IN (SELECT artist FROM mp3_files GROUP BY artist HAVING COUNT(*) = 1)",
-                "Top 10 des artistes": "SELECT artist, COUNT(*) as nb_tracks FROM mp3_files GROUP BY artist ORDER BY nb_tracks DESC LIMIT 10"
-            },
-            "Analyse par album": {
-                "Albums par année": "SELECT album, artist, year FROM mp3_files GROUP BY album ORDER BY year DESC",
-                "Albums avec peu de morceaux": "SELECT album, artist, COUNT(*) as nb_tracks FROM mp3_files GROUP BY album, artist HAVING nb_tracks < 5 ORDER BY nb_tracks",
-                "Albums les plus complets": "SELECT album, artist, COUNT(*) as nb_tracks FROM mp3_files GROUP BY album, artist ORDER BY nb_tracks DESC LIMIT 20"
-            },
-            "Durée et taille": {
-                "Morceaux les plus longs": "SELECT title, artist, album, audio_length/60.0 as minutes FROM mp3_files ORDER BY audio_length DESC LIMIT 50",
-                "Morceaux les plus courts": "SELECT title, artist, album, audio_length/60.0 as minutes FROM mp3_files WHERE audio_length > 0 ORDER BY audio_length ASC LIMIT 50",
-                "Fichiers les plus volumineux": "SELECT title, artist, album, file_size FROM mp3_files ORDER BY CAST(REPLACE(file_size, ' KB', '') AS NUMERIC) DESC LIMIT 50"
-            },
-            "Métadonnées": {
-                "Morceaux sans ISRC": "SELECT title, artist, album FROM mp3_files WHERE isrc IS NULL OR isrc = ''",
-                "Morceaux sans année": "SELECT title, artist, album FROM mp3_files WHERE year IS NULL OR year = 0 OR year = ''",
-                "Distribution des genres": "SELECT genre, COUNT(*) as nb_tracks FROM mp3_files GROUP BY genre ORDER BY nb_tracks DESC"
-            },
-            "Formats audio": {
-                "Distribution des codecs": "SELECT codec, COUNT(*) as nb_tracks FROM mp3_files GROUP BY codec ORDER BY nb_tracks DESC",
-                "Distribution des bitrates": "SELECT bitrate, COUNT(*) as nb_tracks FROM mp3_files GROUP BY bitrate ORDER BY nb_tracks DESC",
-                "Fichiers avec VBR": "SELECT title, artist, album, bitrate FROM mp3_files WHERE vbr = '1' OR vbr = 'true' OR vbr = 'True'"
-            },
-            "Dates": {
-                "Morceaux récemment importés": "SELECT title, artist, album, import_date FROM mp3_files ORDER BY import_date DESC LIMIT 50",
-                "Fichiers les plus récents": "SELECT title, artist, album, file_create_date FROM mp3_files ORDER BY file_create_date DESC LIMIT 50",
-                "Fichiers les plus anciens": "SELECT title, artist, album, file_create_date FROM mp3_files ORDER BY file_create_date ASC LIMIT 50"
-            }
-        }
+        # Catégories et requêtes SQL prédéfinies (copie: l'utilisateur peut en ajouter)
+        self.sql_presets_by_category = copy.deepcopy(SQL_PRESETS_BY_CATEGORY)
         
         # Ajouter les catégories au sélecteur
         for category in self.sql_presets_by_category.keys():
@@ -264,28 +290,58 @@ class MainWindow(QMainWindow):
         preset_layout.addWidget(QLabel("Requêtes disponibles:"))
         preset_layout.addWidget(self.preset_list)
         
+        # Bouton pour interrompre la requête en cours
+        self.btn_stop_sql = QPushButton("Arrêter")
+        self.btn_stop_sql.setEnabled(False)
+        self.btn_stop_sql.clicked.connect(self._stop_sql)
+        
+        # Limites d'exécution: délai maximal et nombre maximal de lignes (0 = illimité)
+        self.sql_timeout_input = QSpinBox()
+        self.sql_timeout_input.setRange(0, 3600)
+        self.sql_timeout_input.setValue(60)
+        self.sql_timeout_input.setSuffix(" s")
+        self.sql_timeout_input.setSpecialValueText("Illimité")
+        
+        self.sql_max_rows_input = QSpinBox()
+        self.sql_max_rows_input.setRange(0, 10000000)
+        self.sql_max_rows_input.setSingleStep(10000)
+        self.sql_max_rows_input.setValue(100000)
+        self.sql_max_rows_input.setSpecialValueText("Illimité")
+        
+        # Bouton pour exporter le résultat sans l'afficher
+        self.btn_export_sql = QPushButton("Exporter le résultat...")
+        self.btn_export_sql.setToolTip("Exporte le résultat de la requête directement depuis la base, sans l'afficher")
+        self.btn_export_sql.clicked.connect(self._export_sql_query)
+        
+        # Case à cocher pour activer l'inspecteur de requête
+        self.sql_inspect_checkbox = QCheckBox("Inspecter la requête (plan, temps)")
+        
         sql_button_layout = QHBoxLayout()
         sql_button_layout.addWidget(self.btn_execute_sql)
+        sql_button_layout.addWidget(self.btn_stop_sql)
         sql_button_layout.addWidget(self.btn_save_preset)
+        sql_button_layout.addWidget(self.btn_export_sql)
+        sql_button_layout.addWidget(QLabel("Délai max:"))
+        sql_button_layout.addWidget(self.sql_timeout_input)
+        sql_button_layout.addWidget(QLabel("Lignes max:"))
+        sql_button_layout.addWidget(self.sql_max_rows_input)
+        sql_button_layout.addWidget(self.sql_inspect_checkbox)
+        
+        # Zone d'affichage du rapport d'inspection
+        inspector_group = QGroupBox("Inspecteur de requête")
+        inspector_layout = QVBoxLayout(inspector_group)
+        self.sql_inspector_output = QTextEdit()
+        self.sql_inspector_output.setReadOnly(True)
+        self.sql_inspector_output.setFont(QFont("Courier New", 9))
+        self.sql_inspector_output.setPlaceholderText("Cochez \"Inspecter la requête\" puis exécutez une requête pour afficher son plan d'exécution.")
+        inspector_layout.addWidget(self.sql_inspector_output)
         
         sql_layout.addWidget(preset_group)
         sql_layout.addWidget(QLabel("Requête SQL:"))
         sql_layout.addWidget(self.sql_query)
         sql_layout.addLayout(sql_button_layout)
-        
-        self.tab_widget.addTab(self.sql_widget, "Requêtes SQL")
-        
-        # Barre de statut
-        self.status_bar = QStatusBar()
-        self.setStatusBar(self.status_bar)
-        self.status_bar.showMessage("Prêt")
-        
-        # Ajout des widgets au layout principal
-        main_layout.addWidget(file_group)
-        main_layout.addWidget(search_group)
-        main_layout.addWidget(self.progress_bar)
-        main_layout.addWidget(self.tab_widget, 1)  # 1 = stretch factor
-    
+        sql_layout.addWidget(inspector_group)
+
     def _create_menu_bar(self):
         """Création de la barre de menu"""
         menu_bar = self.menuBar()
@@ -303,6 +359,11 @@ class MainWindow(QMainWindow):
         load_db_action.triggered.connect(self._load_database)
         file_menu.addAction(load_db_action)
         
+        # Chargement de plusieurs bases (mode fédéré)
+        load_federated_action = QAction("Charger plusieurs bases (mode fédéré)", self)
+        load_federated_action.triggered.connect(self._load_federated_databases)
+        file_menu.addAction(load_federated_action)
+        
         # Enregistrement Base
         save_db_action = QAction("Enregistrer Base de Données", self)
         save_db_action.triggered.connect(self._save_database)
@@ -311,46 +372,9 @@ class MainWindow(QMainWindow):
         # Séparateur
         file_menu.addSeparator()
         
-        # Sous-menu Export
-        export_menu = file_menu.addMenu("Exporter vers...")
-        
-        # Export MySQL
-        if MYSQL_AVAILABLE:
-            export_mysql_action = QAction("MySQL", self)
-            export_mysql_action.triggered.connect(self._export_to_mysql)
-            export_menu.addAction(export_mysql_action)
-        else:
-            export_mysql_disabled = QAction("MySQL (non disponible)", self)
-            export_mysql_disabled.setEnabled(False)
-            export_menu.addAction(export_mysql_disabled)
-        
-        # Export PostgreSQL
-        if POSTGRES_AVAILABLE:
-            export_postgres_action = QAction("PostgreSQL", self)
-            export_postgres_action.triggered.connect(self._export_to_postgres)
-            export_menu.addAction(export_postgres_action)
-        else:
-            export_postgres_disabled = QAction("PostgreSQL (non disponible)", self)
-            export_postgres_disabled.setEnabled(False)
-            export_menu.addAction(export_postgres_disabled)
-        
-        # Séparateur dans le sous-menu Export
-        export_menu.addSeparator()
-        
-        # Export CSV
-        export_csv_action = QAction("CSV", self)
-        export_csv_action.triggered.connect(self._export_to_csv)
-        export_menu.addAction(export_csv_action)
-        
-        # Export JSON
-        export_json_action = QAction("JSON", self)
-        export_json_action.triggered.connect(self._export_to_json)
-        export_menu.addAction(export_json_action)
-        
-        # Export XML
-        export_xml_action = QAction("XML", self)
-        export_xml_action.triggered.connect(self._export_to_xml)
-        export_menu.addAction(export_xml_action)
+        # Sous-menu Export: rempli à sa première ouverture (les exporteurs sont alors importés)
+        self.export_menu = file_menu.addMenu("Exporter vers...")
+        self.export_menu.aboutToShow.connect(self._populate_export_menu)
         
         # Séparateur
         file_menu.addSeparator()
@@ -363,6 +387,24 @@ class MainWindow(QMainWindow):
         # Menu Édition
         edit_menu = menu_bar.addMenu("Édition")
         
+        # Modifications de cellules (base chargée)
+        undo_action = QAction("Annuler la modification", self)
+        undo_action.setShortcut(QKeySequence.Undo)
+        undo_action.triggered.connect(self._undo_edit)
+        edit_menu.addAction(undo_action)
+        
+        redo_action = QAction("Rétablir la modification", self)
+        redo_action.setShortcut(QKeySequence.Redo)
+        redo_action.triggered.connect(self._redo_edit)
+        edit_menu.addAction(redo_action)
+        
+        save_edits_action = QAction("Enregistrer les modifications", self)
+        save_edits_action.setShortcut(QKeySequence.Save)
+        save_edits_action.triggered.connect(self._flush_edits)
+        edit_menu.addAction(save_edits_action)
+        
+        edit_menu.addSeparator()
+        
         # Sous-menu Largeur des colonnes
         column_width_menu = edit_menu.addMenu("Largeur des colonnes")
         
@@ -400,6 +442,19 @@ class MainWindow(QMainWindow):
         column_width_menu.addAction(med_width_action)
         column_width_menu.addAction(max_width_action)
         
+        # Menu Outils
+        tools_menu = menu_bar.addMenu("Outils")
+        
+        # Détection des doublons
+        find_duplicates_action = QAction("Détecter les doublons", self)
+        find_duplicates_action.triggered.connect(self._find_duplicates)
+        tools_menu.addAction(find_duplicates_action)
+        
+        # État des tâches d'arrière-plan
+        tasks_action = QAction("Tâches en arrière-plan...", self)
+        tasks_action.triggered.connect(self._show_tasks)
+        tools_menu.addAction(tasks_action)
+        
         # Menu Aide
         help_menu = menu_bar.addMenu("Aide")
         
@@ -408,16 +463,74 @@ class MainWindow(QMainWindow):
         about_action.triggered.connect(self._show_about)
         help_menu.addAction(about_action)
 
+    def _populate_export_menu(self):
+        """Remplit le sous-menu Export à sa première ouverture"""
+        self.export_menu.aboutToShow.disconnect(self._populate_export_menu)
+        
+        # Export MySQL
+        if db_exporter.MYSQL_AVAILABLE:
+            export_mysql_action = QAction("MySQL", self)
+            export_mysql_action.triggered.connect(self._export_to_mysql)
+            self.export_menu.addAction(export_mysql_action)
+        else:
+            export_mysql_disabled = QAction("MySQL (non disponible)", self)
+            export_mysql_disabled.setEnabled(False)
+            self.export_menu.addAction(export_mysql_disabled)
+        
+        # Export PostgreSQL
+        if db_exporter.POSTGRES_AVAILABLE:
+            export_postgres_action = QAction("PostgreSQL", self)
+            export_postgres_action.triggered.connect(self._export_to_postgres)
+            self.export_menu.addAction(export_postgres_action)
+        else:
+            export_postgres_disabled = QAction("PostgreSQL (non disponible)", self)
+            export_postgres_disabled.setEnabled(False)
+            self.export_menu.addAction(export_postgres_disabled)
+        
+        # Séparateur dans le sous-menu Export
+        self.export_menu.addSeparator()
+        
+        # Export CSV
+        export_csv_action = QAction("CSV", self)
+        export_csv_action.triggered.connect(self._export_to_csv)
+        self.export_menu.addAction(export_csv_action)
+        
+        # Export JSON
+        export_json_action = QAction("JSON", self)
+        export_json_action.triggered.connect(self._export_to_json)
+        self.export_menu.addAction(export_json_action)
+        
+        # Export XML
+        export_xml_action = QAction("XML", self)
+        export_xml_action.triggered.connect(self._export_to_xml)
+        self.export_menu.addAction(export_xml_action)
+        
+        # Export Parquet et Arrow/Feather (formats en colonnes)
+        for export_format, label in (('parquet', "Parquet"), ('feather', "Arrow/Feather")):
+            if format_exporter.PYARROW_AVAILABLE:
+                columnar_action = QAction(label, self)
+                columnar_action.triggered.connect(lambda checked, f=export_format: self._export_to_columnar(f))
+            else:
+                columnar_action = QAction(f"{label} (non disponible)", self)
+                columnar_action.setEnabled(False)
+            self.export_menu.addAction(columnar_action)
+        
+        # Export fractionné en plusieurs fichiers
+        self.export_menu.addSeparator()
+        export_split_action = QAction("Export fractionné (plusieurs fichiers)...", self)
+        export_split_action.triggered.connect(self._export_split)
+        self.export_menu.addAction(export_split_action)
+
     def _set_column_width_mode(self, mode):
         """Définit le mode d'affichage des colonnes"""
         self.column_width_mode = mode
         
         if mode == "automatique":
-            self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+            self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
         else:
             width = self.column_widths[mode]
-            for i in range(self.table_widget.columnCount()):
-                self.table_widget.setColumnWidth(i, width)
+            for i in range(self.table_view.model().columnCount() if self.table_view.model() else 0):
+                self.table_view.setColumnWidth(i, width)
 
     def _load_csv_file(self):
         """Chargement d'un fichier CSV"""
@@ -432,15 +545,16 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage(f"Chargement du fichier {file_path}...")
             self.progress_bar.setVisible(True)
             
-            # Création d'un worker pour charger le fichier CSV
-            worker = Worker(self.csv_parser.parse_file, file_path)
-            worker.finished.connect(self._update_table_from_worker)
-            worker.error.connect(self._handle_error)
-            worker.start()
-            self.active_workers.append(worker)
+            # Création d'une tâche pour charger le fichier CSV
+            task = Task(self.csv_parser.parse_file, file_path,
+                        name="Chargement du fichier CSV", priority=PRIORITY_IMPORT)
+            task.finished.connect(self._update_table_from_worker)
+            task.error.connect(self._handle_error)
+            task.status_changed.connect(self._task_status_changed)
+            self.scheduler.start(task)
     
     def _update_table_from_worker(self, result):
-        """Mise à jour du tableau avec les données chargées par le worker"""
+        """Mise à jour du tableau avec les données chargées par la tâche de chargement"""
         self.progress_bar.setVisible(False)
         
         if result:
@@ -456,21 +570,18 @@ class MainWindow(QMainWindow):
                 self.search_column.addItem(header, header)
             
             # Insertion des données dans la base de données
-            worker = Worker(self._insert_data_to_db)
-            worker.finished.connect(self._data_inserted_handler)  # Utilisez le nouveau gestionnaire
-            worker.error.connect(self._handle_error)
-            worker.start()
-            self.active_workers.append(worker)
+            task = Task(self._insert_data_to_db,
+                        name="Insertion dans la base de données", priority=PRIORITY_IMPORT,
+                        resources=(database_resource(self.current_db_path),))
+            task.finished.connect(self._data_inserted_handler)  # Utilisez le nouveau gestionnaire
+            task.error.connect(self._handle_error)
+            task.status_changed.connect(self._task_status_changed)
+            self.scheduler.start(task)
             
             self.status_bar.showMessage(f"{len(self.current_data)} enregistrements chargés")
         else:
             QMessageBox.warning(self, "Erreur", "Aucune donnée n'a pu être chargée")
             self.status_bar.showMessage("Erreur lors du chargement des données")
-        
-        # Retirer le worker de la liste des workers actifs
-        sender = self.sender()
-        if sender in self.active_workers:
-            self.active_workers.remove(sender)
     
     def _insert_data_to_db(self):
         """Méthode pour insérer les données dans la base de données dans un thread séparé
@@ -509,11 +620,12 @@ class MainWindow(QMainWindow):
         QMessageBox.critical(self, "Erreur", error)
         self.status_bar.showMessage("Erreur")
         self.progress_bar.setVisible(False)
-        
-        # Retirer le worker de la liste des workers actifs
-        sender = self.sender()
-        if sender in self.active_workers:
-            self.active_workers.remove(sender)
+    
+    def _task_status_changed(self, status):
+        """Fin d'une tâche annulée (avant son démarrage): ni résultat ni erreur ne suivront"""
+        if status == CANCELLED:
+            self.status_bar.showMessage(f"{self.sender().name}: annulée")
+            self.progress_bar.setVisible(False)
     
     def _load_database(self):
         """Chargement d'une base de données SQLite"""
@@ -530,21 +642,28 @@ class MainWindow(QMainWindow):
             
             # Fermeture de la connexion actuelle
             self.db_manager.close()
+            self.federated_db_paths = []
             
             # Ouverture de la nouvelle base de données
             if self.db_manager.connect(file_path):
                 self.current_db_path = file_path  # Mettre à jour le chemin de la base de données actuelle
-                # Récupération des données
-                data = self.db_manager.get_all_records()
+                # Les enregistrements restent dans la base: le modèle lit les pages affichées
+                try:
+                    model = SQLiteTableModel(file_path)
+                except Exception as e:
+                    self.logger.error(f"Erreur lors de la lecture de la base de données: {e}")
+                    model = None
+                total = model.total_rows() if model else 0
                 
-                if data:
-                    self.current_data = data
+                if total:
+                    self.current_data = []
+                    self.current_filtered_data = []
                     
                     # Extraction des entêtes
-                    self.headers = list(data[0].keys())
+                    self.headers = list(model.headers)
                     
                     # Mise à jour du tableau
-                    self._update_table()
+                    self._set_table_model(model)
                     
                     # Mise à jour des options de recherche
                     self.search_column.clear()
@@ -552,8 +671,10 @@ class MainWindow(QMainWindow):
                     for header in self.headers:
                         self.search_column.addItem(header, header)
                     
-                    self.status_bar.showMessage(f"{len(data)} enregistrements chargés")
+                    self.status_bar.showMessage(f"{total} enregistrements chargés")
                 else:
+                    if model:
+                        model.close()
                     QMessageBox.warning(self, "Avertissement", "La base de données est vide ou n'a pas pu être lue")
                     self.status_bar.showMessage("Base de données vide")
             else:
@@ -562,9 +683,35 @@ class MainWindow(QMainWindow):
             
             self.progress_bar.setVisible(False)
     
+    def _load_federated_databases(self):
+        """Sélection de plusieurs bases SQLite interrogées ensemble (mode fédéré)"""
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            "Ouvrir plusieurs bases de données SQLite",
+            "",
+            "Bases de données SQLite (*.db *.sqlite);;Tous les fichiers (*)"
+        )
+        
+        if not file_paths:
+            return
+        
+        if len(file_paths) == 1:
+            QMessageBox.information(self, "Mode fédéré", "Sélectionnez au moins deux bases de données. Pour une seule base, utilisez \"Charger Base de Données\".")
+            return
+        
+        self.federated_db_paths = file_paths
+        federation = FederatedQuery(file_paths)
+        mode = "bases attachées" if federation.default_mode() == 'attach' else "exécution parallèle par base"
+        
+        # Les requêtes SQL portent désormais sur l'ensemble des bases
+        self.tab_widget.setCurrentWidget(self.sql_widget)
+        self.status_bar.showMessage(f"Mode fédéré: {len(file_paths)} bases ({mode}), colonne source_db ajoutée à mp3_files")
+    
     def _save_database(self):
         """Enregistrement de la base de données SQLite"""
-        if not self.current_data:
+        if not self._flush_edits():
+            return
+        if not self._has_data():
             QMessageBox.warning(self, "Erreur", "Aucune donnée à enregistrer")
             return
         
@@ -583,13 +730,15 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage(f"Enregistrement de la base de données {file_path}...")
             self.progress_bar.setVisible(True)
             
-            # Création d'un worker pour enregistrer la base de données
+            # Création d'une tâche pour enregistrer la base de données
             # Nous allons utiliser une fonction lambda pour passer les paramètres
-            worker = Worker(lambda: self._save_database_to_file(file_path))
-            worker.finished.connect(self._database_saved)
-            worker.error.connect(self._handle_error)
-            worker.start()
-            self.active_workers.append(worker)
+            task = Task(lambda: self._save_database_to_file(file_path),
+                        name="Enregistrement de la base de données", priority=PRIORITY_IMPORT,
+                        resources=(database_resource(file_path),))
+            task.finished.connect(self._database_saved)
+            task.error.connect(self._handle_error)
+            task.status_changed.connect(self._task_status_changed)
+            self.scheduler.start(task)
     
     def _save_database_to_file(self, file_path):
         """Sauvegarde la base de données dans un fichier depuis un thread séparé"""
@@ -645,181 +794,302 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("Erreur lors de l'enregistrement de la base de données")
         
         self.progress_bar.setVisible(False)
-        
-        # Retirer le worker de la liste des workers actifs
-        sender = self.sender()
-        if sender in self.active_workers:
-            self.active_workers.remove(sender)
     
     def _update_table(self, data=None):
-        """Mise à jour du tableau avec les données actuelles"""
+        """Mise à jour du tableau avec les données actuelles (enregistrements en mémoire)"""
         if data is None:
             data = self.current_data
-            
-        if not data:
-            self.table_widget.setRowCount(0)
-            return
         
         # Mise à jour des en-têtes si nécessaire
-        if not self.headers:
+        if not self.headers and data:
             # Utiliser les clés du premier élément comme en-têtes
             self.headers = list(data[0].keys())
         
-        # Configuration du tableau
-        self.table_widget.setRowCount(len(data))
-        self.table_widget.setColumnCount(len(self.headers))
-        self.table_widget.setHorizontalHeaderLabels(self.headers)
-        
-        # Déconnexion temporaire du signal itemChanged pour éviter les appels pendant le remplissage
-        try:
-            self.table_widget.itemChanged.disconnect(self._cell_changed)
-        except:
-            pass
-        
-        # Remplissage du tableau
-        for row_idx, row_data in enumerate(data):
-            for col_idx, header in enumerate(self.headers):
-                # Récupération de la valeur
-                value = ""
-                
-                # Vérifier si la clé existe directement
-                if header in row_data:
-                    value = row_data[header]
-                else:
-                    # Essayer avec la clé normalisée (snake_case)
-                    normalized_key = header.lower().replace(' ', '_')
-                    if normalized_key in row_data:
-                        value = row_data[normalized_key]
-                
-                # Formatage spécial pour certains champs
-                if header == "AudioLength" and value:
-                    try:
-                        # Conversion des secondes en format h:m:s
-                        seconds = int(float(value))
-                        hours, remainder = divmod(seconds, 3600)
-                        minutes, seconds = divmod(remainder, 60)
-                        if hours > 0:
-                            value = f"{hours}:{minutes:02d}:{seconds:02d}"
-                        else:
-                            value = f"{minutes:02d}:{seconds:02d}"
-                    except (ValueError, TypeError):
-                        # En cas d'erreur, garder la valeur originale
-                        pass
-                
-                # Création de l'item
-                item = QTableWidgetItem(str(value))
-                # Rendre l'item éditable
-                item.setFlags(item.flags() | Qt.ItemIsEditable)
-                
-                # Stocker les données brutes pour le tri
-                if isinstance(value, (int, float)):
-                    item.setData(Qt.UserRole, value)  # Stocker la valeur numérique pour le tri
-                
-                # Ajout de l'item au tableau
-                self.table_widget.setItem(row_idx, col_idx, item)
+        self._set_table_model(RecordTableModel(data or [], self.headers))
+
+    def _set_table_model(self, model):
+        """Affiche un modèle dans la vue et remplace le précédent"""
+        previous = self.table_model
+        self.table_model = model
+        model.valueEdited.connect(self._cell_changed)
+        if isinstance(model, SQLiteTableModel):
+            model.sortIndexWanted.connect(self._build_sort_index)
+        self.table_view.setModel(model)
+        if isinstance(previous, SQLiteTableModel):
+            self.replaced_models.append(previous)
+            self._flush_replaced_models()
+        
+        # Première tranche de lignes (les suivantes sont chargées au défilement)
+        if model.canFetchMore():
+            model.fetchMore()
         
         # Ajustement des colonnes selon le mode sélectionné
         if self.column_width_mode == "automatique":
-            self.table_widget.resizeColumnsToContents()
+            self.table_view.resizeColumnsToContents()
         else:
             width = self.column_widths[self.column_width_mode]
-            for i in range(self.table_widget.columnCount()):
-                self.table_widget.setColumnWidth(i, width)
-        
-        # Reconnexion du signal de modification des cellules
-        self.table_widget.itemChanged.connect(self._cell_changed)
+            for i in range(model.columnCount()):
+                self.table_view.setColumnWidth(i, width)
+
+    def _has_data(self):
+        """Indique si des données sont chargées (en mémoire ou dans la base affichée)"""
+        if isinstance(self.table_model, SQLiteTableModel):
+            return True
+        return bool(self.current_data)
+
+    def _exports_from_database(self, config):
+        """Indique si un export fichier complet peut être lu en flux depuis la base affichée
+        (sinon: données en mémoire, ex. résultat d'une requête SQL ou modifications depuis une séquence)
+        """
+        return isinstance(self.table_model, SQLiteTableModel) and config.get('since_seq') is None
 
     def _sort_table(self, column_index):
         """Trie le tableau selon la colonne cliquée"""
-        # L'en-tête du tableau gère automatiquement le tri
+        # La vue appelle sort() du modèle: tri en mémoire, ou ORDER BY indexé pour la base chargée
         self.status_bar.showMessage(f"Tri par {self.headers[column_index]}")
     
     def _execute_sql(self):
         """Exécute une requête SQL personnalisée"""
+        if not self._flush_edits():
+            return
         sql_query = self.sql_query.toPlainText().strip()
         
         if not sql_query:
             QMessageBox.warning(self, "Erreur", "Veuillez entrer une requête SQL")
             return
         
-        # Création d'un worker pour exécuter la requête SQL
-        worker = Worker(self._execute_sql_query, sql_query)
-        worker.finished.connect(self._display_sql_results)
-        worker.error.connect(self._handle_sql_error)
-        worker.start()
-        self.active_workers.append(worker)
+        # Exécuteur annulable, limité en temps et en nombre de lignes
+        self.sql_executor = QueryExecutor(
+            timeout=self.sql_timeout_input.value(),
+            max_rows=self.sql_max_rows_input.value()
+        )
         
+        # Création d'une tâche pour exécuter la requête SQL
+        task = Task(self._execute_sql_query, sql_query, self.sql_inspect_checkbox.isChecked(), self.sql_executor,
+                    name="Requête SQL", priority=PRIORITY_INTERACTIVE, on_cancel=self.sql_executor.cancel)
+        task.finished.connect(self._display_sql_results)
+        task.error.connect(self._handle_sql_error)
+        task.status_changed.connect(self._sql_status_changed)
+        self.scheduler.start(task)
+        
+        self.btn_execute_sql.setEnabled(False)
+        self.btn_stop_sql.setEnabled(True)
         self.status_bar.showMessage("Exécution de la requête SQL...")
         self.progress_bar.setVisible(True)
     
-    def _execute_sql_query(self, query):
+    def _export_sql_query(self):
+        """Exporte le résultat de la requête SQL vers un fichier, en flux depuis la base"""
+        if not self._flush_edits():
+            return
+        sql_query = self.sql_query.toPlainText().strip()
+        
+        if not sql_query:
+            QMessageBox.warning(self, "Erreur", "Veuillez entrer une requête SQL")
+            return
+        
+        if not self.current_db_path or self.federated_db_paths:
+            QMessageBox.warning(self, "Erreur", "L'export d'une requête lit directement la base de données. Veuillez d'abord ouvrir une base de données (hors mode fédéré).")
+            return
+        
+        # Boîte de dialogue de configuration
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Export du résultat de la requête")
+        layout = QFormLayout(dialog)
+        
+        format_input = QComboBox()
+        format_input.addItem("CSV", 'csv')
+        format_input.addItem("JSON", 'json')
+        format_input.addItem("JSON Lines", 'jsonl')
+        format_input.addItem("XML", 'xml')
+        if format_exporter.PYARROW_AVAILABLE:
+            format_input.addItem("Parquet", 'parquet')
+            format_input.addItem("Arrow/Feather", 'feather')
+        
+        layout.addRow("Format:", format_input)
+        compression_input = self._add_compression_option(layout)
+        
+        # Boutons
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addRow(buttons)
+        
+        if dialog.exec_() == QDialog.Accepted:
+            export_format = format_input.currentData()
+            
+            # Demander le chemin du fichier de destination
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                "Enregistrer le résultat de la requête",
+                "",
+                "Tous les fichiers (*)"
+            )
+            
+            if file_path:
+                options = {}
+                compression = None
+                if export_format not in ('parquet', 'feather'):
+                    # Parquet et Arrow compressent en interne
+                    compression = compression_input.currentData()
+                    options['compression'] = compression or 'none'
+                file_path = output_path(file_path, format_exporter.FormatExporter.FILE_EXTENSIONS[export_format], compression)
+                
+                self.status_bar.showMessage("Exportation du résultat de la requête en cours...")
+                self.progress_bar.setVisible(True)
+                
+                task = Task(format_exporter.FormatExporter().export_query,
+                            self.current_db_path, export_format, file_path, query=sql_query,
+                            name="Export du résultat de la requête", priority=PRIORITY_EXPORT,
+                            resources=(FILE_EXPORT_RESOURCE,), **options)
+                task.finished.connect(lambda count: self._export_completed(os.path.basename(file_path), count))
+                task.error.connect(self._handle_error)
+                task.status_changed.connect(self._task_status_changed)
+                self.scheduler.start(task)
+    
+    def _stop_sql(self):
+        """Interrompt la requête SQL en cours"""
+        if self.sql_executor:
+            self.sql_executor.cancel()
+            self.btn_stop_sql.setEnabled(False)
+            self.status_bar.showMessage("Interruption de la requête SQL...")
+    
+    def _sql_query_done(self):
+        """Réactive les contrôles SQL à la fin d'une requête"""
+        self.btn_execute_sql.setEnabled(True)
+        self.btn_stop_sql.setEnabled(False)
+        self.progress_bar.setVisible(False)
+    
+    def _execute_sql_query(self, query, inspect=False, executor=None):
         """Exécute une requête SQL dans un thread séparé"""
+        if executor is None:
+            executor = QueryExecutor()
+        
+        # Mode fédéré: la requête porte sur plusieurs bases
+        if self.federated_db_paths:
+            return self._execute_federated_query(query, inspect, executor)
+        
+        # Utiliser le gestionnaire de base de données avec le chemin actuel de DB
+        db = DatabaseManager()
+        db.connect(self.current_db_path)  # Utiliser le chemin actuel de la base
         try:
-            # Utiliser le gestionnaire de base de données avec le chemin actuel de DB
-            db = DatabaseManager()
-            db.connect(self.current_db_path)  # Utiliser le chemin actuel de la base
             db.create_tables()
             
-            # Exécuter la requête SQL
-            conn = db.conn
-            cursor = conn.cursor()
-            cursor.execute(query)
-            
-            # Récupérer les résultats
-            rows = cursor.fetchall()
-            columns = [column[0] for column in cursor.description] if cursor.description else []
+            # Exécution instrumentée (plan, temps, instructions VM)
+            if inspect:
+                return QueryInspector().inspect(db.conn, query, executor)
             
-            # Convertir les résultats en liste de dictionnaires
-            results = []
-            for row in rows:
-                results.append(dict(zip(columns, row)))
-            
-            db.close()
-            return columns, results
+            # Exécuter la requête SQL (interruptible via executor.cancel())
+            return executor.execute(db.conn, query)
+        except QueryCancelledError:
+            raise
         except sqlite3.Error as e:
             raise Exception(f"Erreur SQL: {str(e)}")
+        finally:
+            db.close()
+    
+    def _execute_federated_query(self, query, inspect, executor):
+        """Exécute une requête SQL sur les bases du mode fédéré (thread séparé)"""
+        federation = FederatedQuery(self.federated_db_paths)
+        try:
+            if federation.default_mode() == 'attach':
+                query = get_attach_query(query)
+                table = attach_unsupported_reason(query)
+                if table:
+                    raise Exception(
+                        f"Requête non supportée en mode fédéré: les id de pistes de {table} se répètent "
+                        f"d'une base à l'autre. Joignez sur la colonne source_db en plus de l'id "
+                        f"(ex: f.source_db = d.source_db AND f.id = d.track_id), ou utilisez un preset."
+                    )
+                conn = federation.connect_attached()
+                try:
+                    if inspect:
+                        return QueryInspector().inspect(conn, query, executor)
+                    return executor.execute(conn, query)
+                finally:
+                    conn.close()
+            # Trop de bases pour les attacher: exécution base par base, puis concaténation
+            # ou fusion selon les règles du preset
+            spec = get_fanout_merge_spec(query)
+            if spec is None:
+                reason = fanout_unsupported_reason(query)
+                if reason:
+                    raise Exception(
+                        f"Requête non supportée en mode fédéré sur {len(self.federated_db_paths)} bases "
+                        f"(exécution base par base au-delà de {federation.max_attached()} bases attachées): "
+                        f"{reason} donnerait un résultat par base. Utilisez un preset, dont les résultats "
+                        f"sont fusionnés, ou chargez moins de bases."
+                    )
+                spec = {}
+            merge = dict(spec)
+            return federation.execute_fanout(merge.pop('query', query), executor, **merge)
+        except QueryCancelledError:
+            raise
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur SQL (mode fédéré): {str(e)}")
     
     def _display_sql_results(self, result):
         """Affiche les résultats d'une requête SQL"""
-        self.progress_bar.setVisible(False)
+        self._sql_query_done()
+        truncated = self.sql_executor.truncated if self.sql_executor else False
+        self.sql_executor = None
         
         if result:
-            columns, data = result
+            columns, data = result[0], result[1]
+            # Rapport d'inspection présent si l'inspecteur était activé
+            report = result[2] if len(result) > 2 else None
             
             if data and columns:
                 # Mise à jour des en-têtes
                 self.headers = columns
                 self.current_data = data
                 
-                # Mise à jour du tableau
+                # Mise à jour du tableau (chronométrée pour l'inspecteur)
+                start = time.perf_counter()
                 self._update_table(data)
+                render_time = time.perf_counter() - start
                 
-                self.status_bar.showMessage(f"Requête exécutée avec succès: {len(data)} enregistrements")
+                if truncated:
+                    self.status_bar.showMessage(f"Requête exécutée: résultats limités aux {len(data)} premiers enregistrements")
+                else:
+                    self.status_bar.showMessage(f"Requête exécutée avec succès: {len(data)} enregistrements")
                 
-                # Basculer vers l'onglet Données pour afficher les résultats
-                self.tab_widget.setCurrentIndex(0)
+                if report is not None:
+                    report['render_time'] = render_time
+                    self.sql_inspector_output.setPlainText(QueryInspector().format_report(report))
+                else:
+                    # Basculer vers l'onglet Données pour afficher les résultats
+                    self.tab_widget.setCurrentIndex(0)
+            elif report is not None:
+                self.sql_inspector_output.setPlainText(QueryInspector().format_report(report))
+                self.status_bar.showMessage("Requête exécutée sans résultats")
             else:
                 QMessageBox.information(self, "Résultat", "La requête n'a retourné aucun résultat ou a été exécutée avec succès sans résultats.")
                 self.status_bar.showMessage("Requête exécutée sans résultats")
         else:
             QMessageBox.warning(self, "Erreur", "Erreur lors de l'exécution de la requête")
             self.status_bar.showMessage("Erreur lors de l'exécution de la requête")
-        
-        # Retirer le worker de la liste des workers actifs
-        sender = self.sender()
-        if sender in self.active_workers:
-            self.active_workers.remove(sender)
+    
+    def _sql_status_changed(self, status):
+        """Requête SQL annulée depuis l'état des tâches: réactive les contrôles SQL"""
+        if status == CANCELLED:
+            self._sql_query_done()
+            self.sql_executor = None
+            self.status_bar.showMessage("Requête annulée")
     
     def _handle_sql_error(self, error):
         """Gestion des erreurs SQL"""
-        self.progress_bar.setVisible(False)
-        QMessageBox.critical(self, "Erreur SQL", error)
-        self.status_bar.showMessage("Erreur SQL")
-        
-        # Retirer le worker de la liste des workers actifs
-        sender = self.sender()
-        if sender in self.active_workers:
-            self.active_workers.remove(sender)
+        self._sql_query_done()
+        executor = self.sql_executor
+        self.sql_executor = None
+        
+        if executor and executor.timed_out:
+            QMessageBox.warning(self, "Délai dépassé", error)
+            self.status_bar.showMessage("Requête interrompue (délai dépassé)")
+        elif executor and executor.cancelled:
+            self.status_bar.showMessage("Requête annulée")
+        else:
+            QMessageBox.critical(self, "Erreur SQL", error)
+            self.status_bar.showMessage("Erreur SQL")
     
     def _update_preset_list(self, category):
         """Met à jour la liste des presets selon la catégorie sélectionnée"""
@@ -884,66 +1154,140 @@ class MainWindow(QMainWindow):
         self.status_bar.showMessage(f"Preset SQL '{name}' sauvegardé dans la catégorie '{category}'")
     
     def _search_data(self):
-        """Recherche dans les données selon les critères"""
-        if not self.current_data:
+        """Recherche dans les données selon les critères (bouton Rechercher ou touche Entrée)"""
+        if not self._has_data():
             QMessageBox.warning(self, "Erreur", "Aucune donnée à rechercher")
             return
+        self._start_search(interactive=True)
+
+    def _start_search(self, interactive=False):
+        """Lance la recherche en arrière-plan et annule la précédente
+
+        Args:
+            interactive (bool): True si demandée explicitement (message si aucun résultat)
+        """
+        self.search_timer.stop()
+        self._cancel_search()
+        if not self._has_data():
+            return
         
         search_text = self.search_input.text().strip()
         search_column = self.search_column.currentData()
+        model = self.table_model
         
-        if not search_text:
-            # Si la recherche est vide, afficher toutes les données
-            self.current_filtered_data = self.current_data
-            self._update_table()
-            self.status_bar.showMessage(f"Affichage de tous les enregistrements ({len(self.current_data)})")
+        if isinstance(model, SQLiteTableModel):
+            if not search_text:
+                model.set_filter()
+                self.status_bar.showMessage(f"Affichage de tous les enregistrements ({model.total_rows()})")
+                return
+            # Base chargée: la recherche est une condition appliquée par SQLite
+            columns = model.headers if search_column == "all" else [search_column]
+            search = SQLiteSearch(model.db_path, columns, search_text, table=model.table,
+                                  order_by=model.order_by, page_size=model.PAGE_SIZE)
+            self.search_source = model
+        else:
+            if not search_text:
+                # Si la recherche est vide, afficher toutes les données
+                self.current_filtered_data = self.current_data
+                self._update_table()
+                self.status_bar.showMessage(f"Affichage de tous les enregistrements ({len(self.current_data)})")
+                return
+            search = RecordListSearch(self.current_data, search_column, search_text)
+            self.search_source = self.current_data
+        
+        task = SearchTask(search, interactive)
+        task.first_page.connect(self._show_search_first_page)
+        task.finished.connect(self._search_finished)
+        task.error.connect(self._search_failed)
+        task.status_changed.connect(self._search_status_changed)
+        self.search_task = task
+        self.scheduler.start(task)
+        self.status_bar.showMessage("Recherche en cours...")
+
+    def _cancel_search(self):
+        """Annule la recherche en cours (ses résultats éventuels sont ignorés)"""
+        if self.search_task is not None:
+            self.search_task.cancel()
+            self.search_task = None
+            self.search_source = None
+
+    def _is_current_search(self, task):
+        """Indique si une tâche de recherche porte sur la recherche et les données actuelles"""
+        if task is None or task is not self.search_task:
+            return False
+        return self.search_source is self.table_model or self.search_source is self.current_data
+
+    def _show_search_first_page(self, page):
+        """Affiche la première page de résultats, avant la fin de la recherche"""
+        task = self.sender()
+        if not self._is_current_search(task):
             return
+        if isinstance(task.search, SQLiteSearch):
+            self.table_model.apply_search(task.search.where, task.search.params, page)
+        else:
+            self.current_filtered_data = page
+            self._update_table(page)
+        self.status_bar.showMessage(f"Recherche en cours... {len(page)} premiers résultats affichés")
+
+    def _search_finished(self, result):
+        """Fin de la recherche: nombre total de résultats (base) ou enregistrements trouvés (mémoire)"""
+        task = self.sender()
+        if not self._is_current_search(task):
+            return
+        self.search_task = None
         
-        # Recherche dans les données
-        filtered_data = []
-        
-        for record in self.current_data:
-            if search_column == "all":
-                # Recherche dans tous les champs
-                for key, value in record.items():
-                    if isinstance(value, str) and search_text.lower() in value.lower():
-                        filtered_data.append(record)
-                        break
-            else:
-                # Recherche dans une colonne spécifique
-                if search_column in record:
-                    value = record[search_column]
-                    if isinstance(value, str) and search_text.lower() in value.lower():
-                        filtered_data.append(record)
-                else:
-                    # Essayer avec la clé normalisée
-                    normalized_key = search_column.lower().replace(' ', '_')
-                    if normalized_key in record:
-                        value = record[normalized_key]
-                        if isinstance(value, str) and search_text.lower() in value.lower():
-                            filtered_data.append(record)
-        
-        # Mise à jour du tableau avec les résultats
-        self.current_filtered_data = filtered_data
-        self._update_table(filtered_data)
+        if isinstance(task.search, SQLiteSearch):
+            # La première page est déjà affichée: seul le nombre de lignes restait à connaître
+            total = result
+            self.table_model.set_total(total)
+        else:
+            total = len(result)
+            # Mise à jour du tableau avec les résultats (sauf s'ils sont déjà tous affichés)
+            if result != self.current_filtered_data:
+                self.current_filtered_data = result
+                self._update_table(result)
         
         # Mise à jour de la barre de statut
-        if filtered_data:
-            self.status_bar.showMessage(f"{len(filtered_data)} enregistrement(s) trouvé(s)")
+        if total:
+            self.status_bar.showMessage(f"{total} enregistrement(s) trouvé(s)")
         else:
-            QMessageBox.information(self, "Résultats", "Aucun enregistrement ne correspond aux critères de recherche")
+            if task.interactive:
+                QMessageBox.information(self, "Résultats", "Aucun enregistrement ne correspond aux critères de recherche")
             self.status_bar.showMessage("Aucun résultat")
 
+    def _search_failed(self, error):
+        """Erreur de recherche (une recherche annulée n'est pas signalée)"""
+        task = self.sender()
+        if not self._is_current_search(task) or task.search.cancelled:
+            return
+        self.search_task = None
+        QMessageBox.critical(self, "Erreur", error)
+        self.status_bar.showMessage("Erreur lors de la recherche")
+
+    def _search_status_changed(self, status):
+        """Recherche annulée depuis l'état des tâches (les recherches remplacées sont ignorées)"""
+        if status == CANCELLED and self._is_current_search(self.sender()):
+            self.search_task = None
+            self.status_bar.showMessage("Recherche annulée")
+
     def _reset_filters(self):
         """Réinitialise les filtres"""
+        self.search_timer.stop()
+        self._cancel_search()
         self.search_input.clear()
         self.search_column.setCurrentIndex(0)
+        if isinstance(self.table_model, SQLiteTableModel):
+            self.table_model.set_filter()
+            self.status_bar.showMessage(f"Affichage de tous les enregistrements ({self.table_model.total_rows()})")
+            return
         self.current_filtered_data = self.current_data
         self._update_table()
         self.status_bar.showMessage(f"Affichage de tous les enregistrements ({len(self.current_data)})")
     
     def _reset_data(self):
         """Réinitialise les données"""
+        self.search_timer.stop()
+        self._cancel_search()
         self.current_data = []
         self.headers = []
         self.current_filtered_data = []
@@ -968,7 +1312,7 @@ class MainWindow(QMainWindow):
                 <li>Recherche avancée par critères multiples</li>
                 <li>Exécution de requêtes SQL personnalisées</li>
                 <li>Export vers MySQL et PostgreSQL</li>
-                <li>Export vers formats standards: CSV, JSON, XML</li>
+                <li>Export vers formats standards: CSV, JSON, XML, Parquet, Arrow/Feather</li>
                 <li>Édition des métadonnées directement dans l'interface</li>
             </ul>
             <p>Développé avec PyQt5 et SQLite.</p>
@@ -977,14 +1321,21 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Gestion de la fermeture de l'application"""
-        # Arrêter tous les workers actifs
-        for worker in self.active_workers:
-            worker.stop()
-            worker.wait()  # Attendre que le thread se termine
+        # Annuler les tâches en attente, interrompre celles qui le permettent (requêtes SQL, recherches)
+        # et attendre la fin des autres
+        self.scheduler.shutdown(wait=True)
+        
+        # Plus aucune tâche n'écrit: enregistrer les modifications de cellules en attente
+        self._flush_edits()
         
         # Fermer la connexion à la base de données
         if self.db_manager:
             self.db_manager.close()
+        if isinstance(self.table_model, SQLiteTableModel):
+            self.table_model.close()
+        
+        # Fermer les connexions conservées vers les bases cibles des exports
+        close_all_pools()
         
         # Accepter l'événement de fermeture
         event.accept()
@@ -1011,20 +1362,119 @@ class MainWindow(QMainWindow):
         else:
             self.status_bar.showMessage("Aucun enregistrement inséré")
             QMessageBox.warning(self, "Information", "Aucun enregistrement n'a pu être inséré dans la base de données.")
+
+    def _update_task_status(self):
+        """Affiche l'activité du planificateur dans la barre d'état"""
+        self.task_status_label.setText(self.scheduler.summary())
+
+    def _show_tasks(self):
+        """Affiche les tâches en cours, en attente et récentes, et permet d'en annuler"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Tâches en arrière-plan")
+        dialog.resize(500, 300)
+        layout = QVBoxLayout(dialog)
+        
+        task_list = QListWidget()
+        layout.addWidget(task_list)
+        
+        def refresh():
+            task_list.clear()
+            for task in self.scheduler.tasks(include_finished=True):
+                item = QListWidgetItem(task.describe())
+                item.setData(Qt.UserRole, task)
+                task_list.addItem(item)
+        
+        def cancel_selected():
+            item = task_list.currentItem()
+            if item is not None:
+                item.data(Qt.UserRole).cancel()
+                refresh()
+        
+        def update_cancel_button():
+            # Une tâche en cours sans moyen d'interruption (export, enregistrement...) va à son terme
+            item = task_list.currentItem()
+            cancel_button.setEnabled(item is not None and item.data(Qt.UserRole).cancellable)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        cancel_button = buttons.addButton("Annuler la tâche", QDialogButtonBox.ActionRole)
+        cancel_button.setEnabled(False)
+        cancel_button.clicked.connect(cancel_selected)
+        task_list.currentItemChanged.connect(lambda current, previous: update_cancel_button())
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
         
-        # Retirer le worker de la liste des workers actifs
-        sender = self.sender()
-        if sender in self.active_workers:
-            self.active_workers.remove(sender)
+        refresh()
+        self.scheduler.tasks_changed.connect(refresh)
+        try:
+            dialog.exec_()
+        finally:
+            self.scheduler.tasks_changed.disconnect(refresh)
+
+    def _target_resource(self, kind, config):
+        """Ressource « écriture » d'une base cible d'export (un seul export à la fois par base)"""
+        return f"{kind}://{config.get('host')}:{config.get('port')}/{config.get('database')}"
 
+    def _db_export_resources(self, kind, config):
+        """Ressources d'un export vers une base: la cible, et la base source qui reçoit
+        la séquence exportée (voir DBExporter._save_change_seq)"""
+        if self.current_db_path:
+            return (self._target_resource(kind, config), database_resource(self.current_db_path))
+        return (self._target_resource(kind, config),)
+
+    def _find_duplicates(self):
+        """Lance la détection des doublons sur la base courante"""
+        if not self._flush_edits():
+            return
+        # La détection s'exécute sur le fichier (connexions séparées, pool de processus)
+        if not self.current_db_path:
+            QMessageBox.warning(self, "Erreur", "Veuillez d'abord charger ou enregistrer une base de données.")
+            return
+        
+        self.status_bar.showMessage("Détection des doublons en cours...")
+        self.progress_bar.setVisible(True)
+        
+        task = Task(duplicate_finder.DuplicateFinder(self.current_db_path).find_duplicates,
+                    name="Détection des doublons", priority=PRIORITY_IMPORT,
+                    resources=(database_resource(self.current_db_path),))
+        task.finished.connect(self._duplicates_found)
+        task.error.connect(self._handle_error)
+        task.status_changed.connect(self._task_status_changed)
+        self.scheduler.start(task)
+    
+    def _duplicates_found(self, stats):
+        """Gestionnaire appelé après la détection des doublons"""
+        self.progress_bar.setVisible(False)
+        
+        clusters = stats['exact_clusters'] + stats['fuzzy_clusters']
+        self.status_bar.showMessage(f"{clusters} groupes de doublons détectés ({stats['tracks']} morceaux)")
+        
+        if clusters == 0:
+            QMessageBox.information(self, "Doublons", "Aucun doublon détecté.")
+            return
+        
+        QMessageBox.information(
+            self,
+            "Doublons",
+            f"{stats['exact_clusters']} groupes de doublons exacts (CRC, taille, durée) et "
+            f"{stats['fuzzy_clusters']} groupes approximatifs (titre et artiste) détectés "
+            f"en {stats['elapsed']:.1f} s."
+        )
+        
+        # Afficher les doublons via le preset correspondant
+        self._ensure_sql_tab()
+        self.sql_query.setText(self.sql_presets_by_category["Doublons"]["Doublons détectés"])
+        self._execute_sql()
+    
     def _export_to_mysql(self):
         """Exporte les données vers une base MySQL"""
-        if not self.current_data:
+        if not self._flush_edits():
+            return
+        if not self._has_data():
             QMessageBox.warning(self, "Erreur", "Aucune donnée à exporter. Veuillez d'abord charger un fichier CSV ou une base de données.")
             return
             
         # Vérification de la disponibilité du module MySQL
-        if not MYSQL_AVAILABLE:
+        if not db_exporter.MYSQL_AVAILABLE:
             QMessageBox.critical(self, "Erreur", "Le module MySQL n'est pas disponible. Veuillez installer mysql-connector-python.")
             return
         
@@ -1049,6 +1499,25 @@ class MainWindow(QMainWindow):
         layout.addRow("Base de données:", database_input)
         layout.addRow("Table:", table_input)
         
+        # Mode d'insertion en masse
+        bulk_mode_input = QComboBox()
+        bulk_mode_input.addItem("Lots multi-lignes (executemany)", "executemany")
+        bulk_mode_input.addItem("LOAD DATA LOCAL INFILE", "load_data")
+        bulk_mode_input.addItem("Ligne par ligne", "row")
+        
+        batch_size_input = QSpinBox()
+        batch_size_input.setRange(100, 1000000)
+        batch_size_input.setSingleStep(1000)
+        batch_size_input.setValue(1000)
+        
+        layout.addRow("Mode d'insertion:", bulk_mode_input)
+        layout.addRow("Taille des lots:", batch_size_input)
+        parallelism_input = self._add_parallelism_option(layout)
+        resume_checkbox = self._add_resume_option(layout, parallelism_input)
+        typed_schema_checkbox = self._add_schema_option(layout)
+        since_seq_input = self._add_since_seq_option(layout)
+        self._prefill_since_seq(since_seq_input, 'mysql', host_input, port_input, database_input, table_input)
+        
         # Boutons
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttons.accepted.connect(dialog.accept)
@@ -1063,28 +1532,38 @@ class MainWindow(QMainWindow):
                 'user': user_input.text(),
                 'password': password_input.text(),
                 'database': database_input.text(),
-                'table': table_input.text()
+                'table': table_input.text(),
+                'since_seq': since_seq_input.value() or None,
+                'bulk_mode': bulk_mode_input.currentData(),
+                'batch_size': batch_size_input.value(),
+                'parallelism': parallelism_input.value(),
+                'resume': resume_checkbox.isChecked(),
+                'schema': 'typed' if typed_schema_checkbox.isChecked() else 'text'
             }
             
             # Mise à jour de la barre de statut et affichage de la barre de progression
             self.status_bar.showMessage("Exportation vers MySQL en cours...")
             self.progress_bar.setVisible(True)
             
-            # Création du worker pour l'exportation
-            worker = Worker(lambda: self._do_mysql_export(config))
-            worker.finished.connect(lambda count: self._export_completed("MySQL", count))
-            worker.error.connect(self._handle_error)
-            worker.start()
-            self.active_workers.append(worker)
+            # Création de la tâche d'exportation
+            task = Task(lambda: self._do_mysql_export(config),
+                        name="Export vers MySQL", priority=PRIORITY_EXPORT,
+                        resources=self._db_export_resources('mysql', config))
+            task.finished.connect(lambda result: self._export_completed("MySQL", *result))
+            task.error.connect(self._handle_error)
+            task.status_changed.connect(self._task_status_changed)
+            self.scheduler.start(task)
     
     def _export_to_postgres(self):
         """Exporte les données vers une base PostgreSQL"""
-        if not self.current_data:
+        if not self._flush_edits():
+            return
+        if not self._has_data():
             QMessageBox.warning(self, "Erreur", "Aucune donnée à exporter. Veuillez d'abord charger un fichier CSV ou une base de données.")
             return
             
         # Vérification de la disponibilité du module PostgreSQL
-        if not POSTGRES_AVAILABLE:
+        if not db_exporter.POSTGRES_AVAILABLE:
             QMessageBox.critical(self, "Erreur", "Le module PostgreSQL n'est pas disponible. Veuillez installer psycopg2-binary.")
             return
         
@@ -1109,6 +1588,28 @@ class MainWindow(QMainWindow):
         layout.addRow("Base de données:", database_input)
         layout.addRow("Table:", table_input)
         
+        # Mode d'insertion en masse
+        bulk_mode_input = QComboBox()
+        bulk_mode_input.addItem("COPY (flux CSV)", "copy")
+        bulk_mode_input.addItem("Lots multi-lignes (execute_values)", "executemany")
+        bulk_mode_input.addItem("Ligne par ligne", "row")
+        
+        batch_size_input = QSpinBox()
+        batch_size_input.setRange(100, 1000000)
+        batch_size_input.setSingleStep(10000)
+        batch_size_input.setValue(50000)
+        
+        upsert_checkbox = QCheckBox("Fusionner sur (relative_path, filename) (ON CONFLICT)")
+        
+        layout.addRow("Mode d'insertion:", bulk_mode_input)
+        layout.addRow("Taille des lots:", batch_size_input)
+        layout.addRow("", upsert_checkbox)
+        parallelism_input = self._add_parallelism_option(layout)
+        resume_checkbox = self._add_resume_option(layout, parallelism_input)
+        typed_schema_checkbox = self._add_schema_option(layout)
+        since_seq_input = self._add_since_seq_option(layout)
+        self._prefill_since_seq(since_seq_input, 'postgres', host_input, port_input, database_input, table_input)
+        
         # Boutons
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttons.accepted.connect(dialog.accept)
@@ -1123,67 +1624,94 @@ class MainWindow(QMainWindow):
                 'user': user_input.text(),
                 'password': password_input.text(),
                 'database': database_input.text(),
-                'table': table_input.text()
+                'table': table_input.text(),
+                'since_seq': since_seq_input.value() or None,
+                'bulk_mode': bulk_mode_input.currentData(),
+                'batch_size': batch_size_input.value(),
+                'upsert': upsert_checkbox.isChecked(),
+                'parallelism': parallelism_input.value(),
+                'resume': resume_checkbox.isChecked(),
+                'schema': 'typed' if typed_schema_checkbox.isChecked() else 'text'
             }
             
             # Mise à jour de la barre de statut et affichage de la barre de progression
             self.status_bar.showMessage("Exportation vers PostgreSQL en cours...")
             self.progress_bar.setVisible(True)
             
-            # Création du worker pour l'exportation
-            worker = Worker(lambda: self._do_postgres_export(config))
-            worker.finished.connect(lambda count: self._export_completed("PostgreSQL", count))
-            worker.error.connect(self._handle_error)
-            worker.start()
-            self.active_workers.append(worker)
+            # Création de la tâche d'exportation
+            task = Task(lambda: self._do_postgres_export(config),
+                        name="Export vers PostgreSQL", priority=PRIORITY_EXPORT,
+                        resources=self._db_export_resources('postgres', config))
+            task.finished.connect(lambda result: self._export_completed("PostgreSQL", *result))
+            task.error.connect(self._handle_error)
+            task.status_changed.connect(self._task_status_changed)
+            self.scheduler.start(task)
     
     def _do_mysql_export(self, config):
-        """Effectue l'exportation vers MySQL dans un thread séparé"""
+        """Effectue l'exportation vers MySQL dans un thread séparé
+
+        Returns:
+            tuple: (nombre d'enregistrements exportés, séquence du journal couverte ou None)
+        """
         try:
-            exporter = DBExporter()
+            exporter = db_exporter.DBExporter()
             
             # Si nous avons un chemin de base de données SQLite, l'utiliser pour l'export
             if self.current_db_path:
-                return exporter.export_from_sqlite(self.current_db_path, 'mysql', config)
+                count = exporter.export_from_sqlite(self.current_db_path, 'mysql', config, since_seq=config.get('since_seq'))
+                return count, exporter.last_change_seq
             else:
                 # Sinon, utiliser les données en mémoire
-                return exporter.export_to_mysql(self.current_data, config)
+                return exporter.export_to_mysql(self.current_data, config), None
         except Exception as e:
             raise Exception(f"Erreur lors de l'exportation vers MySQL: {str(e)}")
     
     def _do_postgres_export(self, config):
-        """Effectue l'exportation vers PostgreSQL dans un thread séparé"""
+        """Effectue l'exportation vers PostgreSQL dans un thread séparé
+
+        Returns:
+            tuple: (nombre d'enregistrements exportés, séquence du journal couverte ou None)
+        """
         try:
-            exporter = DBExporter()
+            exporter = db_exporter.DBExporter()
             
             # Si nous avons un chemin de base de données SQLite, l'utiliser pour l'export
             if self.current_db_path:
-                return exporter.export_from_sqlite(self.current_db_path, 'postgres', config)
+                count = exporter.export_from_sqlite(self.current_db_path, 'postgres', config, since_seq=config.get('since_seq'))
+                return count, exporter.last_change_seq
             else:
                 # Sinon, utiliser les données en mémoire
-                return exporter.export_to_postgres(self.current_data, config)
+                return exporter.export_to_postgres(self.current_data, config), None
         except Exception as e:
             raise Exception(f"Erreur lors de l'exportation vers PostgreSQL: {str(e)}")
     
-    def _export_completed(self, export_type, count):
-        """Gestionnaire appelé après la fin de l'exportation"""
+    def _export_completed(self, export_type, count, last_seq=None):
+        """Gestionnaire appelé après la fin de l'exportation
+
+        Args:
+            export_type (str): Cible affichée
+            count (int): Nombre d'enregistrements exportés
+            last_seq (int, optional): Séquence du journal couverte par cet export
+        """
         self.progress_bar.setVisible(False)
         
+        # Séquence à reprendre lors du prochain export incrémental
+        seq_info = ""
+        if last_seq is not None:
+            seq_info = f" Dernière séquence exportée: {last_seq}."
+        
         if count > 0:
-            self.status_bar.showMessage(f"{count} enregistrements exportés vers {export_type}")
-            QMessageBox.information(self, "Exportation réussie", f"{count} enregistrements ont été exportés avec succès vers {export_type}.")
+            self.status_bar.showMessage(f"{count} enregistrements exportés vers {export_type}.{seq_info}")
+            QMessageBox.information(self, "Exportation réussie", f"{count} enregistrements ont été exportés avec succès vers {export_type}.{seq_info}")
         else:
             self.status_bar.showMessage(f"Aucun enregistrement exporté vers {export_type}")
             QMessageBox.warning(self, "Information", f"Aucun enregistrement n'a pu être exporté vers {export_type}.")
-        
-        # Retirer le worker de la liste des workers actifs
-        sender = self.sender()
-        if sender in self.active_workers:
-            self.active_workers.remove(sender)
 
     def _export_to_csv(self):
         """Exporte les données vers un fichier CSV"""
-        if not self.current_data:
+        if not self._flush_edits():
+            return
+        if not self._has_data():
             QMessageBox.warning(self, "Erreur", "Aucune donnée à exporter. Veuillez d'abord charger un fichier CSV ou une base de données.")
             return
         
@@ -1210,6 +1738,8 @@ class MainWindow(QMainWindow):
         layout.addRow("Séparateur:", delimiter_input)
         layout.addRow("Encodage:", encoding_input)
         layout.addRow("Inclure les en-têtes:", include_headers_input)
+        compression_input = self._add_compression_option(layout)
+        since_seq_input = self._add_since_seq_option(layout)
         
         # Boutons
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
@@ -1223,35 +1753,39 @@ class MainWindow(QMainWindow):
                 self,
                 "Enregistrer le fichier CSV",
                 "",
-                "Fichiers CSV (*.csv);;Tous les fichiers (*)"
+                "Fichiers CSV (*.csv *.csv.gz *.csv.bz2 *.csv.xz *.csv.zst);;Tous les fichiers (*)"
             )
             
             if file_path:
-                # Si l'extension n'est pas spécifiée, ajouter .csv
-                if not file_path.endswith('.csv'):
-                    file_path += '.csv'
+                # Si l'extension n'est pas spécifiée, ajouter .csv (et celle de la compression)
+                file_path = output_path(file_path, '.csv', compression_input.currentData())
                 
                 # Récupération des valeurs de configuration
                 config = {
                     'delimiter': delimiter_input.currentData(),
                     'encoding': encoding_input.currentData(),
-                    'include_headers': include_headers_input.isChecked()
+                    'include_headers': include_headers_input.isChecked(),
+                    'compression': compression_input.currentData() or 'none',
+                    'since_seq': since_seq_input.value() or None
                 }
                 
                 # Mise à jour de la barre de statut et affichage de la barre de progression
                 self.status_bar.showMessage("Exportation vers CSV en cours...")
                 self.progress_bar.setVisible(True)
                 
-                # Création du worker pour l'exportation
-                worker = Worker(lambda: self._do_csv_export(file_path, config))
-                worker.finished.connect(lambda count: self._export_completed("CSV", count))
-                worker.error.connect(self._handle_error)
-                worker.start()
-                self.active_workers.append(worker)
+                # Création de la tâche d'exportation
+                task = Task(lambda: self._do_csv_export(file_path, config),
+                            name="Export CSV", priority=PRIORITY_EXPORT, resources=(FILE_EXPORT_RESOURCE,))
+                task.finished.connect(lambda result: self._export_completed("CSV", *result))
+                task.error.connect(self._handle_error)
+                task.status_changed.connect(self._task_status_changed)
+                self.scheduler.start(task)
     
     def _export_to_json(self):
         """Exporte les données vers un fichier JSON"""
-        if not self.current_data:
+        if not self._flush_edits():
+            return
+        if not self._has_data():
             QMessageBox.warning(self, "Erreur", "Aucune donnée à exporter. Veuillez d'abord charger un fichier CSV ou une base de données.")
             return
         
@@ -1272,10 +1806,13 @@ class MainWindow(QMainWindow):
         format_input = QComboBox()
         format_input.addItem("Tableau JSON", True)
         format_input.addItem("Objet JSON avec IDs", False)
+        format_input.addItem("JSON Lines (un enregistrement par ligne)", 'jsonl')
         
         layout.addRow("Encodage:", encoding_input)
         layout.addRow("Indentation:", indent_input)
         layout.addRow("Format:", format_input)
+        compression_input = self._add_compression_option(layout)
+        since_seq_input = self._add_since_seq_option(layout)
         
         # Boutons
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
@@ -1289,35 +1826,40 @@ class MainWindow(QMainWindow):
                 self,
                 "Enregistrer le fichier JSON",
                 "",
-                "Fichiers JSON (*.json);;Tous les fichiers (*)"
+                "Fichiers JSON (*.json *.jsonl *.gz *.bz2 *.xz *.zst);;Tous les fichiers (*)"
             )
             
             if file_path:
-                # Si l'extension n'est pas spécifiée, ajouter .json
-                if not file_path.endswith('.json'):
-                    file_path += '.json'
+                # Si l'extension n'est pas spécifiée, ajouter .json (.jsonl pour JSON Lines)
+                extension = '.jsonl' if format_input.currentData() == 'jsonl' else '.json'
+                file_path = output_path(file_path, extension, compression_input.currentData())
                 
                 # Récupération des valeurs de configuration
                 config = {
                     'encoding': encoding_input.currentData(),
+                    'compression': compression_input.currentData() or 'none',
                     'indent': indent_input.value(),
-                    'as_array': format_input.currentData()
+                    'as_array': format_input.currentData(),
+                    'since_seq': since_seq_input.value() or None
                 }
                 
                 # Mise à jour de la barre de statut et affichage de la barre de progression
                 self.status_bar.showMessage("Exportation vers JSON en cours...")
                 self.progress_bar.setVisible(True)
                 
-                # Création du worker pour l'exportation
-                worker = Worker(lambda: self._do_json_export(file_path, config))
-                worker.finished.connect(lambda count: self._export_completed("JSON", count))
-                worker.error.connect(self._handle_error)
-                worker.start()
-                self.active_workers.append(worker)
+                # Création de la tâche d'exportation
+                task = Task(lambda: self._do_json_export(file_path, config),
+                            name="Export JSON", priority=PRIORITY_EXPORT, resources=(FILE_EXPORT_RESOURCE,))
+                task.finished.connect(lambda result: self._export_completed("JSON", *result))
+                task.error.connect(self._handle_error)
+                task.status_changed.connect(self._task_status_changed)
+                self.scheduler.start(task)
     
     def _export_to_xml(self):
         """Exporte les données vers un fichier XML"""
-        if not self.current_data:
+        if not self._flush_edits():
+            return
+        if not self._has_data():
             QMessageBox.warning(self, "Erreur", "Aucune donnée à exporter. Veuillez d'abord charger un fichier CSV ou une base de données.")
             return
         
@@ -1341,6 +1883,8 @@ class MainWindow(QMainWindow):
         layout.addRow("Nom de l'élément racine:", root_element_input)
         layout.addRow("Nom de l'élément pour chaque piste:", item_element_input)
         layout.addRow("Formatage pour lisibilité:", pretty_print_input)
+        compression_input = self._add_compression_option(layout)
+        since_seq_input = self._add_since_seq_option(layout)
         
         # Boutons
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
@@ -1354,90 +1898,511 @@ class MainWindow(QMainWindow):
                 self,
                 "Enregistrer le fichier XML",
                 "",
-                "Fichiers XML (*.xml);;Tous les fichiers (*)"
+                "Fichiers XML (*.xml *.xml.gz *.xml.bz2 *.xml.xz *.xml.zst);;Tous les fichiers (*)"
             )
             
             if file_path:
-                # Si l'extension n'est pas spécifiée, ajouter .xml
-                if not file_path.endswith('.xml'):
-                    file_path += '.xml'
+                # Si l'extension n'est pas spécifiée, ajouter .xml (et celle de la compression)
+                file_path = output_path(file_path, '.xml', compression_input.currentData())
                 
                 # Récupération des valeurs de configuration
                 config = {
                     'encoding': encoding_input.currentData(),
+                    'compression': compression_input.currentData() or 'none',
                     'root_element': root_element_input.text(),
                     'item_element': item_element_input.text(),
-                    'pretty_print': pretty_print_input.isChecked()
+                    'pretty_print': pretty_print_input.isChecked(),
+                    'since_seq': since_seq_input.value() or None
                 }
                 
                 # Mise à jour de la barre de statut et affichage de la barre de progression
                 self.status_bar.showMessage("Exportation vers XML en cours...")
                 self.progress_bar.setVisible(True)
                 
-                # Création du worker pour l'exportation
-                worker = Worker(lambda: self._do_xml_export(file_path, config))
-                worker.finished.connect(lambda count: self._export_completed("XML", count))
-                worker.error.connect(self._handle_error)
-                worker.start()
-                self.active_workers.append(worker)
+                # Création de la tâche d'exportation
+                task = Task(lambda: self._do_xml_export(file_path, config),
+                            name="Export XML", priority=PRIORITY_EXPORT, resources=(FILE_EXPORT_RESOURCE,))
+                task.finished.connect(lambda result: self._export_completed("XML", *result))
+                task.error.connect(self._handle_error)
+                task.status_changed.connect(self._task_status_changed)
+                self.scheduler.start(task)
+    
+    def _export_to_columnar(self, export_format):
+        """Exporte les données vers un fichier Parquet ou Arrow/Feather"""
+        if not self._flush_edits():
+            return
+        if not self._has_data():
+            QMessageBox.warning(self, "Erreur", "Aucune donnée à exporter. Veuillez d'abord charger un fichier CSV ou une base de données.")
+            return
+        
+        if not format_exporter.PYARROW_AVAILABLE:
+            QMessageBox.critical(self, "Erreur", "Le module pyarrow n'est pas installé. Veuillez l'installer avec 'pip install pyarrow'.")
+            return
+        
+        label = "Parquet" if export_format == 'parquet' else "Arrow/Feather"
+        extension = '.parquet' if export_format == 'parquet' else '.arrow'
+        
+        # Boîte de dialogue de configuration
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Configuration de l'export {label}")
+        layout = QFormLayout(dialog)
+        
+        # Champs de configuration
+        compression_input = QComboBox()
+        compression_input.addItem("Zstandard", "zstd")
+        if export_format == 'parquet':
+            compression_input.addItem("Snappy", "snappy")
+            compression_input.addItem("Gzip", "gzip")
+        else:
+            compression_input.addItem("LZ4", "lz4")
+        compression_input.addItem("Aucune", "none")
+        
+        batch_size_input = QSpinBox()
+        batch_size_input.setRange(1000, 1000000)
+        batch_size_input.setSingleStep(10000)
+        batch_size_input.setValue(100000 if export_format == 'parquet' else 65536)
+        
+        layout.addRow("Compression:", compression_input)
+        layout.addRow("Lignes par groupe:" if export_format == 'parquet' else "Lignes par lot:", batch_size_input)
+        since_seq_input = self._add_since_seq_option(layout)
+        
+        # Boutons
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addRow(buttons)
+        
+        if dialog.exec_() == QDialog.Accepted:
+            # Demander le chemin du fichier de destination
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                f"Enregistrer le fichier {label}",
+                "",
+                f"Fichiers {label} (*{extension});;Tous les fichiers (*)"
+            )
+            
+            if file_path:
+                # Si l'extension n'est pas spécifiée, l'ajouter
+                if not file_path.endswith(extension) and not file_path.endswith('.feather'):
+                    file_path += extension
+                
+                # Récupération des valeurs de configuration
+                config = {
+                    'compression': compression_input.currentData(),
+                    'batch_size': batch_size_input.value(),
+                    'since_seq': since_seq_input.value() or None
+                }
+                
+                # Mise à jour de la barre de statut et affichage de la barre de progression
+                self.status_bar.showMessage(f"Exportation vers {label} en cours...")
+                self.progress_bar.setVisible(True)
+                
+                # Création de la tâche d'exportation
+                task = Task(lambda: self._do_columnar_export(export_format, file_path, config),
+                            name=f"Export {label}", priority=PRIORITY_EXPORT, resources=(FILE_EXPORT_RESOURCE,))
+                task.finished.connect(lambda result: self._export_completed(label, *result))
+                task.error.connect(self._handle_error)
+                task.status_changed.connect(self._task_status_changed)
+                self.scheduler.start(task)
+    
+    def _export_split(self):
+        """Exporte la bibliothèque en plusieurs fichiers écrits en parallèle, avec un manifeste"""
+        if not self._flush_edits():
+            return
+        if not self.current_db_path:
+            QMessageBox.warning(self, "Erreur", "L'export fractionné lit directement la base de données. Veuillez d'abord ouvrir ou enregistrer une base de données.")
+            return
+        
+        # Boîte de dialogue de configuration
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Configuration de l'export fractionné")
+        layout = QFormLayout(dialog)
+        
+        # Champs de configuration
+        format_input = QComboBox()
+        format_input.addItem("CSV", 'csv')
+        format_input.addItem("JSON", 'json')
+        format_input.addItem("JSON Lines", 'jsonl')
+        format_input.addItem("XML", 'xml')
+        if format_exporter.PYARROW_AVAILABLE:
+            format_input.addItem("Parquet", 'parquet')
+            format_input.addItem("Arrow/Feather", 'feather')
+        
+        partition_input = QComboBox()
+        partition_input.addItem("Par nombre de lignes", None)
+        partition_input.addItem("Par genre", 'genre')
+        partition_input.addItem("Par initiale de l'artiste", 'artist_initial')
+        partition_input.addItem("Par année", 'year')
+        
+        rows_per_part_input = QSpinBox()
+        rows_per_part_input.setRange(1000, 10000000)
+        rows_per_part_input.setSingleStep(10000)
+        rows_per_part_input.setValue(100000)
+        partition_input.currentIndexChanged.connect(
+            lambda: rows_per_part_input.setEnabled(partition_input.currentData() is None))
+        
+        workers_input = QSpinBox()
+        workers_input.setRange(1, 64)
+        workers_input.setValue(os.cpu_count() or 1)
+        workers_input.setToolTip("Nombre de processus écrivant des fichiers en même temps")
+        
+        base_name_input = QLineEdit("mp3tag")
+        
+        layout.addRow("Format:", format_input)
+        layout.addRow("Découpage:", partition_input)
+        layout.addRow("Lignes par fichier:", rows_per_part_input)
+        layout.addRow("Processus:", workers_input)
+        layout.addRow("Préfixe des fichiers:", base_name_input)
+        compression_input = self._add_compression_option(layout)
+        
+        # Boutons
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addRow(buttons)
+        
+        if dialog.exec_() == QDialog.Accepted:
+            # Demander le répertoire de destination
+            output_dir = QFileDialog.getExistingDirectory(self, "Répertoire de destination des fichiers")
+            
+            if output_dir:
+                export_format = format_input.currentData()
+                options = {}
+                if export_format not in ('parquet', 'feather'):
+                    options['compression'] = compression_input.currentData() or 'none'
+                
+                # Mise à jour de la barre de statut et affichage de la barre de progression
+                self.status_bar.showMessage("Exportation fractionnée en cours...")
+                self.progress_bar.setVisible(True)
+                
+                # Création de la tâche d'exportation
+                # Paramètres lus dès maintenant: la tâche peut attendre son tour dans la file
+                # Le découpage par clé indexe la base source: elle est réservée comme pour une écriture
+                task = Task(format_exporter.FormatExporter().export_split,
+                            self.current_db_path, export_format, output_dir,
+                            base_name=base_name_input.text() or 'mp3tag',
+                            rows_per_part=rows_per_part_input.value(),
+                            partition_by=partition_input.currentData(),
+                            workers=workers_input.value(),
+                            name="Export fractionné", priority=PRIORITY_EXPORT,
+                            resources=(FILE_EXPORT_RESOURCE, database_resource(self.current_db_path)),
+                            **options)
+                task.finished.connect(lambda count: self._export_completed(f"{output_dir} (plusieurs fichiers)", count))
+                task.error.connect(self._handle_error)
+                task.status_changed.connect(self._task_status_changed)
+                self.scheduler.start(task)
+    
+    def _add_since_seq_option(self, layout):
+        """Ajoute l'option d'export incrémental (journal des modifications) à un formulaire"""
+        since_seq_input = QSpinBox()
+        since_seq_input.setRange(0, 2147483647)
+        since_seq_input.setSpecialValueText("Export complet")
+        # Le journal des modifications n'existe que dans une base enregistrée
+        since_seq_input.setEnabled(bool(self.current_db_path))
+        since_seq_input.setToolTip("N'exporter que les modifications postérieures à ce numéro de séquence (0 = export complet)")
+        layout.addRow("Modifications depuis la séquence:", since_seq_input)
+        return since_seq_input
+
+    def _prefill_since_seq(self, since_seq_input, kind, host_input, port_input, database_input, table_input):
+        """Propose la séquence atteinte par le dernier export réussi vers la cible saisie
+
+        La séquence est enregistrée dans la base chargée (table export_sync) à chaque
+        export vers une base externe; elle est relue quand la cible saisie change.
+        """
+        if not self.current_db_path:
+            return
+        
+        def prefill():
+            target = db_exporter.export_target_key(kind, {
+                'host': host_input.text(), 'port': port_input.text(),
+                'database': database_input.text(), 'table': table_input.text()
+            })
+            db = DatabaseManager(self.current_db_path)
+            if not db.connect():
+                return
+            try:
+                seq = db.get_export_seq(target)
+            finally:
+                db.close()
+            since_seq_input.setValue(seq or 0)
+            if seq is not None:
+                since_seq_input.setToolTip(f"Dernier export réussi vers cette cible: séquence {seq} "
+                                           "(0 = export complet)")
+        
+        for field in (host_input, port_input, database_input, table_input):
+            field.editingFinished.connect(prefill)
+        prefill()
+
+    def _add_compression_option(self, layout):
+        """Ajoute le choix de la compression du fichier d'export à un formulaire"""
+        compression_input = QComboBox()
+        compression_input.addItem("Aucune", None)
+        compression_input.addItem("gzip (.gz)", 'gzip')
+        compression_input.addItem("bzip2 (.bz2)", 'bz2')
+        compression_input.addItem("xz (.xz)", 'xz')
+        if ZSTD_AVAILABLE:
+            compression_input.addItem("Zstandard (.zst)", 'zstd')
+        compression_input.setToolTip("Compression effectuée pendant l'écriture, sur un autre cœur que la sérialisation")
+        layout.addRow("Compression:", compression_input)
+        return compression_input
+
+    def _add_parallelism_option(self, layout):
+        """Ajoute le nombre de connexions simultanées (export partitionné) à un formulaire"""
+        parallelism_input = QSpinBox()
+        parallelism_input.setRange(1, 32)
+        parallelism_input.setValue(1)
+        # L'export partitionné lit les plages de rowid directement dans la base enregistrée
+        parallelism_input.setEnabled(bool(self.current_db_path))
+        parallelism_input.setToolTip("Nombre de connexions utilisées en parallèle, chacune exportant une plage de la table")
+        layout.addRow("Connexions parallèles:", parallelism_input)
+        return parallelism_input
+
+    def _add_resume_option(self, layout, parallelism_input):
+        """Ajoute l'option de reprise sur point de contrôle à un formulaire d'export
+        La reprise exporte sur une seule connexion: le nombre de connexions est alors désactivé
+        """
+        resume_checkbox = QCheckBox("Reprendre là où le dernier export s'est arrêté")
+        # La progression est suivie par rowid de la base enregistrée
+        resume_checkbox.setEnabled(bool(self.current_db_path))
+        resume_checkbox.toggled.connect(
+            lambda checked: parallelism_input.setEnabled(bool(self.current_db_path) and not checked))
+        resume_checkbox.setToolTip("Valide par lots, enregistre un point de reprise dans la cible "
+                                   "et fusionne sur (relative_path, filename) pour éviter les doublons")
+        layout.addRow("", resume_checkbox)
+        return resume_checkbox
+
+    def _add_schema_option(self, layout):
+        """Ajoute le choix du schéma (typé ou tout en TEXT) de la table cible à un formulaire"""
+        typed_schema_checkbox = QCheckBox("Types déduits des données (INT, VARCHAR...) et index après chargement")
+        typed_schema_checkbox.setChecked(True)
+        typed_schema_checkbox.setToolTip("Ne s'applique qu'à la création de la table; décoché, toutes les colonnes sont en TEXT")
+        layout.addRow("", typed_schema_checkbox)
+        return typed_schema_checkbox
+
+    def _get_export_data(self, config):
+        """Données à exporter vers un fichier: tout, ou les modifications depuis une séquence
+
+        Returns:
+            tuple: (enregistrements, séquence du journal atteinte ou None pour un export complet)
+        """
+        since_seq = config.get('since_seq')
+        if since_seq is None or not self.current_db_path:
+            return self.current_data, None
+        
+        db = DatabaseManager(self.current_db_path)
+        db.connect()
+        try:
+            # Lecture seule: la base n'est pas modifiée par un export vers un fichier
+            db.conn.execute("PRAGMA query_only = ON")
+            changes = db.get_changed_records(since_seq)
+        finally:
+            db.close()
+        
+        # Un fichier ne peut pas représenter les suppressions: elles sont seulement journalisées
+        if changes['deleted']:
+            self.logger.info(f"{len(changes['deleted'])} suppressions non représentées dans l'export fichier")
+        return changes['records'], changes['last_seq']
     
     def _do_csv_export(self, file_path, config):
         """Effectue l'exportation vers CSV dans un thread séparé"""
         try:
-            exporter = FormatExporter()
-            return exporter.export_to_csv(
-                self.current_data, 
-                file_path,
-                delimiter=config['delimiter'],
-                encoding=config['encoding'],
-                include_headers=config['include_headers']
-            )
+            exporter = format_exporter.FormatExporter()
+            options = {
+                'delimiter': config['delimiter'],
+                'encoding': config['encoding'],
+                'include_headers': config['include_headers'],
+                'compression': config['compression']
+            }
+            
+            # Export complet depuis la base enregistrée: lecture en flux sur un curseur
+            if self._exports_from_database(config):
+                return exporter.export_from_sqlite(self.current_db_path, 'csv', file_path, **options), None
+            
+            records, last_seq = self._get_export_data(config)
+            return exporter.export_to_csv(records, file_path, **options), last_seq
         except Exception as e:
             raise Exception(f"Erreur lors de l'exportation vers CSV: {str(e)}")
     
     def _do_json_export(self, file_path, config):
         """Effectue l'exportation vers JSON dans un thread séparé"""
         try:
-            exporter = FormatExporter()
-            return exporter.export_to_json(
-                self.current_data, 
-                file_path,
-                encoding=config['encoding'],
-                indent=config['indent'],
-                as_array=config['as_array']
-            )
+            exporter = format_exporter.FormatExporter()
+            if config['as_array'] == 'jsonl':
+                export_format = 'jsonl'
+                options = {'encoding': config['encoding'], 'compression': config['compression']}
+            else:
+                export_format = 'json'
+                options = {
+                    'encoding': config['encoding'],
+                    'indent': config['indent'],
+                    'as_array': config['as_array'],
+                    'compression': config['compression']
+                }
+            
+            # Export complet depuis la base enregistrée: lecture en flux sur un curseur
+            if self._exports_from_database(config):
+                return exporter.export_from_sqlite(self.current_db_path, export_format, file_path, **options), None
+            
+            export = getattr(exporter, f"export_to_{export_format}")
+            records, last_seq = self._get_export_data(config)
+            return export(records, file_path, **options), last_seq
         except Exception as e:
             raise Exception(f"Erreur lors de l'exportation vers JSON: {str(e)}")
     
     def _do_xml_export(self, file_path, config):
         """Effectue l'exportation vers XML dans un thread séparé"""
         try:
-            exporter = FormatExporter()
-            return exporter.export_to_xml(
-                self.current_data, 
-                file_path,
-                encoding=config['encoding'],
-                root_element=config['root_element'],
-                item_element=config['item_element'],
-                pretty_print=config['pretty_print']
-            )
+            exporter = format_exporter.FormatExporter()
+            options = {
+                'encoding': config['encoding'],
+                'root_element': config['root_element'],
+                'item_element': config['item_element'],
+                'pretty_print': config['pretty_print'],
+                'compression': config['compression']
+            }
+            
+            # Export complet depuis la base enregistrée: lecture en flux sur un curseur
+            if self._exports_from_database(config):
+                return exporter.export_from_sqlite(self.current_db_path, 'xml', file_path, **options), None
+            
+            records, last_seq = self._get_export_data(config)
+            return exporter.export_to_xml(records, file_path, **options), last_seq
         except Exception as e:
             raise Exception(f"Erreur lors de l'exportation vers XML: {str(e)}")
 
-    def _cell_changed(self, item):
-        """Gestionnaire appelé lorsque le contenu d'une cellule est modifié"""
-        # Récupérer les informations de la cellule modifiée
-        row = item.row()
-        column = item.column()
-        new_value = item.text()
-        
-        # Mettre à jour les données en mémoire
-        if self.current_data:
-            self.current_data[row][self.headers[column]] = new_value
+    def _do_columnar_export(self, export_format, file_path, config):
+        """Effectue l'exportation vers Parquet ou Arrow/Feather dans un thread séparé"""
+        try:
+            exporter = format_exporter.FormatExporter()
+            options = {'compression': config['compression']}
+            options['row_group_size' if export_format == 'parquet' else 'batch_size'] = config['batch_size']
+            
+            # Export complet depuis la base enregistrée: lecture en flux sur un curseur
+            if self._exports_from_database(config):
+                return exporter.export_from_sqlite(self.current_db_path, export_format, file_path, **options), None
+            
+            export = exporter.export_to_parquet if export_format == 'parquet' else exporter.export_to_feather
+            records, last_seq = self._get_export_data(config)
+            return export(records, file_path, **options), last_seq
+        except Exception as e:
+            raise Exception(f"Erreur lors de l'exportation vers {export_format}: {str(e)}")
+
+    def _cell_changed(self, row, column, new_value):
+        """Gestionnaire appelé lorsque le contenu d'une cellule est modifié
+        Le modèle a déjà enregistré la valeur (en mémoire ou dans la base affichée)
+        """
+        # Base chargée: écriture groupée après une courte pause
+        if isinstance(self.table_model, SQLiteTableModel):
+            self.edit_flush_timer.start()
         
         # Afficher un message de confirmation
         self.status_bar.showMessage(f"Cellule ({row}, {column}) modifiée en '{new_value}'")
 
+    def _build_sort_index(self, column, expression):
+        """Crée en tâche de fond l'index de tri d'une colonne triée régulièrement
+        La vue trie sans index jusqu'à sa création (tâche d'écriture dans la base affichée)
+        """
+        model = self.sender()
+        task = Task(create_sort_index, model.db_path, model.table, column, expression,
+                    name=f"Index de tri ({column})", priority=PRIORITY_IMPORT,
+                    resources=(database_resource(model.db_path),))
+        task.finished.connect(lambda indexed: self.status_bar.showMessage(f"Index de tri créé pour {indexed}"))
+        # Base en lecture seule: le tri continue sans index
+        task.error.connect(lambda error: self.logger.warning(f"Index de tri non créé pour {column}: {error}"))
+        self.scheduler.start(task)
+
+    def _flush_edits(self):
+        """Écrit dans la base les modifications de cellules en attente
+        Appelée par le minuteur, le menu Édition et avant toute opération qui lit le fichier de la base
+
+        Returns:
+            bool: False si l'écriture a échoué
+        """
+        self.edit_flush_timer.stop()
+        self._flush_replaced_models()
+        model = self.table_model
+        if not isinstance(model, SQLiteTableModel) or not model.pending_edits:
+            return True
+        resources = self._acquire_database(model)
+        if resources is None:
+            # Une tâche écrit dans la base: nouvel essai au prochain déclenchement du minuteur
+            self.edit_flush_timer.start()
+            self.status_bar.showMessage("Base de données occupée par une tâche: modifications en attente d'enregistrement")
+            return False
+        try:
+            count = model.flush_edits()
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'enregistrement des modifications: {str(e)}")
+            return False
+        finally:
+            self.scheduler.release(resources)
+        self.status_bar.showMessage(f"{count} modification(s) enregistrée(s) dans la base de données")
+        return True
+
+    def _flush_replaced_models(self):
+        """Écrit les modifications en attente des modèles remplacés puis ferme leur connexion
+        Un modèle dont la base est occupée par une tâche est gardé pour le prochain essai du minuteur
+        """
+        for model in list(self.replaced_models):
+            resources = self._acquire_database(model)
+            if resources is None:
+                self.edit_flush_timer.start()
+                continue
+            try:
+                model.flush_edits()
+            except sqlite3.Error as e:
+                QMessageBox.critical(self, "Erreur", f"Modifications de cellules non enregistrées dans {model.db_path}: {str(e)}")
+            finally:
+                self.scheduler.release(resources)
+            self.replaced_models.remove(model)
+            model.close()
+
+    def _acquire_database(self, model):
+        """Prend la ressource d'écriture de la base d'un modèle avant d'y écrire depuis l'interface
+        Les modifications de cellules passent ainsi après les tâches qui écrivent dans la même base
+
+        Args:
+            model (SQLiteTableModel): Modèle dont la base va être modifiée
+
+        Returns:
+            tuple: Ressources prises, à libérer avec scheduler.release(), ou None si la base est occupée
+        """
+        resources = (database_resource(model.db_path),)
+        return resources if self.scheduler.try_acquire(resources) else None
+
+    def _undo_edit(self):
+        """Annule la dernière modification de cellule de la base chargée"""
+        self._apply_journal_change(lambda model: model.undo(), "Modification annulée",
+                                   "Aucune modification à annuler", "l'annulation")
+
+    def _redo_edit(self):
+        """Rétablit la dernière modification de cellule annulée"""
+        self._apply_journal_change(lambda model: model.redo(), "Modification rétablie",
+                                   "Aucune modification à rétablir", "le rétablissement")
+
+    def _apply_journal_change(self, action, done_message, empty_message, operation):
+        """Applique une annulation ou un rétablissement du journal des modifications"""
+        self.edit_flush_timer.stop()
+        if not isinstance(self.table_model, SQLiteTableModel):
+            self.status_bar.showMessage(empty_message)
+            return
+        resources = self._acquire_database(self.table_model)
+        if resources is None:
+            self.status_bar.showMessage(f"Base de données occupée par une tâche: {operation} est impossible pour l'instant")
+            return
+        try:
+            change = action(self.table_model)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur pendant {operation} de la modification: {str(e)}")
+            return
+        finally:
+            self.scheduler.release(resources)
+        if change is None:
+            self.status_bar.showMessage(empty_message)
+        else:
+            rowid, column, value = change
+            self.status_bar.showMessage(f"{done_message}: {column} de la piste {rowid} = '{value}'")
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
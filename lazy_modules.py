@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module de chargement différé des dépendances optionnelles (pilotes de bases, pyarrow, zstandard)
+Auteur: Geoffroy Streit
+"""
+
+import importlib
+import importlib.util
+
+
+def module_available(name):
+    """Indique si un module est installé, sans l'importer
+
+    Pour un sous-module (ex: 'mysql.connector'), seul le paquet parent est importé.
+
+    Args:
+        name (str): Nom complet du module
+
+    Returns:
+        bool: True si le module peut être importé
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """Module importé au premier accès à l'un de ses attributs
+
+    Remplace « import x » en tête de module pour les dépendances lourdes qui ne
+    servent qu'à certaines actions: le démarrage de l'application n'en paie pas le coût.
+    Un module absent lève ImportError au premier accès.
+    """
+
+    def __init__(self, name):
+        """Initialisation
+
+        Args:
+            name (str): Nom complet du module (ex: 'pyarrow.parquet')
+        """
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        # Appelé uniquement pour les attributs absents de l'instance, c'est-à-dire ceux du module
+        module = self._module
+        if module is None:
+            # L'import est protégé par le verrou d'import de Python (accès concurrents possibles)
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
+
+    def __repr__(self):
+        state = "importé" if self._module is not None else "non importé"
+        return f"<LazyModule '{self._name}' ({state})>"
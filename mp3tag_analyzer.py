@@ -7,18 +7,46 @@ Date: 23/03/2025
 Description: Programme d'analyse de fichiers CSV générés par MP3tag et stockage en base SQLite
 """
 
+import startup_profile  # En premier: origine des mesures du démarrage
+import multiprocessing
 import sys
 import os
-from PyQt5.QtWidgets import QApplication
-from gui import MainWindow
+
+# Option affichant la durée des étapes du démarrage (sortie d'erreur et journal)
+STARTUP_PROFILE_OPTION = "--startup-profile"
+
+def _finish_startup_profile():
+    """Termine la mesure du démarrage et écrit le rapport"""
+    startup_profile.mark("Première itération de la boucle d'événements")
+    startup_profile.finish()
 
 def main():
     """Fonction principale du programme"""
-    app = QApplication(sys.argv)
+    argv = list(sys.argv)
+    if STARTUP_PROFILE_OPTION in argv:
+        argv.remove(STARTUP_PROFILE_OPTION)
+        startup_profile.enable()
+    
+    # Imports de l'interface ici et non en tête: les processus d'export fractionné,
+    # qui réimportent ce script sous Windows, ne chargent pas Qt
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    startup_profile.mark("Import de PyQt5")
+    from gui import MainWindow
+    startup_profile.mark("Import de l'interface")
+    
+    app = QApplication(argv)
     app.setApplicationName("MP3Tag Analyzer")
+    startup_profile.mark("Création de l'application Qt")
     window = MainWindow()
     window.show()
+    startup_profile.mark("Affichage de la fenêtre")
+    if startup_profile.is_enabled():
+        # Premier tour de la boucle d'événements: la fenêtre est dessinée et répond
+        QTimer.singleShot(0, _finish_startup_profile)
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    # Export fractionné: les processus du groupe relancent ce script sous Windows (exécutable figé)
+    multiprocessing.freeze_support()
     main()
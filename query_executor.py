@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module d'exécution de requêtes SQL annulables et limitées dans le temps
+Auteur: Geoffroy Streit
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+
+
+class QueryCancelledError(Exception):
+    """Levée lorsqu'une requête est annulée par l'utilisateur"""
+
+
+class QueryTimeoutError(QueryCancelledError):
+    """Levée lorsqu'une requête dépasse le délai autorisé"""
+
+
+class QueryExecutor:
+    """Exécute une requête SQLite avec délai maximal, limite de lignes et annulation
+
+    L'annulation peut être demandée depuis n'importe quel thread via cancel(),
+    qui interrompt la requête en cours avec Connection.interrupt().
+    """
+
+    # Nombre d'instructions de la VM SQLite entre deux appels du gestionnaire de progression
+    PROGRESS_STEP = 1000
+    # Taille des lots lus avec fetchmany
+    FETCH_BATCH_SIZE = 1000
+
+    def __init__(self, timeout=None, max_rows=None):
+        """Initialisation de l'exécuteur
+
+        Args:
+            timeout (float, optional): Délai maximal en secondes (None ou 0 = illimité)
+            max_rows (int, optional): Nombre maximal de lignes récupérées (None ou 0 = illimité)
+        """
+        self.timeout = timeout or None
+        self.max_rows = max_rows or None
+        self.logger = logging.getLogger('mp3tag_analyzer.query_executor')
+
+        self._conn = None
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self._deadline = None
+        self._progress_calls = 0
+        self._children = []
+
+        # Statistiques de la dernière exécution
+        self.timed_out = False
+        self.truncated = False
+        self.execute_time = 0.0
+        self.fetch_time = 0.0
+
+    @property
+    def cancelled(self):
+        """bool: True si l'annulation a été demandée"""
+        return self._cancel_event.is_set()
+
+    @property
+    def vm_steps(self):
+        """int: Nombre approximatif d'instructions VM exécutées (résolution PROGRESS_STEP)"""
+        return self._progress_calls * self.PROGRESS_STEP
+
+    def cancel(self):
+        """Annule la requête en cours (appelable depuis n'importe quel thread)"""
+        self._cancel_event.set()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.interrupt()
+            children = list(self._children)
+        for child in children:
+            child.cancel()
+
+    def spawn(self):
+        """Crée un exécuteur enfant avec les mêmes limites, annulé avec celui-ci
+
+        Utile pour exécuter une même requête sur plusieurs connexions en parallèle.
+
+        Returns:
+            QueryExecutor: Exécuteur enfant
+        """
+        child = QueryExecutor(self.timeout, self.max_rows)
+        with self._lock:
+            self._children.append(child)
+        if self.cancelled:
+            child.cancel()
+        return child
+
+    def _progress_handler(self):
+        """Gestionnaire de progression SQLite: une valeur non nulle interrompt la requête"""
+        self._progress_calls += 1
+        if self._cancel_event.is_set():
+            return 1
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            self.timed_out = True
+            return 1
+        return 0
+
+    def _check_interrupted(self):
+        """Lève l'exception adaptée si la requête a été annulée ou a expiré"""
+        if self.timed_out:
+            raise QueryTimeoutError(f"La requête a dépassé le délai de {self.timeout} s et a été interrompue")
+        if self._cancel_event.is_set():
+            raise QueryCancelledError("La requête a été annulée")
+
+    def execute(self, conn, query):
+        """Exécute une requête et récupère ses résultats dans les limites configurées
+
+        Args:
+            conn (sqlite3.Connection): Connexion SQLite (utilisée depuis le thread appelant)
+            query (str): Requête SQL à exécuter
+
+        Returns:
+            tuple: (colonnes, résultats sous forme de dictionnaires)
+
+        Raises:
+            QueryCancelledError: Si la requête a été annulée
+            QueryTimeoutError: Si la requête a dépassé le délai
+            sqlite3.Error: Pour toute autre erreur SQLite
+        """
+        self.timed_out = False
+        self.truncated = False
+        self.execute_time = 0.0
+        self.fetch_time = 0.0
+        self._progress_calls = 0
+        self._deadline = time.monotonic() + self.timeout if self.timeout else None
+
+        with self._lock:
+            self._conn = conn
+        # Annulation demandée avant même le démarrage
+        if self._cancel_event.is_set():
+            with self._lock:
+                self._conn = None
+            self._check_interrupted()
+
+        conn.set_progress_handler(self._progress_handler, self.PROGRESS_STEP)
+        cursor = conn.cursor()
+        results = []
+        try:
+            start = time.perf_counter()
+            cursor.execute(query)
+            self.execute_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            columns = [column[0] for column in cursor.description] if cursor.description else []
+            if columns:
+                while True:
+                    batch_size = self.FETCH_BATCH_SIZE
+                    if self.max_rows:
+                        batch_size = min(batch_size, self.max_rows - len(results))
+                        if batch_size <= 0:
+                            # Limite atteinte: vérifier s'il restait des lignes
+                            self.truncated = cursor.fetchone() is not None
+                            break
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    results.extend(dict(zip(columns, row)) for row in rows)
+                    self._check_interrupted()
+            self.fetch_time = time.perf_counter() - start
+
+            if self.truncated:
+                self.logger.warning(f"Résultats tronqués à {self.max_rows} lignes")
+            return columns, results
+        except sqlite3.OperationalError as e:
+            if self.timed_out or self._cancel_event.is_set():
+                # Nettoyage des résultats partiels et annulation des éventuelles modifications
+                results.clear()
+                conn.rollback()
+                self.logger.info(f"Requête interrompue: {e}")
+                self._check_interrupted()
+            raise
+        except QueryCancelledError:
+            results.clear()
+            conn.rollback()
+            self.logger.info("Requête interrompue pendant la récupération des résultats")
+            raise
+        finally:
+            cursor.close()
+            conn.set_progress_handler(None, 0)
+            with self._lock:
+                self._conn = None
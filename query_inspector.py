@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module d'inspection des requêtes SQL (plan d'exécution, temps, instructions VM)
+Auteur: Geoffroy Streit
+"""
+
+import logging
+import re
+import sqlite3
+
+from query_executor import QueryExecutor
+
+# Étapes du plan qui parcourent une table entière (SQLite < 3.36 écrit "SCAN TABLE x")
+_FULL_SCAN_PATTERN = re.compile(r'^SCAN (?:TABLE )?(\S+)(?: AS \S+)?$')
+# Parcours complet d'un index (moins coûteux qu'une table, mais toujours linéaire)
+_INDEX_SCAN_PATTERN = re.compile(r'^SCAN (?:TABLE )?(\S+).* USING (?:COVERING )?INDEX (\S+)')
+
+
+class QueryInspector:
+    """Inspecteur de requêtes SQL pour diagnostiquer les requêtes lentes"""
+
+    def __init__(self):
+        """Initialisation de l'inspecteur"""
+        self.logger = logging.getLogger('mp3tag_analyzer.query_inspector')
+
+    def explain(self, conn, query):
+        """Récupère le plan d'exécution d'une requête (EXPLAIN QUERY PLAN)
+
+        Args:
+            conn (sqlite3.Connection): Connexion SQLite
+            query (str): Requête SQL à analyser
+
+        Returns:
+            list: Liste de dictionnaires (id, parent, detail) décrivant le plan
+        """
+        try:
+            cursor = conn.execute(f"EXPLAIN QUERY PLAN {query}")
+            return [{'id': row[0], 'parent': row[1], 'detail': row[3]} for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            # Certaines instructions (PRAGMA, ATTACH...) n'ont pas de plan
+            self.logger.info(f"Plan d'exécution indisponible: {e}")
+            return []
+
+    def analyze_plan(self, plan):
+        """Détecte les étapes coûteuses d'un plan d'exécution
+
+        Args:
+            plan (list): Plan retourné par explain()
+
+        Returns:
+            list: Liste des avertissements (chaînes) à afficher
+        """
+        warnings = []
+        for step in plan:
+            detail = step['detail']
+
+            match = _FULL_SCAN_PATTERN.match(detail)
+            if match:
+                warnings.append(f"Parcours complet de la table {match.group(1)} (aucun index utilisé)")
+                continue
+
+            match = _INDEX_SCAN_PATTERN.match(detail)
+            if match:
+                warnings.append(f"Parcours complet de l'index {match.group(2)} sur {match.group(1)}")
+                continue
+
+            if detail.startswith('USE TEMP B-TREE'):
+                # Ex: "USE TEMP B-TREE FOR ORDER BY" -> tri en mémoire temporaire
+                warnings.append(f"B-tree temporaire pour {detail.replace('USE TEMP B-TREE FOR ', '')} (aucun index adapté)")
+            elif 'AUTOMATIC' in detail and 'INDEX' in detail:
+                warnings.append(f"Index automatique construit à chaque exécution: {detail}")
+
+        return warnings
+
+    def inspect(self, conn, query, executor=None):
+        """Exécute une requête en mesurant le plan, les temps et le nombre d'instructions
+
+        Args:
+            conn (sqlite3.Connection): Connexion SQLite
+            query (str): Requête SQL à exécuter
+            executor (QueryExecutor, optional): Exécuteur (délai, limite, annulation) à utiliser
+
+        Returns:
+            tuple: (colonnes, résultats sous forme de dictionnaires, rapport d'inspection)
+        """
+        plan = self.explain(conn, query)
+
+        # L'exécuteur compte les instructions VM via son gestionnaire de progression
+        if executor is None:
+            executor = QueryExecutor()
+        columns, results = executor.execute(conn, query)
+        execute_time = executor.execute_time
+        fetch_time = executor.fetch_time
+
+        report = {
+            'query': query,
+            'plan': plan,
+            'warnings': self.analyze_plan(plan),
+            'execute_time': execute_time,
+            'fetch_time': fetch_time,
+            'render_time': None,  # Renseigné par l'interface après l'affichage
+            'row_count': len(results),
+            'column_count': len(columns),
+            'vm_steps': executor.vm_steps,
+            'truncated': executor.truncated,
+        }
+
+        self.logger.info(f"Requête inspectée: {report['row_count']} lignes, "
+                         f"{execute_time + fetch_time:.3f}s, ~{report['vm_steps']} instructions")
+        return columns, results, report
+
+    def format_report(self, report):
+        """Met en forme un rapport d'inspection pour l'affichage
+
+        Args:
+            report (dict): Rapport retourné par inspect()
+
+        Returns:
+            str: Rapport lisible
+        """
+        lines = ["Plan d'exécution:"]
+        if report['plan']:
+            # Indentation selon la hiérarchie parent/enfant du plan
+            depths = {0: 0}
+            for step in report['plan']:
+                depth = depths.get(step['parent'], 0) + 1
+                depths[step['id']] = depth
+                lines.append(f"{'  ' * depth}{step['detail']}")
+        else:
+            lines.append("  (indisponible)")
+
+        lines.append("")
+        lines.append("Temps:")
+        lines.append(f"  Exécution:    {report['execute_time'] * 1000:.1f} ms")
+        lines.append(f"  Récupération: {report['fetch_time'] * 1000:.1f} ms")
+        if report['render_time'] is not None:
+            lines.append(f"  Affichage:    {report['render_time'] * 1000:.1f} ms")
+
+        lines.append("")
+        lines.append(f"Lignes retournées: {report['row_count']} ({report['column_count']} colonnes)"
+                     + (" - tronqué" if report['truncated'] else ""))
+        lines.append(f"Instructions VM SQLite: ~{report['vm_steps']} "
+                     f"(résolution {QueryExecutor.PROGRESS_STEP})")
+
+        lines.append("")
+        if report['warnings']:
+            lines.append("Points d'attention:")
+            for warning in report['warnings']:
+                lines.append(f"  ⚠ {warning}")
+        else:
+            lines.append("Aucun parcours complet ni tri temporaire détecté.")
+
+        return "\n".join(lines)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module de recherche dans les enregistrements, exécutée hors du thread de l'interface
+Auteur: Geoffroy Streit
+"""
+
+import logging
+import sqlite3
+import threading
+
+from query_executor import QueryCancelledError
+
+
+def search_condition(columns, search_text):
+    """Condition de recherche d'un texte dans des colonnes SQLite
+
+    LIKE est insensible à la casse pour les caractères ASCII; les caractères
+    spéciaux % et _ saisis sont recherchés tels quels.
+
+    Args:
+        columns (list): Colonnes dans lesquelles rechercher
+        search_text (str): Texte recherché
+
+    Returns:
+        tuple: (condition WHERE sans le mot-clé, paramètres)
+    """
+    escaped = search_text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    where = ' OR '.join(f'"{column}" LIKE ? ESCAPE \'\\\'' for column in columns)
+    return where, [f'%{escaped}%'] * len(columns)
+
+
+class SQLiteSearch:
+    """Recherche dans une table SQLite sur une connexion dédiée, annulable depuis un autre thread
+
+    La première page (dans l'ordre de tri de la vue) est publiée dès qu'elle est lue;
+    le comptage des résultats, qui parcourt toute la table, vient ensuite.
+    """
+
+    def __init__(self, db_path, columns, search_text, table='mp3_files', order_by='rowid', page_size=256):
+        """Initialisation
+
+        Args:
+            db_path (str): Chemin vers la base de données SQLite
+            columns (list): Colonnes dans lesquelles rechercher
+            search_text (str): Texte recherché
+            table (str): Table interrogée
+            order_by (str): Ordre de tri de la vue (clause ORDER BY sans le mot-clé)
+            page_size (int): Nombre de lignes de la première page
+        """
+        self.db_path = db_path
+        self.table = table
+        self.order_by = order_by
+        self.page_size = page_size
+        self.where, self.params = search_condition(columns, search_text)
+        self.logger = logging.getLogger('mp3tag_analyzer.record_search')
+
+        self._conn = None
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        """bool: True si l'annulation a été demandée"""
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Annule la recherche (appelable depuis n'importe quel thread)"""
+        self._cancel_event.set()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.interrupt()
+
+    def run(self, on_first_page=None):
+        """Exécute la recherche
+
+        Args:
+            on_first_page (callable, optional): Appelé avec les lignes (rowid, colonnes...) de la première page
+
+        Returns:
+            int: Nombre total de résultats
+
+        Raises:
+            QueryCancelledError: Si la recherche a été annulée
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA query_only = ON")
+        with self._lock:
+            self._conn = conn
+        try:
+            if self.cancelled:
+                raise QueryCancelledError("La recherche a été annulée")
+            page = conn.execute(
+                f'SELECT rowid, * FROM "{self.table}" WHERE {self.where} ORDER BY {self.order_by} LIMIT ?',
+                self.params + [self.page_size]
+            ).fetchall()
+            if on_first_page:
+                on_first_page(page)
+            if len(page) < self.page_size:
+                return len(page)
+            return conn.execute(f'SELECT COUNT(*) FROM "{self.table}" WHERE {self.where}', self.params).fetchone()[0]
+        except sqlite3.OperationalError as e:
+            if self.cancelled:
+                self.logger.info(f"Recherche interrompue: {e}")
+                raise QueryCancelledError("La recherche a été annulée")
+            raise
+        finally:
+            with self._lock:
+                self._conn = None
+            conn.close()
+
+
+class RecordListSearch:
+    """Recherche dans des enregistrements en mémoire (fichier CSV, résultat de requête)"""
+
+    # Nombre d'enregistrements examinés entre deux vérifications de l'annulation
+    CHECK_STEP = 1000
+
+    def __init__(self, records, column, search_text, page_size=256):
+        """Initialisation
+
+        Args:
+            records (list): Enregistrements (dictionnaires); la liste n'est pas modifiée
+            column (str): Colonne dans laquelle rechercher, ou "all" pour tous les champs
+            search_text (str): Texte recherché (insensible à la casse)
+            page_size (int): Nombre de résultats publiés en première page
+        """
+        self.records = records
+        self.column = column
+        self.search_text = search_text.lower()
+        self.page_size = page_size
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        """bool: True si l'annulation a été demandée"""
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Annule la recherche (appelable depuis n'importe quel thread)"""
+        self._cancel_event.set()
+
+    def run(self, on_first_page=None):
+        """Exécute la recherche
+
+        Args:
+            on_first_page (callable, optional): Appelé avec les page_size premiers résultats
+
+        Returns:
+            list: Enregistrements correspondants
+
+        Raises:
+            QueryCancelledError: Si la recherche a été annulée
+        """
+        matches = []
+        for index, record in enumerate(self.records):
+            if index % self.CHECK_STEP == 0 and self.cancelled:
+                raise QueryCancelledError("La recherche a été annulée")
+            if self._matches(record):
+                matches.append(record)
+                if len(matches) == self.page_size and on_first_page:
+                    on_first_page(list(matches))
+        return matches
+
+    def _matches(self, record):
+        if self.column == "all":
+            # Recherche dans tous les champs
+            values = record.values()
+        elif self.column in record:
+            values = (record[self.column],)
+        else:
+            # Essayer avec la clé normalisée
+            values = (record.get(self.column.lower().replace(' ', '_')),)
+        return any(isinstance(value, str) and self.search_text in value.lower() for value in values)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module des requêtes SQL préenregistrées (presets) sur la table mp3_files
+Auteur: Geoffroy Streit
+"""
+
+# Catégories et requêtes SQL prédéfinies
+SQL_PRESETS_BY_CATEGORY = {
+    "Requêtes générales": {
+        "Tous les morceaux": "SELECT * FROM mp3_files ORDER BY artist, album, title",
+        "Nombre total de morceaux": "SELECT COUNT(*) as total_tracks FROM mp3_files",
+        "Durée totale de la collection": "SELECT SUM(audio_length)/60 as total_minutes FROM mp3_files"
+    },
+    "Analyse par artiste": {
+        "Artistes par nombre de morceaux": "SELECT artist, COUNT(*) as nb_tracks FROM mp3_files GROUP BY artist ORDER BY nb_tracks DESC",
+        "Artistes avec un seul morceau": "SELECT artist, title FROM mp3_files WHERE artist IN (SELECT artist FROM mp3_files GROUP BY artist HAVING COUNT(*) = 1)",
+        "Top 10 des artistes": "SELECT artist, COUNT(*) as nb_tracks FROM mp3_files GROUP BY artist ORDER BY nb_tracks DESC LIMIT 10"
+    },
+    "Analyse par album": {
+        "Albums par année": "SELECT album, artist, year FROM mp3_files GROUP BY album ORDER BY year DESC",
+        "Albums avec peu de morceaux": "SELECT album, artist, COUNT(*) as nb_tracks FROM mp3_files GROUP BY album, artist HAVING nb_tracks < 5 ORDER BY nb_tracks",
+        "Albums les plus complets": "SELECT album, artist, COUNT(*) as nb_tracks FROM mp3_files GROUP BY album, artist ORDER BY nb_tracks DESC LIMIT 20"
+    },
+    "Durée et taille": {
+        "Morceaux les plus longs": "SELECT title, artist, album, audio_length/60.0 as minutes FROM mp3_files ORDER BY audio_length DESC LIMIT 50",
+        "Morceaux les plus courts": "SELECT title, artist, album, audio_length/60.0 as minutes FROM mp3_files WHERE audio_length > 0 ORDER BY audio_length ASC LIMIT 50",
+        "Fichiers les plus volumineux": "SELECT title, artist, album, file_size FROM mp3_files ORDER BY CAST(REPLACE(file_size, ' KB', '') AS NUMERIC) DESC LIMIT 50"
+    },
+    "Métadonnées": {
+        "Morceaux sans ISRC": "SELECT title, artist, album FROM mp3_files WHERE isrc IS NULL OR isrc = ''",
+        "Morceaux sans année": "SELECT title, artist, album FROM mp3_files WHERE year IS NULL OR year = 0 OR year = ''",
+        "Distribution des genres": "SELECT genre, COUNT(*) as nb_tracks FROM mp3_files GROUP BY genre ORDER BY nb_tracks DESC"
+    },
+    "Formats audio": {
+        "Distribution des codecs": "SELECT codec, COUNT(*) as nb_tracks FROM mp3_files GROUP BY codec ORDER BY nb_tracks DESC",
+        "Distribution des bitrates": "SELECT bitrate, COUNT(*) as nb_tracks FROM mp3_files GROUP BY bitrate ORDER BY nb_tracks DESC",
+        "Fichiers avec VBR": "SELECT title, artist, album, bitrate FROM mp3_files WHERE vbr = '1' OR vbr = 'true' OR vbr = 'True'"
+    },
+    "Dates": {
+        "Morceaux récemment importés": "SELECT title, artist, album, import_date FROM mp3_files ORDER BY import_date DESC LIMIT 50",
+        "Fichiers les plus récents": "SELECT title, artist, album, file_create_date FROM mp3_files ORDER BY file_create_date DESC LIMIT 50",
+        "Fichiers les plus anciens": "SELECT title, artist, album, file_create_date FROM mp3_files ORDER BY file_create_date ASC LIMIT 50"
+    },
+    "Doublons": {
+        "Doublons détectés": "SELECT d.cluster_id, d.match_type, d.score, f.artist, f.title, f.album, f.audio_length, f.file_size, f.relative_path, f.filename FROM duplicate_clusters d JOIN mp3_files f ON f.id = d.track_id ORDER BY d.cluster_id, f.id",
+        "Groupes de doublons": "SELECT d.cluster_id, d.match_type, COUNT(*) as nb_tracks, MIN(f.artist) as artist, MIN(f.title) as title FROM duplicate_clusters d JOIN mp3_files f ON f.id = d.track_id GROUP BY d.cluster_id ORDER BY nb_tracks DESC"
+    }
+}
+
+# Fusion des résultats des presets en mode fédéré 'fanout' (requête exécutée base par base,
+# voir FederatedQuery.execute_fanout): regroupement et fonctions de fusion (merge_aggregates),
+# tri et limite globaux, et requête exécutée sur chaque base quand la limite ne peut pas
+# s'appliquer base par base (agrégats). Un preset absent de cette table n'est exécuté en
+# mode 'fanout' que si ses résultats peuvent être concaténés.
+FANOUT_MERGE_SPECS = {
+    "Tous les morceaux": {
+        'order_by': [('artist', 'ASC'), ('album', 'ASC'), ('title', 'ASC')],
+    },
+    "Nombre total de morceaux": {
+        'group_by': [], 'aggregates': {'total_tracks': 'count'},
+    },
+    "Durée totale de la collection": {
+        # Division décimale par base: les parties entières ne s'additionnent pas
+        'query': "SELECT SUM(audio_length)/60.0 as total_minutes FROM mp3_files",
+        'group_by': [], 'aggregates': {'total_minutes': 'sum'},
+    },
+    "Artistes par nombre de morceaux": {
+        'group_by': ['artist'], 'aggregates': {'nb_tracks': 'count'},
+        'order_by': [('nb_tracks', 'DESC')],
+    },
+    "Top 10 des artistes": {
+        'query': "SELECT artist, COUNT(*) as nb_tracks FROM mp3_files GROUP BY artist",
+        'group_by': ['artist'], 'aggregates': {'nb_tracks': 'count'},
+        'order_by': [('nb_tracks', 'DESC')], 'limit': 10,
+    },
+    "Albums les plus complets": {
+        'query': "SELECT album, artist, COUNT(*) as nb_tracks FROM mp3_files GROUP BY album, artist",
+        'group_by': ['album', 'artist'], 'aggregates': {'nb_tracks': 'count'},
+        'order_by': [('nb_tracks', 'DESC')], 'limit': 20,
+    },
+    "Morceaux les plus longs": {
+        'order_by': [('minutes', 'DESC')], 'limit': 50,
+    },
+    "Morceaux les plus courts": {
+        'order_by': [('minutes', 'ASC')], 'limit': 50,
+    },
+    "Distribution des genres": {
+        'group_by': ['genre'], 'aggregates': {'nb_tracks': 'count'},
+        'order_by': [('nb_tracks', 'DESC')],
+    },
+    "Distribution des codecs": {
+        'group_by': ['codec'], 'aggregates': {'nb_tracks': 'count'},
+        'order_by': [('nb_tracks', 'DESC')],
+    },
+    "Distribution des bitrates": {
+        'group_by': ['bitrate'], 'aggregates': {'nb_tracks': 'count'},
+        'order_by': [('nb_tracks', 'DESC')],
+    },
+    "Morceaux récemment importés": {
+        'order_by': [('import_date', 'DESC')], 'limit': 50,
+    },
+    "Fichiers les plus récents": {
+        'order_by': [('file_create_date', 'DESC')], 'limit': 50,
+    },
+    "Fichiers les plus anciens": {
+        'order_by': [('file_create_date', 'ASC')], 'limit': 50,
+    },
+    # Les groupes de doublons sont propres à chaque base: résultats concaténés
+    "Groupes de doublons": {},
+}
+
+
+# Requête des presets en mode fédéré 'attach' (vues réunissant toutes les bases, voir
+# FederatedQuery.connect_attached) quand celle d'une base seule ne convient pas: les id de
+# pistes et de groupes de doublons se répètent d'une base à l'autre, la jointure et le
+# regroupement portent aussi sur source_db.
+ATTACH_PRESET_QUERIES = {
+    "Doublons détectés": "SELECT d.source_db, d.cluster_id, d.match_type, d.score, f.artist, f.title, f.album, f.audio_length, f.file_size, f.relative_path, f.filename FROM duplicate_clusters d JOIN mp3_files f ON f.source_db = d.source_db AND f.id = d.track_id ORDER BY d.source_db, d.cluster_id, f.id",
+    "Groupes de doublons": "SELECT d.source_db, d.cluster_id, d.match_type, COUNT(*) as nb_tracks, MIN(f.artist) as artist, MIN(f.title) as title FROM duplicate_clusters d JOIN mp3_files f ON f.source_db = d.source_db AND f.id = d.track_id GROUP BY d.source_db, d.cluster_id ORDER BY nb_tracks DESC",
+}
+
+
+def get_preset_query(name, presets=None):
+    """Requête SQL d'un preset
+
+    Args:
+        name (str): Nom du preset, éventuellement préfixé de sa catégorie ("Catégorie/Nom")
+        presets (dict, optional): Presets par catégorie (par défaut: SQL_PRESETS_BY_CATEGORY)
+
+    Returns:
+        str: Requête SQL
+
+    Raises:
+        KeyError: Si aucun preset ne porte ce nom
+    """
+    presets = SQL_PRESETS_BY_CATEGORY if presets is None else presets
+    category, _, preset_name = name.rpartition('/')
+    if category:
+        query = presets.get(category, {}).get(preset_name)
+        if query is not None:
+            return query
+    for queries in presets.values():
+        if name in queries:
+            return queries[name]
+    raise KeyError(f"Preset SQL inconnu: {name}")
+
+
+def resolve_query(query=None, preset=None, presets=None):
+    """Requête à exécuter: la requête fournie, sinon celle du preset
+
+    Args:
+        query (str, optional): Requête SQL
+        preset (str, optional): Nom du preset (voir get_preset_query)
+        presets (dict, optional): Presets par catégorie
+
+    Returns:
+        str: Requête SQL, sans point-virgule final
+    """
+    if query is None and preset is None:
+        raise ValueError("Aucune requête ni preset à exporter")
+    if query is None:
+        query = get_preset_query(preset, presets)
+    # Une requête exportée peut être utilisée comme sous-requête (déduction des types)
+    return query.strip().rstrip(';').strip()
+
+
+def get_fanout_merge_spec(query, presets=None):
+    """Règles de fusion en mode 'fanout' du preset correspondant à une requête
+
+    Args:
+        query (str): Requête SQL (comparée au texte des presets, aux espaces près)
+        presets (dict, optional): Presets par catégorie
+
+    Returns:
+        dict: Règles de FANOUT_MERGE_SPECS, ou None si la requête n'est pas un preset qui en a
+    """
+    presets = SQL_PRESETS_BY_CATEGORY if presets is None else presets
+    normalized = _normalize_query(query)
+    for queries in presets.values():
+        for name, preset_query in queries.items():
+            if name in FANOUT_MERGE_SPECS and _normalize_query(preset_query) == normalized:
+                return FANOUT_MERGE_SPECS[name]
+    return None
+
+
+def get_attach_query(query, presets=None):
+    """Requête à exécuter en mode fédéré 'attach'
+
+    Args:
+        query (str): Requête SQL (comparée au texte des presets, aux espaces près)
+        presets (dict, optional): Presets par catégorie
+
+    Returns:
+        str: Requête de ATTACH_PRESET_QUERIES si la requête est un preset qui en a une, sinon la requête
+    """
+    presets = SQL_PRESETS_BY_CATEGORY if presets is None else presets
+    normalized = _normalize_query(query)
+    for queries in presets.values():
+        for name, preset_query in queries.items():
+            if name in ATTACH_PRESET_QUERIES and _normalize_query(preset_query) == normalized:
+                return ATTACH_PRESET_QUERIES[name]
+    return query
+
+
+def _normalize_query(query):
+    return ' '.join(query.strip().rstrip(';').split())
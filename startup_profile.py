@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module de mesure des étapes du démarrage de l'application (option --startup-profile)
+Auteur: Geoffroy Streit
+"""
+
+import logging
+import sys
+import time
+
+# Origine des mesures: import de ce module, en tête du script principal
+_origin = time.perf_counter()
+_enabled = False
+_marks = []  # (étape, instant de fin)
+
+_DEFERRED_MODULES = ('db_exporter', 'format_exporter', 'duplicate_finder',
+                     'pyarrow', 'mysql.connector', 'psycopg2', 'zstandard')
+
+
+def enable():
+    """Active la mesure du démarrage (désactivée par défaut: mark() ne fait alors rien)"""
+    global _enabled
+    _enabled = True
+
+
+def is_enabled():
+    """bool: True si la mesure du démarrage est active"""
+    return _enabled
+
+
+def mark(step):
+    """Enregistre la fin d'une étape du démarrage
+
+    Args:
+        step (str): Libellé de l'étape (sa durée court depuis l'étape précédente)
+    """
+    if _enabled:
+        _marks.append((step, time.perf_counter()))
+
+
+def report():
+    """Rapport des étapes enregistrées: durée de chaque étape et temps écoulé depuis l'origine
+
+    Returns:
+        str: Rapport sur plusieurs lignes
+    """
+    lines = ["Profil de démarrage (ms):", f"{'étape':>10} {'cumul':>10}  description"]
+    previous = _origin
+    for step, instant in _marks:
+        lines.append(f"{(instant - previous) * 1000:10.1f} {(instant - _origin) * 1000:10.1f}  {step}")
+        previous = instant
+    # Modules importés à la demande: ils ne devraient pas apparaître au démarrage
+    modules = [name for name in _DEFERRED_MODULES if name in sys.modules]
+    lines.append(f"Modules différés déjà chargés: {', '.join(modules) if modules else 'aucun'}")
+    return '\n'.join(lines)
+
+
+def finish():
+    """Écrit le rapport sur la sortie d'erreur et dans le journal"""
+    text = report()
+    print(text, file=sys.stderr)
+    logging.getLogger('mp3tag_analyzer.startup').info(text)
@@ -0,0 +1,564 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module des modèles de données virtualisés de la vue tableau
+Auteur: Geoffroy Streit
+"""
+
+import logging
+import sqlite3
+from collections import OrderedDict
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+
+from edit_buffer import EditBuffer
+from target_schema import infer_sqlite_column_types
+
+
+def format_display_value(header, value):
+    """Texte affiché pour une valeur de cellule
+
+    Args:
+        header (str): Nom de la colonne
+        value: Valeur brute
+
+    Returns:
+        str: Texte à afficher (durées AudioLength au format h:m:s)
+    """
+    if value is None:
+        return ""
+    if header == "AudioLength" and value:
+        try:
+            # Conversion des secondes en format h:m:s
+            seconds = int(float(value))
+            hours, remainder = divmod(seconds, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            if hours > 0:
+                return f"{hours}:{minutes:02d}:{seconds:02d}"
+            return f"{minutes:02d}:{seconds:02d}"
+        except (ValueError, TypeError):
+            # En cas d'erreur, garder la valeur originale
+            pass
+    return str(value)
+
+
+def sort_key(value):
+    """Clé de tri: nombres (y compris stockés en texte) par valeur, puis textes, puis valeurs vides"""
+    if value is None or value == '':
+        return (2, 0, '')
+    if isinstance(value, (int, float)):
+        return (0, value, '')
+    try:
+        return (0, float(value), '')
+    except (TypeError, ValueError):
+        return (1, 0, str(value).lower())
+
+
+def sort_index_name(table, column):
+    """Nom de l'index de tri d'une colonne"""
+    return f"idx_{table}_sort_{column}"
+
+
+def create_sort_index(db_path, table, column, expression):
+    """Crée l'index de tri d'une colonne (depuis une tâche d'arrière-plan, avec sa propre connexion)
+
+    L'index porte sur l'expression exacte de l'ORDER BY: SQLite lit alors les lignes
+    dans l'ordre, sans trier la table. Les requêtes de la vue l'utilisent dès sa création.
+
+    Args:
+        db_path (str): Chemin vers la base de données SQLite
+        table (str): Table affichée
+        column (str): Colonne triée
+        expression (str): Expression de tri (voir SQLiteTableModel._sort_expression)
+
+    Returns:
+        str: Nom de la colonne indexée
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS "{sort_index_name(table, column)}" ON "{table}" ({expression})')
+    finally:
+        conn.close()
+    return column
+
+
+class LazyTableModel(QAbstractTableModel):
+    """Modèle de tableau dont les lignes sont rendues visibles par tranches
+
+    La vue ne connaît que les lignes déjà « chargées »: canFetchMore()/fetchMore()
+    en ajoutent FETCH_STEP à chaque fois qu'elle atteint la fin du défilement.
+    Aucune cellule n'est matérialisée: data() lit et formate la valeur à la demande.
+    """
+
+    # Nombre de lignes ajoutées à chaque fetchMore()
+    FETCH_STEP = 1000
+
+    # Émis après la modification d'une cellule par l'utilisateur (ligne, colonne, nouvelle valeur)
+    valueEdited = pyqtSignal(int, int, str)
+
+    def __init__(self, headers, parent=None):
+        """Initialisation
+
+        Args:
+            headers (list): Noms des colonnes
+            parent (QObject, optional): Objet parent
+        """
+        super().__init__(parent)
+        self.headers = list(headers)
+        self._loaded = 0
+        self.logger = logging.getLogger('mp3tag_analyzer.table_model')
+
+    def total_rows(self):
+        """Nombre total de lignes de la source (chargées ou non)"""
+        raise NotImplementedError
+
+    def value_at(self, row, column):
+        """Valeur brute d'une cellule"""
+        raise NotImplementedError
+
+    def _write_value(self, row, column, value):
+        """Enregistre la valeur saisie dans une cellule; retourne True si elle a été acceptée"""
+        raise NotImplementedError
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < self.total_rows()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.FETCH_STEP, self.total_rows() - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        value = self.value_at(index.row(), index.column())
+        if role == Qt.EditRole:
+            return "" if value is None else str(value)
+        return format_display_value(self.headers[index.column()], value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section] if section < len(self.headers) else None
+        return section + 1
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        if not self._write_value(index.row(), index.column(), value):
+            return False
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        self.valueEdited.emit(index.row(), index.column(), value)
+        return True
+
+
+class RecordTableModel(LazyTableModel):
+    """Modèle sur une liste de dictionnaires en mémoire (fichier CSV, résultat de requête)"""
+
+    def __init__(self, records, headers=None, parent=None):
+        """Initialisation
+
+        Args:
+            records (list): Enregistrements (dictionnaires), modifiés en place par l'édition et le tri
+            headers (list, optional): Colonnes (par défaut: clés du premier enregistrement)
+            parent (QObject, optional): Objet parent
+        """
+        if not headers:
+            headers = list(records[0].keys()) if records else []
+        super().__init__(headers, parent)
+        self.records = records
+        # Clé de repli de chaque colonne (nom normalisé en snake_case)
+        self._fallback_keys = [header.lower().replace(' ', '_') for header in self.headers]
+
+    def total_rows(self):
+        return len(self.records)
+
+    def value_at(self, row, column):
+        record = self.records[row]
+        header = self.headers[column]
+        if header in record:
+            return record[header]
+        return record.get(self._fallback_keys[column], "")
+
+    def _write_value(self, row, column, value):
+        self.records[row][self.headers[column]] = value
+        return True
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Trie les enregistrements en mémoire (nombres par valeur, y compris en texte)"""
+        if not 0 <= column < len(self.headers):
+            return
+        self.layoutAboutToBeChanged.emit()
+        self.records.sort(key=lambda record, c=column: sort_key(self._record_value(record, c)),
+                          reverse=order == Qt.DescendingOrder)
+        self.layoutChanged.emit()
+
+    def _record_value(self, record, column):
+        header = self.headers[column]
+        if header in record:
+            return record[header]
+        return record.get(self._fallback_keys[column])
+
+
+class SQLiteTableModel(LazyTableModel):
+    """Modèle adossé à une table SQLite, lue par pages à la demande
+
+    Seules les pages affichées sont lues et conservées dans un petit cache LRU:
+    chaque page reprend après la dernière ligne de la précédente (pagination par clé
+    de tri et rowid), l'ouverture et le défilement ne dépendent pas de la taille de la table.
+    La condition WHERE (recherche) et le tri s'appliquent côté base. Une colonne triée
+    plusieurs fois demande son index de tri (sortIndexWanted), construit en tâche de fond:
+    le tri fonctionne sans lui en attendant. Les cellules modifiées sont conservées dans un EditBuffer et écrites
+    par lots avec flush_edits().
+    """
+
+    # Nombre de lignes lues par requête
+    PAGE_SIZE = 256
+    # Nombre de pages conservées en mémoire
+    CACHE_PAGES = 32
+    # Nombre de valeurs examinées pour savoir si une colonne TEXT contient des nombres
+    TYPE_SAMPLE_SIZE = 1000
+    # Nombre de tris d'une colonne à partir duquel son index de tri est demandé
+    INDEX_AFTER_SORTS = 2
+
+    # Émis quand une colonne triée régulièrement n'a pas d'index de tri (colonne, expression)
+    sortIndexWanted = pyqtSignal(str, str)
+
+    def __init__(self, db_path, table='mp3_files', parent=None):
+        """Initialisation
+
+        Args:
+            db_path (str): Chemin vers la base de données SQLite
+            table (str): Table affichée
+            parent (QObject, optional): Objet parent
+        """
+        self.db_path = db_path
+        self.table = table
+        # Connexion propre au modèle, utilisée uniquement depuis le thread de l'interface
+        self.conn = sqlite3.connect(db_path)
+        info = self.conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+        super().__init__([row[1] for row in info], parent)
+        self._declared_types = {row[1]: (row[2] or '').upper() for row in info}
+        # Colonne INTEGER PRIMARY KEY: alias du rowid, déjà trié
+        self._rowid_column = next((row[1] for row in info if row[5] == 1 and (row[2] or '').upper() == 'INTEGER'), None)
+        self._where = ''
+        self._params = ()
+        self._order_by = 'rowid'
+        # Expression de tri (None: rowid) et sens, pour la pagination par clé
+        self._sort_key = None
+        self._descending = False
+        # Expression de tri de chaque colonne déjà triée
+        self._sort_expressions = {}
+        # Nombre de tris des colonnes sans index de tri
+        self._sort_counts = {}
+        # Modifications de cellules en attente d'écriture
+        self.edit_buffer = EditBuffer(table)
+        self._pages = OrderedDict()
+        # Dernière ligne de chaque page lue: page -> (clé de tri, rowid)
+        self._page_ends = {}
+        self._total = self._count()
+
+    @property
+    def filtered(self):
+        """bool: True si une condition de recherche est appliquée"""
+        return bool(self._where)
+
+    @property
+    def order_by(self):
+        """str: Ordre de tri courant (clause ORDER BY sans le mot-clé)"""
+        return self._order_by
+
+    def total_rows(self):
+        return self._total
+
+    @property
+    def pending_edits(self):
+        """int: Nombre de cellules modifiées non encore écrites dans la base"""
+        return len(self.edit_buffer)
+
+    def value_at(self, row, column):
+        record = self._row(row)
+        if record is None:
+            return None
+        if self.edit_buffer:
+            return self.edit_buffer.get(record[0], self.headers[column], record[column + 1])
+        return record[column + 1]
+
+    def rowid_at(self, row):
+        """rowid SQLite de la ligne affichée"""
+        record = self._row(row)
+        return record[0] if record is not None else None
+
+    def set_filter(self, where='', params=()):
+        """Applique une condition de recherche (clause WHERE sans le mot-clé) et recharge la vue"""
+        self._where = where
+        self._params = tuple(params)
+        self.refresh()
+
+    def apply_search(self, where, params, first_page):
+        """Affiche le résultat d'une recherche dont seule la première page est connue
+
+        Le nombre total de résultats reste provisoire jusqu'à l'appel de set_total().
+
+        Args:
+            where (str): Condition de recherche (clause WHERE sans le mot-clé)
+            params (list): Paramètres de la condition
+            first_page (list): Lignes (rowid, colonnes...) de la première page, dans l'ordre courant
+        """
+        self._where = where
+        self._params = tuple(params)
+        self._reset(len(first_page), first_page)
+        if len(first_page) == self.PAGE_SIZE:
+            # La page suivante reprend après la dernière ligne de celle-ci
+            rowid = first_page[-1][0]
+            key = self.conn.execute(f'SELECT {self._sort_key or "rowid"} FROM "{self.table}" WHERE rowid = ?',
+                                    (rowid,)).fetchone()
+            if key is not None:
+                self._page_ends[0] = (key[0], rowid)
+
+    def set_total(self, total):
+        """Fixe le nombre total de lignes (fin du comptage d'une recherche)"""
+        self._total = total
+        if self._loaded < min(self.FETCH_STEP, total):
+            self.fetchMore()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Trie la vue côté base; seule la page visible est relue"""
+        if not 0 <= column < len(self.headers):
+            return
+        direction = 'DESC' if order == Qt.DescendingOrder else 'ASC'
+        expression = self._sort_expression(self.headers[column])
+        if expression != 'rowid':
+            self._count_sort(self.headers[column], expression)
+        self._descending = order == Qt.DescendingOrder
+        self._sort_key = None if expression == 'rowid' else expression
+        if expression == 'rowid':
+            self._order_by = f"rowid {direction}"
+        else:
+            # rowid départage les ex aequo (ordre stable entre les pages)
+            self._order_by = f"{expression} {direction}, rowid {direction}"
+        # Le tri ne change pas le nombre de lignes: pas de nouveau comptage
+        self._reset(self._total)
+
+    def refresh(self):
+        """Relit le nombre de lignes et vide le cache (après une modification de la base)"""
+        self._reset(self._count())
+
+    def _reset(self, total, first_page=None):
+        self.beginResetModel()
+        self._clear_pages()
+        if first_page:
+            self._pages[0] = first_page
+        self._total = total
+        self._loaded = 0
+        self.endResetModel()
+        self.fetchMore()
+
+    def flush_edits(self):
+        """Écrit les modifications en attente dans la base (une transaction)
+
+        Returns:
+            int: Nombre de cellules écrites
+        """
+        count = self.edit_buffer.flush(self.conn)
+        if count:
+            # Les pages en cache contiennent les anciennes valeurs
+            self._clear_pages()
+        return count
+
+    def undo(self):
+        """Annule la dernière modification de cellule
+
+        Returns:
+            tuple: (rowid, colonne, valeur rétablie), ou None s'il n'y a rien à annuler
+        """
+        return self._after_journal_change(self.edit_buffer.undo(self.conn))
+
+    def redo(self):
+        """Rétablit la dernière modification annulée
+
+        Returns:
+            tuple: (rowid, colonne, valeur rétablie), ou None s'il n'y a rien à rétablir
+        """
+        return self._after_journal_change(self.edit_buffer.redo(self.conn))
+
+    def close(self):
+        """Écrit les modifications en attente et ferme la connexion du modèle"""
+        try:
+            self.flush_edits()
+        except sqlite3.Error as e:
+            self.logger.error(f"Modifications de cellules non enregistrées: {e}")
+        self._pages.clear()
+        self.conn.close()
+
+    def _after_journal_change(self, change):
+        self._clear_pages()
+        if change is not None and self._loaded:
+            self.dataChanged.emit(self.index(0, 0), self.index(self._loaded - 1, len(self.headers) - 1))
+        return change
+
+    def _sort_expression(self, column):
+        """Expression ORDER BY d'une colonne, déterminée au premier tri
+
+        Colonnes numériques déclarées: valeur brute. Colonnes TEXT contenant des
+        nombres (file_size, bitrate...): CAST en REAL pour un ordre numérique.
+        Autres textes: ordre insensible à la casse.
+        """
+        expression = self._sort_expressions.get(column)
+        if expression is not None:
+            return expression
+
+        quoted = f'"{column}"'
+        declared = self._declared_types.get(column, '')
+        if column == self._rowid_column:
+            expression = 'rowid'
+        elif any(name in declared for name in ('INT', 'REAL', 'FLOA', 'DOUB')):
+            expression = quoted
+        else:
+            sample = (f'SELECT {quoted} FROM "{self.table}" WHERE {quoted} IS NOT NULL AND {quoted} != \'\' '
+                      f'LIMIT {self.TYPE_SAMPLE_SIZE}')
+            try:
+                inferred = infer_sqlite_column_types(self.db_path, query=sample).get(column, {})
+            except sqlite3.Error as e:
+                self.logger.warning(f"Type de la colonne {column} non déterminé: {e}")
+                inferred = {}
+            if inferred.get('type') in ('integer', 'real'):
+                expression = f"CAST(NULLIF({quoted}, '') AS REAL)"
+            else:
+                expression = f"{quoted} COLLATE NOCASE"
+
+        self._sort_expressions[column] = expression
+        return expression
+
+    def _count_sort(self, column, expression):
+        """Compte les tris d'une colonne et demande son index de tri à partir de INDEX_AFTER_SORTS"""
+        count = self._sort_counts.get(column, 0)
+        if count is None:
+            # Index présent ou déjà demandé
+            return
+        if count == 0 and self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+                                            (sort_index_name(self.table, column),)).fetchone():
+            self._sort_counts[column] = None
+            return
+        count += 1
+        if count < self.INDEX_AFTER_SORTS:
+            self._sort_counts[column] = count
+            return
+        self._sort_counts[column] = None
+        self.sortIndexWanted.emit(column, expression)
+
+    def _where_clause(self):
+        return f" WHERE {self._where}" if self._where else ""
+
+    def _count(self):
+        query = f'SELECT COUNT(*) FROM "{self.table}"{self._where_clause()}'
+        return self.conn.execute(query, self._params).fetchone()[0]
+
+    def _clear_pages(self):
+        self._pages.clear()
+        self._page_ends.clear()
+
+    def _read_page(self, page_index):
+        """Lit une page à partir de la fin de la page connue la plus proche
+
+        La page suivante d'une page lue reprend après sa dernière ligne (ex: WHERE clé >= ?
+        AND (clé > ? OR rowid > ?)) sans relire les lignes précédentes. Un saut vers une
+        page lointaine ajoute un OFFSET, compté depuis cette page connue.
+        """
+        anchor = max((index for index in self._page_ends if index < page_index), default=None)
+        if anchor is None:
+            skip = page_index * self.PAGE_SIZE
+            segments = [(None, [], self._order_by)]
+        else:
+            skip = (page_index - anchor - 1) * self.PAGE_SIZE
+            segments = self._segments_after(*self._page_ends[anchor])
+
+        rows = []
+        for condition, condition_params, order_by in segments:
+            conditions = [f"({self._where})"] if self._where else []
+            if condition:
+                conditions.append(condition)
+            where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+            params = list(self._params) + condition_params
+            query = (f'SELECT rowid, *, {self._sort_key or "rowid"} FROM "{self.table}"{where} '
+                     f'ORDER BY {order_by} LIMIT ? OFFSET ?')
+            batch = self.conn.execute(query, params + [self.PAGE_SIZE - len(rows), skip]).fetchall()
+            rows.extend(batch)
+            if len(rows) == self.PAGE_SIZE:
+                break
+            if skip:
+                # Segment épuisé avant la fin du saut: le reste du saut porte sur le segment suivant
+                skip = 0 if batch else skip - self.conn.execute(
+                    f'SELECT COUNT(*) FROM "{self.table}"{where}', params).fetchone()[0]
+
+        if rows:
+            self._page_ends[page_index] = (rows[-1][-1], rows[-1][0])
+        # La clé de tri (dernière colonne) ne sert qu'à la pagination
+        return [row[:-1] for row in rows]
+
+    def _segments_after(self, key, rowid):
+        """Lignes placées après (clé, rowid) dans l'ordre courant, en segments lus l'un après l'autre
+
+        Chaque segment est une condition que SQLite résout par une recherche dans l'index
+        de tri: une comparaison de valeurs de ligne ((clé, rowid) > (?, ?)) ou une
+        disjonction avec NULL parcourraient l'index depuis le début. NULL est placé en tête
+        d'un tri croissant et en fin d'un tri décroissant: ses lignes forment un segment à part,
+        trié par rowid.
+
+        Returns:
+            list: Segments (condition SQL, paramètres, ORDER BY)
+        """
+        direction = 'DESC' if self._descending else 'ASC'
+        operator = '<' if self._descending else '>'
+        expression = self._sort_key
+        if expression is None:
+            return [(f"rowid {operator} ?", [rowid], self._order_by)]
+        nulls = f"rowid {direction}"
+        if key is None:
+            segments = [(f"{expression} IS NULL AND rowid {operator} ?", [rowid], nulls)]
+            if not self._descending:
+                segments.append((f"{expression} IS NOT NULL", [], self._order_by))
+            return segments
+        segments = [(f"{expression} {operator}= ? AND ({expression} {operator} ? OR rowid {operator} ?)",
+                     [key, key, rowid], self._order_by)]
+        if self._descending:
+            segments.append((f"{expression} IS NULL", [], nulls))
+        return segments
+
+    def _row(self, row):
+        page_index, offset = divmod(row, self.PAGE_SIZE)
+        page = self._pages.get(page_index)
+        if page is None:
+            page = self._read_page(page_index)
+            self._pages[page_index] = page
+            if len(self._pages) > self.CACHE_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_index)
+        return page[offset] if offset < len(page) else None
+
+    def _write_value(self, row, column, value):
+        record = self._row(row)
+        if record is None:
+            return False
+        # La ligne affichée est identifiée par son rowid (id de la piste): l'écriture est différée
+        self.edit_buffer.add(record[0], self.headers[column], record[column + 1], value)
+        return True
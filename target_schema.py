@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module de génération des schémas typés pour les exports MySQL/PostgreSQL
+Auteur: Geoffroy Streit
+"""
+
+import sqlite3
+
+# Dialectes supportés
+MYSQL = 'mysql'
+POSTGRES = 'postgres'
+
+# Colonnes indexées par défaut dans la cible, une fois le chargement terminé
+DEFAULT_INDEXES = ('artist', 'album', 'genre', 'year')
+
+# Longueurs de VARCHAR proposées (la plus petite couvrant la longueur observée avec une marge)
+_VARCHAR_LENGTHS = (32, 64, 128, 255, 512, 1024)
+# Au-delà, MySQL stocke les VARCHAR dans la ligne (limite de 65535 octets): on passe en TEXT
+_MYSQL_MAX_VARCHAR = 255
+# Budget d'octets des VARCHAR d'une ligne MySQL (4 octets par caractère en utf8mb4)
+_MYSQL_ROW_BUDGET = 60000
+# Entiers signés 32 bits
+_INT_MAX = 2 ** 31 - 1
+# Au-delà de 18 chiffres, une valeur ne tient plus dans un BIGINT
+_MAX_INTEGER_DIGITS = 18
+
+
+def _is_integer_text(value):
+    """True si une chaîne représente un entier sans perte (pas de zéro de tête: "007" reste du texte)"""
+    return (value.isdigit() and len(value) <= _MAX_INTEGER_DIGITS
+            and (value == '0' or not value.startswith('0')))
+
+
+def _is_real_text(value):
+    """True si une chaîne représente un nombre décimal simple (ex: "3.14")"""
+    integer, dot, fraction = value.partition('.')
+    return bool(dot) and integer.isdigit() and fraction.isdigit()
+
+
+def _new_stats():
+    return {'values': 0, 'integers': 0, 'reals': 0, 'max_length': 0, 'max_abs': 0}
+
+
+def _finalize(stats):
+    """Déduit le type logique d'une colonne à partir des statistiques collectées"""
+    info = {'type': 'text', 'max_length': stats['max_length'], 'max_abs': stats['max_abs']}
+    if stats['values'] and stats['integers'] == stats['values']:
+        info['type'] = 'integer'
+    elif stats['values'] and stats['integers'] + stats['reals'] == stats['values']:
+        info['type'] = 'real'
+    return info
+
+
+def infer_column_types(rows):
+    """Déduit le type de chaque colonne à partir de lignes en mémoire
+
+    Les chaînes vides et None sont ignorées: elles seront exportées comme NULL
+    dans les colonnes numériques.
+
+    Args:
+        rows (list): Liste de dictionnaires
+
+    Returns:
+        dict: Colonne -> {'type': 'integer'|'real'|'text', 'max_length', 'max_abs'}
+    """
+    stats = {}
+    for row in rows:
+        for col, value in row.items():
+            col_stats = stats.get(col)
+            if col_stats is None:
+                col_stats = stats[col] = _new_stats()
+            if value is None or value == '':
+                continue
+            col_stats['values'] += 1
+            if isinstance(value, bool):
+                text = str(value)
+            elif isinstance(value, int):
+                col_stats['integers'] += 1
+                col_stats['max_abs'] = max(col_stats['max_abs'], abs(value))
+                text = str(value)
+            elif isinstance(value, float):
+                col_stats['reals'] += 1
+                text = str(value)
+            else:
+                text = value.decode('utf-8', errors='replace') if isinstance(value, bytes) else str(value)
+                if _is_integer_text(text):
+                    col_stats['integers'] += 1
+                    col_stats['max_abs'] = max(col_stats['max_abs'], int(text))
+                elif _is_real_text(text):
+                    col_stats['reals'] += 1
+            col_stats['max_length'] = max(col_stats['max_length'], len(text))
+    return {col: _finalize(col_stats) for col, col_stats in stats.items()}
+
+
+def infer_sqlite_column_types(sqlite_path, table='mp3_files', query=None, params=()):
+    """Déduit le type de chaque colonne d'une table SQLite en un seul parcours
+
+    SQLite est typé dynamiquement: le type déclaré (TEXT pour file_size, bitrate...)
+    ne dit rien des valeurs réelles, qui sont donc analysées avec les mêmes règles
+    que infer_column_types().
+
+    Args:
+        sqlite_path (str): Chemin vers la base de données SQLite
+        table (str): Table à analyser
+        query (str, optional): Requête à analyser à la place de la table (exécutée en sous-requête)
+        params (tuple, optional): Paramètres de la requête
+
+    Returns:
+        dict: Colonne -> {'type': 'integer'|'real'|'text', 'max_length', 'max_abs'}
+    """
+    source = f'({query})' if query else f'"{table}"'
+    conn = sqlite3.connect(sqlite_path)
+    try:
+        conn.execute("PRAGMA query_only = ON")
+        if query:
+            columns = [column[0] for column in conn.execute(f'SELECT * FROM {source} LIMIT 0', params).description]
+        else:
+            columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+        if not columns:
+            return {}
+        selects = []
+        for col in columns:
+            c = f'"{col}"'
+            # Classe de chaque valeur: 0 = entier, 1 = décimal, 2 = texte, NULL = vide.
+            # Le premier test écarte la plupart des textes avec un seul GLOB.
+            kind = (f"CASE WHEN {c} IS NULL OR {c} = '' THEN NULL "
+                    f"WHEN typeof({c}) = 'integer' THEN 0 "
+                    f"WHEN typeof({c}) = 'real' THEN 1 "
+                    f"WHEN typeof({c}) != 'text' OR {c} GLOB '*[^0-9.]*' THEN 2 "
+                    f"WHEN {c} GLOB '*.*' THEN (CASE WHEN {c} GLOB '[0-9]*.[0-9]*' AND {c} NOT GLOB '*.*.*' "
+                    f"THEN 1 ELSE 2 END) "
+                    f"WHEN length({c}) > {_MAX_INTEGER_DIGITS} OR ({c} != '0' AND {c} GLOB '0*') THEN 2 "
+                    f"ELSE 0 END")
+            selects.extend([
+                f"MAX({kind})",
+                f"MAX(length({c}))",
+                f"MAX(CASE WHEN typeof({c}) IN ('integer', 'text') THEN abs(CAST({c} AS INTEGER)) END)",
+            ])
+        row = conn.execute(f'SELECT {", ".join(selects)} FROM {source}', params).fetchone()
+    finally:
+        conn.close()
+
+    types = {}
+    for i, col in enumerate(columns):
+        kind, max_length, max_abs = row[i * 3:i * 3 + 3]
+        types[col] = {
+            'type': {0: 'integer', 1: 'real'}.get(kind, 'text'),
+            'max_length': max_length or 0,
+            'max_abs': max_abs or 0,
+        }
+    return types
+
+
+def _varchar_length(max_length):
+    """Longueur de VARCHAR couvrant la longueur observée avec 50 % de marge (ajouts ultérieurs)"""
+    wanted = int(max_length * 1.5) + 1
+    for length in _VARCHAR_LENGTHS:
+        if wanted <= length:
+            return length
+    return None
+
+
+def column_sql_type(info, dialect):
+    """Type SQL d'une colonne pour un dialecte
+
+    Args:
+        info (dict): Type logique retourné par infer_column_types()
+        dialect (str): MYSQL ou POSTGRES
+
+    Returns:
+        str: Type SQL (ex: 'INT', 'BIGINT', 'DOUBLE', 'VARCHAR(64)', 'TEXT')
+    """
+    if info['type'] == 'integer':
+        if info['max_abs'] > _INT_MAX:
+            return 'BIGINT'
+        return 'INT' if dialect == MYSQL else 'INTEGER'
+    if info['type'] == 'real':
+        return 'DOUBLE' if dialect == MYSQL else 'DOUBLE PRECISION'
+    length = _varchar_length(info['max_length'])
+    if length is None or (dialect == MYSQL and length > _MYSQL_MAX_VARCHAR):
+        return 'TEXT'
+    return f'VARCHAR({length})'
+
+
+def build_column_types(columns, column_types, dialect, overrides=None):
+    """Types SQL des colonnes d'une table cible
+
+    Args:
+        columns (list): Colonnes à créer, dans l'ordre
+        column_types (dict): Types logiques (infer_*_column_types), None pour tout en TEXT
+        dialect (str): MYSQL ou POSTGRES
+        overrides (dict, optional): Colonne -> type SQL imposé par la configuration de la cible
+
+    Returns:
+        dict: Colonne -> type SQL
+    """
+    overrides = overrides or {}
+    sql_types = {}
+    for col in columns:
+        info = (column_types or {}).get(col)
+        sql_types[col] = overrides.get(col) or (column_sql_type(info, dialect) if info else 'TEXT')
+
+    if dialect == MYSQL:
+        # Respect de la taille maximale d'une ligne: les plus grands VARCHAR passent en TEXT
+        def varchar_bytes(sql_type):
+            return int(sql_type[8:-1]) * 4 if sql_type.startswith('VARCHAR(') else 0
+
+        total = sum(varchar_bytes(t) for t in sql_types.values())
+        for col in sorted(sql_types, key=lambda c: varchar_bytes(sql_types[c]), reverse=True):
+            if total <= _MYSQL_ROW_BUDGET:
+                break
+            if col not in overrides and varchar_bytes(sql_types[col]):
+                total -= varchar_bytes(sql_types[col])
+                sql_types[col] = 'TEXT'
+    return sql_types
+
+
+def is_numeric_sql_type(data_type):
+    """True si un type de colonne (information_schema.DATA_TYPE) est numérique"""
+    data_type = data_type.lower()
+    return data_type in ('int', 'integer', 'bigint', 'smallint', 'tinyint', 'mediumint',
+                         'double', 'double precision', 'real', 'float', 'decimal', 'numeric')
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Module de planification des tâches d'arrière-plan (priorités, ressources partagées, annulation)
+Auteur: Geoffroy Streit
+"""
+
+import itertools
+import logging
+import os
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# Priorités (la plus petite valeur passe en premier)
+PRIORITY_INTERACTIVE = 0  # Recherche, requête SQL: l'utilisateur attend le résultat
+PRIORITY_IMPORT = 1  # Chargement, insertion, enregistrement, analyses
+PRIORITY_EXPORT = 2  # Exports vers fichiers et bases externes
+
+# États d'une tâche
+PENDING = 'pending'
+RUNNING = 'running'
+FINISHED = 'finished'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+STATUS_LABELS = {
+    PENDING: "en attente",
+    RUNNING: "en cours",
+    FINISHED: "terminée",
+    FAILED: "échouée",
+    CANCELLED: "annulée",
+}
+
+
+def database_resource(db_path):
+    """Ressource « écriture » d'une base SQLite (une seule tâche d'écriture à la fois par fichier)"""
+    return f"sqlite:{os.path.abspath(db_path) if db_path else ':memory:'}"
+
+
+class Task(QObject):
+    """Tâche exécutée par le TaskScheduler
+
+    Les signaux sont émis depuis le thread d'exécution et reçus dans le thread de
+    l'interface (connexion en file d'attente Qt). Une tâche annulée n'émet ni
+    finished ni error: sa fin est signalée par status_changed(CANCELLED).
+    Seules les tâches en attente, ou en cours avec on_cancel, peuvent être annulées.
+    """
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    status_changed = pyqtSignal(str)
+
+    def __init__(self, func, *args, name="Tâche", priority=PRIORITY_IMPORT, resources=(), on_cancel=None, **kwargs):
+        """Initialisation
+
+        Args:
+            func (callable): Fonction exécutée en arrière-plan
+            *args: Arguments positionnels de func
+            name (str): Libellé affiché dans l'état des tâches
+            priority (int): PRIORITY_INTERACTIVE, PRIORITY_IMPORT ou PRIORITY_EXPORT
+            resources (tuple): Ressources utilisées (voir TaskScheduler.resource_limits)
+            on_cancel (callable, optional): Appelé par cancel() pour interrompre un traitement en cours
+            **kwargs: Arguments nommés de func
+        """
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.name = name
+        self.priority = priority
+        self.resources = tuple(resources)
+        self.on_cancel = on_cancel
+        self.status = PENDING
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.ended_at = None
+        self._cancel_event = threading.Event()
+        self._scheduler = None
+
+    @property
+    def cancelled(self):
+        """bool: True si l'annulation a été demandée"""
+        return self._cancel_event.is_set()
+
+    @property
+    def cancellable(self):
+        """bool: True si la tâche peut être annulée (en attente, ou en cours avec on_cancel)
+
+        Une tâche en cours sans on_cancel (export, enregistrement...) va à son terme.
+        """
+        if self.cancelled:
+            return False
+        return self.status == PENDING or (self.status == RUNNING and self.on_cancel is not None)
+
+    def cancel(self):
+        """Annule la tâche: retirée de la file si elle attend, interrompue (on_cancel) si elle s'exécute
+
+        Returns:
+            bool: True si l'annulation est prise en compte, False si la tâche n'est pas annulable
+        """
+        if self._scheduler is not None:
+            return self._scheduler._cancel(self)
+        if not self.cancellable:
+            return False
+        self._cancel_event.set()
+        return True
+
+    def describe(self):
+        """Description courte: libellé, état et durée"""
+        if self.status == PENDING:
+            elapsed = time.monotonic() - self.submitted_at
+        else:
+            elapsed = (self.ended_at or time.monotonic()) - self.started_at
+        return f"{self.name} — {STATUS_LABELS[self.status]} ({elapsed:.1f} s)"
+
+    def _set_status(self, status):
+        self.status = status
+        self.status_changed.emit(status)
+
+
+class TaskScheduler(QObject):
+    """Exécute les tâches d'arrière-plan sur un groupe de threads commun
+
+    Les tâches attendent dans une file par priorité; une tâche ne démarre que si
+    un thread est libre et si ses ressources sont disponibles (ex: une seule
+    écriture par base SQLite), les suivantes pouvant la dépasser en attendant.
+    """
+
+    # Émis à chaque changement d'état d'une tâche (pour l'affichage de l'activité)
+    tasks_changed = pyqtSignal()
+
+    def __init__(self, max_workers=None, resource_limits=None, default_resource_limit=1):
+        """Initialisation
+
+        Args:
+            max_workers (int, optional): Nombre de threads (par défaut: nombre de cœurs + 2, au moins 4)
+            resource_limits (dict, optional): Nombre de tâches simultanées par ressource
+            default_resource_limit (int): Limite des ressources absentes de resource_limits
+                (1 = accès exclusif, ex: écriture dans une base)
+        """
+        super().__init__()
+        self.max_workers = max_workers or max(4, (os.cpu_count() or 1) + 2)
+        self.resource_limits = dict(resource_limits or {})
+        self.default_resource_limit = default_resource_limit
+        self.logger = logging.getLogger('mp3tag_analyzer.task_scheduler')
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tache")
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._pending = []  # (priorité, ordre d'arrivée, tâche), trié
+        self._running = []
+        self._resource_usage = {}
+        self._shutdown = False
+        # Tâches terminées récentes (gardent aussi les tâches en vie jusqu'à la livraison de leurs signaux)
+        self._history = deque(maxlen=50)
+
+    def start(self, task):
+        """Planifie une tâche
+
+        Ses signaux doivent être connectés avant l'appel: elle peut démarrer immédiatement.
+
+        Returns:
+            Task: La tâche
+        """
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Le planificateur de tâches est arrêté")
+            task._scheduler = self
+            self._pending.append((task.priority, next(self._sequence), task))
+            self._pending.sort(key=lambda entry: entry[:2])
+        self.logger.debug(f"Tâche planifiée: {task.name} (priorité {task.priority})")
+        self._dispatch()
+        self.tasks_changed.emit()
+        return task
+
+    def tasks(self, include_finished=False):
+        """Tâches en cours puis en attente (dans l'ordre de démarrage prévu)
+
+        Args:
+            include_finished (bool): Ajouter les dernières tâches terminées (les plus récentes d'abord)
+        """
+        with self._lock:
+            tasks = list(self._running) + [entry[2] for entry in self._pending]
+            if include_finished:
+                tasks.extend(reversed(self._history))
+            return tasks
+
+    def summary(self):
+        """Résumé de l'activité (ex: '2 tâche(s) en cours, 1 en attente'), vide si aucune tâche"""
+        with self._lock:
+            running, pending = len(self._running), len(self._pending)
+        if not running and not pending:
+            return ""
+        if pending:
+            return f"{running} tâche(s) en cours, {pending} en attente"
+        return f"{running} tâche(s) en cours"
+
+    def try_acquire(self, resources):
+        """Prend des ressources hors tâche, pour une écriture courte depuis le thread de l'interface
+
+        N'attend pas: si l'une des ressources est occupée, aucune n'est prise.
+        Chaque prise réussie doit être suivie de release().
+
+        Args:
+            resources (tuple): Ressources à prendre (ex: (database_resource(chemin),))
+
+        Returns:
+            bool: True si les ressources sont prises
+        """
+        with self._lock:
+            if not self._resources_available(resources):
+                return False
+            for resource in resources:
+                self._resource_usage[resource] = self._resource_usage.get(resource, 0) + 1
+        return True
+
+    def release(self, resources):
+        """Libère des ressources prises par try_acquire() et démarre les tâches qui les attendaient"""
+        with self._lock:
+            for resource in resources:
+                self._resource_usage[resource] -= 1
+        self._dispatch()
+
+    def cancel_all(self):
+        """Annule les tâches en attente et les tâches en cours interruptibles"""
+        for task in self.tasks():
+            task.cancel()
+        self._dispatch()
+
+    def shutdown(self, wait=True):
+        """Annule les tâches et arrête le groupe de threads (fermeture de l'application)"""
+        with self._lock:
+            self._shutdown = True
+        self.cancel_all()
+        self._executor.shutdown(wait=wait)
+
+    def _cancel(self, task):
+        """Annule une tâche (voir Task.cancel)"""
+        with self._lock:
+            # Sous le verrou: une tâche en attente ne peut pas démarrer pendant la vérification
+            if not task.cancellable:
+                return False
+            task._cancel_event.set()
+            running = task.status == RUNNING
+        if running:
+            task.on_cancel()
+        else:
+            self._dispatch()
+        return True
+
+    def _dispatch(self):
+        """Démarre les tâches en attente autant que les threads et les ressources le permettent"""
+        started = []
+        with self._lock:
+            cancelled = [entry[2] for entry in self._pending if entry[2].cancelled]
+            if cancelled:
+                self._pending = [entry for entry in self._pending if not entry[2].cancelled]
+                self._history.extend(cancelled)
+            index = 0
+            while index < len(self._pending) and len(self._running) < self.max_workers:
+                task = self._pending[index][2]
+                if not self._resources_available(task.resources):
+                    # Ressource occupée: les tâches suivantes peuvent démarrer
+                    index += 1
+                    continue
+                del self._pending[index]
+                for resource in task.resources:
+                    self._resource_usage[resource] = self._resource_usage.get(resource, 0) + 1
+                task.status = RUNNING
+                task.started_at = time.monotonic()
+                self._running.append(task)
+                started.append(task)
+        for task in cancelled:
+            task.ended_at = time.monotonic()
+            task.started_at = task.ended_at
+            task._set_status(CANCELLED)
+        for task in started:
+            task.status_changed.emit(RUNNING)
+            self._executor.submit(self._run, task)
+        if started or cancelled:
+            self.tasks_changed.emit()
+
+    def _resources_available(self, resources):
+        for resource in resources:
+            limit = self.resource_limits.get(resource, self.default_resource_limit)
+            if self._resource_usage.get(resource, 0) >= limit:
+                return False
+        return True
+
+    def _run(self, task):
+        """Exécute une tâche dans un thread du groupe"""
+        status = FINISHED
+        try:
+            result = task.func(*task.args, **task.kwargs)
+            if task.cancelled:
+                status = CANCELLED
+            else:
+                task.finished.emit(result)
+        except Exception as e:
+            if task.cancelled:
+                status = CANCELLED
+            else:
+                status = FAILED
+                traceback.print_exc()
+                task.error.emit(str(e))
+        finally:
+            with self._lock:
+                self._running.remove(task)
+                for resource in task.resources:
+                    self._resource_usage[resource] -= 1
+                self._history.append(task)
+            task.ended_at = time.monotonic()
+            task._set_status(status)
+            self.logger.debug(f"{task.describe()}")
+            self._dispatch()
+            self.tasks_changed.emit()
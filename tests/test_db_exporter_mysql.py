@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests de l'export MySQL par lots (DBExporter.export_to_mysql) avec un pilote DB-API simulé
+Auteur: Geoffroy Streit
+"""
+
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db_exporter  # noqa: E402
+from connection_pool import close_all_pools  # noqa: E402
+from db_exporter import DBExporter  # noqa: E402
+
+
+class StubError(Exception):
+    """Erreur du pilote simulé (mysql.connector.Error)"""
+
+
+class StubCursor:
+    """Curseur simulé: consigne les requêtes et répond aux lectures du schéma"""
+
+    def __init__(self, server):
+        self.server = server
+        self._result = []
+
+    def execute(self, query, params=None):
+        server = self.server
+        server.statements.append(query)
+        self._result = []
+        if query.startswith("SHOW COLUMNS"):
+            self._result = [(column,) for column in server.columns]
+        elif "information_schema.COLUMNS" in query:
+            self._result = [(column, 'text') for column in server.columns]
+        elif query.startswith("CREATE TABLE"):
+            server.columns = ['id'] + [line.strip().split('`')[1] for line in query.splitlines()[2:-1]
+                                       if line.strip().startswith('`')]
+        elif query.startswith("INSERT"):
+            server.insert(1)
+        elif query.startswith("LOAD DATA LOCAL INFILE"):
+            # Le fichier TSV est supprimé après l'appel: il est lu maintenant
+            path = query.split("'")[1]
+            with open(path, encoding='utf-8') as f:
+                server.insert(sum(1 for _ in f))
+
+    def executemany(self, query, values):
+        values = list(values)
+        self.server.statements.append(query)
+        if query.startswith("INSERT"):
+            self.server.insert(len(values))
+
+    def fetchall(self):
+        return self._result
+
+
+class StubConnection:
+    """Connexion simulée: les validations sont consignées sur le serveur"""
+
+    def __init__(self, server):
+        self.server = server
+
+    def cursor(self):
+        return StubCursor(self.server)
+
+    def commit(self):
+        self.server.commit()
+
+    def rollback(self):
+        self.server.pending = 0
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+
+class StubServer:
+    """État partagé du serveur simulé: requêtes, lignes validées par transaction"""
+
+    def __init__(self):
+        self.statements = []
+        self.columns = []
+        self.pending = 0
+        # Nombre de lignes de chaque transaction validée
+        self.transactions = []
+        self.connect_kwargs = []
+
+    def insert(self, count):
+        self.pending += count
+
+    def commit(self):
+        self.transactions.append(self.pending)
+        self.pending = 0
+
+    @property
+    def rows(self):
+        return sum(self.transactions)
+
+    def module(self):
+        """Module remplaçant db_exporter.mysql_connector"""
+        def connect(**kwargs):
+            self.connect_kwargs.append(kwargs)
+            return StubConnection(self)
+        return types.SimpleNamespace(connect=connect, Error=StubError)
+
+
+def make_records(count):
+    return [{'relative_path': 'musique', 'filename': f'{i}.mp3', 'title': f'Titre {i}', 'year': 2000 + i % 20}
+            for i in range(count)]
+
+
+class ExportToMySQLTest(unittest.TestCase):
+    """export_to_mysql contre le pilote simulé"""
+
+    def setUp(self):
+        self.server = StubServer()
+        patches = [mock.patch.object(db_exporter, 'mysql_connector', self.server.module()),
+                   mock.patch.object(db_exporter, 'MYSQL_AVAILABLE', True)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        # Les réserves de connexions sont partagées par cible: chaque test repart de zéro
+        self.addCleanup(close_all_pools)
+        self.exporter = DBExporter()
+
+    def config(self, **options):
+        config = {'host': 'stub', 'port': 3306, 'user': 'u', 'password': 'p',
+                  'database': 'mp3', 'table': 'mp3_tags', 'indexes': ()}
+        config.update(options)
+        return config
+
+    def export(self, records, **options):
+        return self.exporter.export_to_mysql(records, self.config(**options))
+
+    def data_transactions(self):
+        # Première transaction: préparation de la table; dernière: création des index
+        return self.server.transactions[1:-1]
+
+    def test_executemany_mode(self):
+        count = self.export(make_records(25), batch_size=10, commit_every=1)
+        self.assertEqual(count, 25)
+        self.assertEqual(self.server.rows, 25)
+        inserts = [q for q in self.server.statements if q.startswith("INSERT")]
+        self.assertEqual(len(inserts), 3)
+
+    def test_row_mode(self):
+        count = self.export(make_records(7), bulk_mode='row', batch_size=3)
+        self.assertEqual(count, 7)
+        inserts = [q for q in self.server.statements if q.startswith("INSERT")]
+        self.assertEqual(len(inserts), 7)
+        self.assertEqual(self.server.rows, 7)
+
+    def test_load_data_mode(self):
+        count = self.export(make_records(12), bulk_mode='load_data', batch_size=5, commit_every=1)
+        self.assertEqual(count, 12)
+        loads = [q for q in self.server.statements if q.startswith("LOAD DATA")]
+        self.assertEqual(len(loads), 3)
+        self.assertEqual(self.server.rows, 12)
+        self.assertTrue(self.server.connect_kwargs[0]['allow_local_infile'])
+
+    def test_periodic_commits(self):
+        for retries in (0, 3):
+            with self.subTest(batch_retries=retries):
+                self.server.transactions = []
+                self.export(make_records(25), batch_size=10, commit_every=1, batch_retries=retries)
+                transactions = [rows for rows in self.data_transactions() if rows]
+                self.assertEqual(transactions, [10, 10, 5])
+
+    def test_commit_every_groups_batches(self):
+        self.export(make_records(25), batch_size=5, commit_every=2, batch_retries=0)
+        self.assertEqual([rows for rows in self.data_transactions() if rows], [10, 10, 5])
+
+    def test_columns_read_once(self):
+        self.export(make_records(30), batch_size=4)
+        show_columns = [q for q in self.server.statements if q.startswith("SHOW COLUMNS")]
+        self.assertEqual(len(show_columns), 1)
+
+    def test_throughput_report(self):
+        self.exporter.last_throughput = None
+        self.export(make_records(10), batch_size=4)
+        self.assertIsNotNone(self.exporter.last_throughput)
+        self.assertGreater(self.exporter.last_throughput, 0)
+
+    def test_no_rows_opens_no_connection(self):
+        self.assertEqual(self.export([]), 0)
+        self.assertEqual(self.server.connect_kwargs, [])
+
+    def test_driver_error_is_wrapped(self):
+        with mock.patch.object(DBExporter, '_get_batch_columns', side_effect=StubError("table pleine")):
+            with self.assertRaises(Exception) as context:
+                self.export(make_records(3), batch_retries=0)
+        self.assertIn("Erreur lors de l'exportation vers MySQL", str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()